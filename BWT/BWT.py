@@ -8,7 +8,18 @@ Documentação e type hiting gerada por Ricardo Oliveira
 """
 
 
-import subprocess; import re
+import subprocess
+import multiprocessing
+import time
+from array import array
+from typing import Iterable, Iterator
+from suffix_array import construir_suffix_array, construir_suffix_array_colecao
+from fm_index import FMIndex
+from fasta import ler_fasta, pico_memoria
+
+# backends whose index is smaller than the sequence, so the BWT object keeps only the index
+BACKENDS_COMPACTOS = ("dna", "rle")
+
 
 def imprimir_matriz(matriz : list[str]) -> None:
     """
@@ -27,6 +38,28 @@ def imprimir_matriz(matriz : list[str]) -> None:
     for linha in matriz: print(linha)
 
 
+_indice_partilhado = None
+
+def _procura_partilhada(tarefa : tuple[int, str]) -> tuple[int, list[int]]:
+    """
+    Searches one pattern in the FM-index shared with the worker processes of BWT.search_many.
+    The index is inherited through fork, so it is never pickled; only the pattern and its index are sent to the worker.
+
+    Parameters:
+    -------------
+    tarefa (tuple[int, str]):
+        The index of the pattern in the batch and the pattern itself.
+
+    Returns:
+    ---------
+    tuple[int, list[int]]:
+        The index of the pattern and the positions where it occurs.
+    """
+
+    i, pattern = tarefa
+    return i, _indice_partilhado.locate(pattern)
+
+
 class BWT:
 
     """
@@ -40,18 +73,214 @@ class BWT:
     encoded (bool, optional): 
         A flag indicating whether the input sequence is already encoded. Defaults to False.
 
+    metodo (str, optional):
+        How the BWT is constructed. "sa" (default) derives it from the suffix array, computed in linear time with SA-IS.
+        "matriz" sorts every rotation of the sequence, which costs O(n^2) memory and is only meant for small examples.
+
+    amostragem_sa (int, optional):
+        Suffix array sampling rate used by the FM-index (see FMIndex). Only one in every `amostragem_sa` entries is kept,
+        trading memory for locate latency. Defaults to 1 (full suffix array).
+
+    backend (str, optional):
+        Rank structure used by the FM-index: "python" (BWT as bytes with Occ checkpoints), "dna" (BWT packed with
+        2 bits per base, for DNA sequences), "rle" (run-length encoded BWT, for repetitive collections) or "numpy"
+        (Occ table built with NumPy, rank by array lookup). Defaults to "python".
+        With "dna" and "rle" the FM-index is built by the constructor and the object keeps only the compact index: the
+        str copies of the BWT and of the sequence are dropped, and bwt, seq_original and obter_seq_original decode them on demand.
+
     Returns:
         None
     """
-    def __init__(self, seq_original : str, encoded = False) -> None:
+    def __init__(self, seq_original : str, encoded = False, metodo : str = "sa", amostragem_sa : int = 1,
+                 backend : str = "python") -> None:
 
+        assert metodo in ("sa", "matriz"), "The construction method must be 'sa' or 'matriz'"
+
+        self._fm = None
+        self._bwt = None
         self.seq_original = seq_original
-        self.matrix_ord = self.matriz_ordenada()
+        self.metodo = metodo
+        self.amostragem_sa = amostragem_sa
+        self.backend = backend
+        self.sa = None
+        self._matrix_ord = None
+        self.nomes = None
         if encoded: self.bwt = seq_original
         else: self.bwt = self.construir_BWT()
         self.listaSequenciaOriginal = []
         self.encoded = encoded
-        
+        if backend in BACKENDS_COMPACTOS: self.indice_fm()
+
+
+    @classmethod
+    def colecao(cls, sequencias : list[str], **kwargs) -> "BWT":
+        """
+        Builds a single BWT over a collection of sequences (for instance, the contigs of an assembly).
+        The sequences are concatenated as s1$s2$...sd$, and each '$' acts as a distinct sentinel, so no match crosses
+        a document boundary. Matches can be reported as (sequence_id, offset) with procuraPadraoColecao.
+
+        Parameters:
+        -------------
+        sequencias (list[str]):
+            The sequences to index. They must not contain '$'.
+
+        **kwargs:
+            Other arguments passed to the BWT constructor (amostragem_sa, backend).
+
+        Returns:
+        ---------
+        BWT:
+            The BWT of the concatenated sequences.
+        """
+
+        assert len(sequencias) > 0, "The collection must have at least one sequence"
+        assert all('$' not in seq for seq in sequencias), "The sequences must not contain '$'"
+        return cls("$".join(sequencias) + "$", **kwargs)
+
+
+    @classmethod
+    def de_fasta(cls, caminho : str, progresso = None, **kwargs) -> "BWT":
+        """
+        Builds a single BWT over every record of a FASTA file (or over a plain sequence file), like BWT.colecao.
+        The file is streamed into one bytes buffer (see fasta.ler_fasta) that feeds the suffix array construction directly,
+        and the buffer is released as soon as the BWT is read from the suffix array, so the original sequence is never
+        kept as a str. The returned object is built from its BWT (encoded=True) and keeps the suffix array for the FM-index;
+        with backend="dna" or "rle" the index is built right away and only the compact index is kept (see BWT).
+
+        Parameters:
+        -------------
+        caminho (str):
+            Path of the FASTA or plain text file.
+
+        progresso (Callable[[str, int, int], None], optional):
+            Called as progresso(step, done, total) while the file is read and after each step
+            ("leitura", "suffix_array" and "bwt").
+
+        **kwargs:
+            Other arguments passed to the BWT constructor (amostragem_sa, backend).
+
+        Returns:
+        ---------
+        BWT:
+            The BWT of the concatenated records. The record names are kept in `nomes`, and the time and peak memory
+            (RSS, in bytes) of each step in `estatisticas`.
+        """
+
+        estatisticas = {}
+        inicio = time.perf_counter()
+        texto, nomes = ler_fasta(caminho, progresso)
+        assert nomes, f"The file {caminho} has no sequences"
+        estatisticas["leitura"] = {"tempo_s": time.perf_counter() - inicio, "pico_memoria_bytes": pico_memoria()}
+
+        n = len(texto)
+        inicio = time.perf_counter()
+        sa = construir_suffix_array_colecao(texto)
+        estatisticas["suffix_array"] = {"tempo_s": time.perf_counter() - inicio, "pico_memoria_bytes": pico_memoria()}
+        if progresso is not None: progresso("suffix_array", n, n)
+
+        inicio = time.perf_counter()
+        bwt = bytes(texto[i - 1] for i in sa)
+        del texto
+        # only the decoded str is kept: rebinding the name releases the bytes as soon as they are decoded
+        bwt = bwt.decode("latin-1")
+        estatisticas["bwt"] = {"tempo_s": time.perf_counter() - inicio, "pico_memoria_bytes": pico_memoria()}
+        if progresso is not None: progresso("bwt", n, n)
+
+        backend = kwargs.pop("backend", "python")
+        classe = cls(bwt, encoded=True, **kwargs)
+        del bwt
+        classe.backend = backend
+        classe.sa = sa
+        del sa
+        if backend in BACKENDS_COMPACTOS: classe.indice_fm()
+        classe.nomes = nomes
+        classe.estatisticas = estatisticas
+        return classe
+
+
+    @classmethod
+    def load(cls, path : str) -> "BWT":
+        """
+        Opens an index written by BWT.save (or FMIndex.save). The FM-index is memory-mapped (see FMIndex.load), so
+        opening it takes milliseconds whatever its size, and every search method of the class can be used on it.
+        The BWT and the original sequence are not kept as str: they are decoded from the index when accessed.
+
+        Parameters:
+        -------------
+        path (str):
+            Path of the index file.
+
+        Returns:
+        ---------
+        BWT:
+            An encoded BWT backed by the memory-mapped index.
+        """
+
+        indice = FMIndex.load(path)
+        classe = cls.__new__(cls)
+        classe._fm = indice
+        classe._bwt = None
+        classe._seq_original = None
+        classe.metodo = "sa"
+        classe.amostragem_sa = indice.amostragem_sa
+        classe.backend = indice.ocorrencias.nome
+        classe.sa = None
+        classe._matrix_ord = None
+        classe.nomes = None
+        classe.listaSequenciaOriginal = []
+        classe.encoded = True
+        return classe
+
+
+    @property
+    def bwt(self) -> str:
+        """
+        The Burrows-Wheeler Transform, as a str. When the object only keeps its FM-index (see BWT.load), the BWT is
+        decoded from the index on each access, so callers that use it repeatedly should keep a local reference.
+        """
+
+        if self._bwt is None and self._fm is not None: return self._fm.transformada()
+        return self._bwt
+
+
+    @bwt.setter
+    def bwt(self, bwt : str) -> None:
+        self._bwt = bwt
+
+
+    @property
+    def seq_original(self) -> str:
+        """
+        The sequence given to the constructor (the BWT itself when encoded=True). When the object only keeps its
+        FM-index, it is rebuilt from the index on each access.
+        """
+
+        if self._seq_original is None and self._fm is not None:
+            return self.bwt if self.encoded else self.obter_seq_original() + '$'
+        return self._seq_original
+
+
+    @seq_original.setter
+    def seq_original(self, seq_original : str) -> None:
+        self._seq_original = seq_original
+
+
+    @property
+    def matrix_ord(self) -> list[str]:
+        """
+        The sorted rotation matrix of the original sequence.
+        It is only built the first time it is accessed, since it needs O(n^2) memory.
+
+        Returns:
+        ---------
+        list[str]:
+            A sorted matrix of strings representing all rotations of the original sequence.
+        """
+
+        if self._matrix_ord is None:
+            self._matrix_ord = self.matriz_ordenada()
+        return self._matrix_ord
+
 
     def matriz_ordenada(self) -> list[str]:
         """
@@ -96,20 +325,37 @@ class BWT:
     def construir_BWT(self) -> str:
         """
         Constructs the Burrows-Wheeler Transformed (BWT) of the original sequence.
+        By default the BWT is read directly from the suffix array: the character of row i is the one that precedes
+        the i-th smallest suffix. The suffix array is kept in self.sa.
+        If the sequence holds several documents separated by '$' (see BWT.colecao), each separator is a distinct sentinel.
 
         Parameters:
         -------------
         self (BWT): 
-            An instance of the BWT class. The sorted roation matrix is stored in self.matrix_ord.
+            An instance of the BWT class. If self.metodo is "matriz", the sorted rotation matrix (self.matrix_ord) is used instead.
 
         Returns:
         ---------
         str:
             A string representing the Burrows-Wheeler Transformed (BWT) of the original sequence.
-            The BWT is constructed by concatenating the last characters of each row in the sorted matrix.
+
+        Raises:
+        ---------
+        AssertionError:
+            If the input sequence is not a string.
         """
 
-        return "".join([linha[-1] for linha in self.matrix_ord])
+        if self.metodo == "matriz":
+            return "".join([linha[-1] for linha in self.matrix_ord])
+
+        assert isinstance(self.seq_original,str),"The input sequence must be a string"
+
+        if self.seq_original.find('$') == -1:
+            self.seq_original = self.seq_original + '$'
+
+        seq = self.seq_original
+        self.sa = construir_suffix_array_colecao(seq)
+        return "".join([seq[i - 1] for i in self.sa])
 
 
     def ocorrencias(self,seq:str)->list[str]:
@@ -152,7 +398,11 @@ class BWT:
 
         """
         This method is used to obtain the original sequence from the Burrows-Wheeler Transformed (BWT).
-        It uses the occurrence counts of characters in the first and last columns of the sorted matrix.
+        It inverts the BWT with the LF mapping, computed from integer rank arrays: LF(i) = C[c] + Occ(c, i), where c = bwt[i].
+        The LF array is filled in a single pass over the BWT and the sequence is then rebuilt from the last to the first
+        symbol, so the inversion runs in O(n) time with O(n) integer memory.
+        For a collection (see BWT.colecao) the separators are distinct sentinels: row j holds the separator of document j,
+        so each '$' found during the walk jumps to the row of the previous document.
 
         Parameters:
         -----------
@@ -160,36 +410,48 @@ class BWT:
 
         Returns:
         --------
-        str: The original sequence obtained from the BWT.
+        str: The original sequence obtained from the BWT, without the end-of-string marker '$'.
 
+        Raises:
+        ---------
+        AssertionError:
+            If the BWT does not contain the end-of-string marker '$'.
         """
-        
-        first_col_count = self.ocorrencias(sorted(self.bwt))
-        last_col_counts = self.ocorrencias(self.bwt)
 
-        for string in last_col_counts:
-            match = re.search(r'^[$\d]+', string)
-            
-            if match != None:
-                idx = last_col_counts.index(string)
-                elem_stop = last_col_counts[idx]
-                break
-        
-        res = ""
+        bwt = self.bwt
+        assert '$' in bwt, "The BWT must contain the end-of-string marker '$'"
+
+        n = len(bwt)
+        proximo = {}
+        total = 0
+        for c in sorted(set(bwt)):
+            proximo[c] = total
+            total += bwt.count(c)
+
+        lf = array('I', bytes(4 * n))
+        for i, c in enumerate(bwt):
+            lf[i] = proximo[c]
+            proximo[c] += 1
+
+        res = [''] * (n - 1)
+        documento = bwt.count('$') - 1
+        idx = documento
+        for k in range(n - 2, -1, -1):
+            res[k] = bwt[idx]
+            if res[k] == '$':
+                documento -= 1
+                idx = documento
+            else:
+                idx = lf[idx]
 
-        while first_col_count[idx] != elem_stop:
-            elem = re.findall(r'^[\w]', first_col_count[idx])
-            if len(elem) != 0:
-                res = res + elem[0]
-            idx = last_col_counts.index(first_col_count[idx])
-        
-        return res
+        return "".join(res)
 
 
     def suffix_array(self, seq : str) -> list[int]:
         """
         Computes the suffix array of a given string. The suffix array is a sorted array of all suffixes of the input string.
         Each suffix is represented by its starting index in the original string.
+        The suffix array is computed in linear time with the SA-IS algorithm (see suffix_array.py).
 
         Parameters:
         -----------
@@ -203,15 +465,41 @@ class BWT:
             The suffixes are sorted in lexicographical order.
         """
 
-        suffix_array = sorted(range(len(seq)), key=lambda i: seq[i:])
-
-        return suffix_array
+        return construir_suffix_array(seq)
 
     
+    def indice_fm(self) -> FMIndex:
+        """
+        Returns the FM-index (C array and Occ checkpoints) of the sequence.
+        The index is built on the first call and kept on the object, so every later search reuses it.
+        The full suffix array in self.sa is released afterwards (the index keeps its own, possibly sampled, copy), and
+        with the "dna" and "rle" backends so are the str copies of the BWT and of the sequence.
+
+        Parameters:
+        -----------
+        self (BWT):
+            An instance of the BWT class.
+
+        Returns:
+        --------
+        FMIndex:
+            The FM-index of the sequence.
+        """
+
+        if self._fm is None:
+            self._fm = FMIndex.from_bwt(self, amostragem_sa=self.amostragem_sa, backend=self.backend)
+            self.sa = None
+            if self.backend in BACKENDS_COMPACTOS:
+                self._bwt = None
+                self._seq_original = None
+        return self._fm
+
+
     def procuraPadraoBWT(self, pattern : str) -> list[int]:
         """
         This method is used to find the positions of a pattern in the original sequence using the Burrows-Wheeler Transform (BWT).
-        It implements the Boyer-Moore algorithm for string matching in the BWT.
+        It performs a backward search over the FM-index of the sequence, which is built only once (see indice_fm),
+        so each query costs O(|pattern|) rank operations.
 
         Parameters:
         -----------
@@ -224,36 +512,224 @@ class BWT:
             A list of positions where the pattern is found in the original sequence. If the pattern is not found, an empty list is returned.
         """
 
-        sorted_bwt = sorted(self.bwt)
-        suffix_array = self.suffix_array(self.seq_original)
-        
-        count = {char: [0] * (len(self.bwt) + 1) for char in set(self.bwt)}
-        for i in range(1, len(self.bwt) + 1):
-            for char in count:
-                count[char][i] = count[char][i - 1]
-            count[self.bwt[i - 1]][i] += 1
-
-        first_occurrence = {}
-        for i, char in enumerate(sorted_bwt):
-            if char not in first_occurrence:
-                first_occurrence[char] = i
-
-        top = 0
-        bottom = len(self.bwt) - 1
-        while top <= bottom:
-            if pattern:
-                symbol = pattern[-1]
-                pattern = pattern[:-1]
-                if count[symbol][bottom + 1] > count[symbol][top]:
-                    top = first_occurrence[symbol] + count[symbol][top]
-                    bottom = first_occurrence[symbol] + count[symbol][bottom + 1] - 1
-                else:
-                    return []
-            else:
-                return sorted([suffix_array[i] for i in range(top, bottom + 1)])
+        return self.indice_fm().locate(pattern)
+
+
+    def save(self, path : str) -> None:
+        """
+        Writes the FM-index of the sequence to a binary file, which can later be opened with BWT.load or FMIndex.load
+        (memory-mapped, without recomputing the BWT).
+
+        Parameters:
+        -----------
+        path (str):
+            Path of the file to write.
+
+        Returns:
+        --------
+        None
+        """
+
+        self.indice_fm().save(path)
+
+
+    def count(self, pattern : str) -> int:
+        """
+        Counts the occurrences of a pattern in the original sequence with the backward search alone (bottom - top + 1),
+        without computing any position from the suffix array.
+
+        Parameters:
+        -----------
+        pattern (str):
+            The pattern to be counted.
+
+        Returns:
+        --------
+        int:
+            The number of occurrences of the pattern.
+        """
+
+        return self.indice_fm().count(pattern)
+
+
+    def count_many(self, patterns : Iterable[str]) -> list[int]:
+        """
+        Counts the occurrences of a batch of patterns, sharing the backward search of their common suffixes
+        (see FMIndex.count_many).
+
+        Parameters:
+        -----------
+        patterns (Iterable[str]):
+            The patterns to be counted.
+
+        Returns:
+        --------
+        list[int]:
+            The number of occurrences of each pattern, in the same order as the patterns.
+        """
+
+        return self.indice_fm().count_many(patterns)
+
+
+    def procuraPadraoColecao(self, pattern : str) -> list[tuple[int, int]]:
+        """
+        This method is used to find the occurrences of a pattern in a collection of sequences (see BWT.colecao).
+
+        Parameters:
+        -----------
+        pattern (str):
+            The pattern to be searched.
+
+        Returns:
+        --------
+        list[tuple[int, int]]:
+            The sorted list of pairs (sequence_id, offset) where the pattern occurs.
+        """
+
+        return self.indice_fm().locate_docs(pattern)
+
+
+    def procuraAproximadaBWT(self, pattern : str, max_mismatches : int = 1) -> list[tuple[int, int]]:
+        """
+        This method is used to find the occurrences of a pattern in the original sequence allowing up to `max_mismatches` substitutions.
+        It performs a backtracking backward search over the FM-index, pruned with the D array (see FMIndex.approximate_search).
+
+        Parameters:
+        -----------
+        pattern (str):
+            The pattern to be searched in the original sequence.
+
+        max_mismatches (int, optional):
+            The maximum number of mismatches allowed. Defaults to 1.
+
+        Returns:
+        --------
+        list[tuple[int, int]]:
+            Pairs (position, number of mismatches), sorted by position. If the pattern is not found, an empty list is returned.
+        """
+
+        return self.indice_fm().approximate_search(pattern, max_mismatches)
+
+
+    def procuraMEMsBWT(self, read : str, min_length : int = 1) -> list[tuple[int, int, list[int]]]:
+        """
+        Finds the super-maximal exact matches (SMEMs) of a read against the original sequence, to be used as alignment
+        seeds (see FMIndex.smems). The matches are extended with the rank structure of the index, in time linear in the
+        length of the read, instead of searching every substring of the read.
+
+        Parameters:
+        -----------
+        read (str):
+            The read.
+
+        min_length (int, optional):
+            Minimum length of the matches reported. Defaults to 1.
+
+        Returns:
+        --------
+        list[tuple[int, int, list[int]]]:
+            Triples (read_offset, length, positions in the original sequence), sorted by read offset.
+        """
+
+        return self.indice_fm().smems(read, min_length)
+
+
+    def adicionar(self, seq : str, nome : str = "") -> None:
+        """
+        Appends a new sequence to the indexed collection (see BWT.colecao), merging its suffixes into the existing BWT
+        and FM-index (see FMIndex.adicionar) instead of rebuilding them: only the suffix array of the new sequence is
+        computed, so adding a few contigs costs work proportional to their length plus a copy of the current arrays.
+        The full suffix array (self.sa) is not kept afterwards; the index keeps its sampled suffix array.
+
+        Parameters:
+        -----------
+        seq (str):
+            The sequence to append. It must not contain '$'.
+
+        nome (str, optional):
+            The name of the sequence, kept in self.nomes when the collection was read with BWT.de_fasta.
+
+        Returns:
+        --------
+        None
+        """
+
+        bwt = self.indice_fm().adicionar(self.bwt, seq)
+        if self._bwt is not None: self._bwt = bwt
+        if self._seq_original is not None:
+            self._seq_original = bwt if self.encoded else self._seq_original + seq + '$'
+        self.sa = None
+        self._matrix_ord = None
+        if self.nomes is not None: self.nomes.append(nome)
+
+
+    def iter_search_many(self, patterns : Iterable[str], workers : int = 1, chunksize : int = 256) -> Iterator[tuple[int, list[int]]]:
+        """
+        Searches a batch of patterns, yielding the results as soon as they are ready.
+        The FM-index is built once and shared read-only with a pool of worker processes created with fork,
+        so the index is never pickled. When workers is 1, or fork is not available, the patterns are searched in this process.
+
+        Parameters:
+        -----------
+        patterns (Iterable[str]):
+            The patterns to be searched in the original sequence.
+
+        workers (int, optional):
+            Number of worker processes. Defaults to 1.
+
+        chunksize (int, optional):
+            Number of patterns sent to a worker at a time. Defaults to 256.
+
+        Returns:
+        --------
+        Iterator[tuple[int, list[int]]]:
+            Pairs (index of the pattern in the batch, positions of the pattern), in the order they complete.
+        """
+
+        global _indice_partilhado
+        indice = self.indice_fm()
+
+        if workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+            for i, pattern in enumerate(patterns):
+                yield i, indice.locate(pattern)
+            return
+
+        _indice_partilhado = indice
+        try:
+            pool = multiprocessing.get_context("fork").Pool(workers)
+        finally:
+            _indice_partilhado = None
+
+        with pool:
+            yield from pool.imap_unordered(_procura_partilhada, enumerate(patterns), chunksize)
+
+
+    def search_many(self, patterns : Iterable[str], workers : int = 1, chunksize : int = 256) -> list[list[int]]:
+        """
+        Searches a batch of patterns against the same index (see iter_search_many).
+
+        Parameters:
+        -----------
+        patterns (Iterable[str]):
+            The patterns to be searched in the original sequence.
+
+        workers (int, optional):
+            Number of worker processes. Defaults to 1.
+
+        chunksize (int, optional):
+            Number of patterns sent to a worker at a time. Defaults to 256.
+
+        Returns:
+        --------
+        list[list[int]]:
+            The positions of each pattern, in the same order as the patterns.
+        """
+
+        resultados = {}
+        for i, posicoes in self.iter_search_many(patterns, workers, chunksize):
+            resultados[i] = posicoes
+        return [resultados[i] for i in range(len(resultados))]
 
-        return []
-    
 
 if __name__ == "__main__":
     seq = "TAGACAGAGA$"
@@ -0,0 +1,564 @@
+"""
+Benchmarks da classe BWT e do FM-index
+
+Mede a escalabilidade da construção (construir_BWT), da inversão (obter_seq_original)
+e da pesquisa (procuraPadraoBWT e cada backend do FM-index) em DNA aleatório e repetitivo
+de 10^3 a 10^7 símbolos, registando o pico de memória (RSS) de cada execução. Mede também
+o compromisso entre memória e tempo de locate do suffix array amostrado, o tempo de
+inversão da BWT e a memória retida pelo objeto BWT completo com cada backend, e compara a taxa de
+compressão e a velocidade do compressor baseado na BWT (compressao.py) com o gzip e o bz2.
+
+Os resultados podem ser escritos em JSON (--json), para acompanhar regressões entre versões;
+com --json - o JSON vai para o stdout e a tabela para o stderr.
+Cada combinação (n, tipo) de "escala" corre num processo novo, para que o pico de RSS seja
+o dessa execução; as sequências são geradas com uma seed fixa, pelo que são reprodutíveis.
+
+Utilização:
+    python benchmark_bwt.py escala [--tamanhos 1000,10000,...] [--tipos aleatoria,repetitiva]
+                                   [--backends python,dna,rle,numpy] [--json resultados.json]
+    python benchmark_bwt.py amostragem [--n 100000] [--amostragens 1,4,16,...] [--json ...]
+    python benchmark_bwt.py inversao [--tamanhos 1000000,...] [--json ...]
+    python benchmark_bwt.py memoria [--n 1000000] [--amostragem-sa 32] [--tipo repetitiva --copias 50] [--json ...]
+    python benchmark_bwt.py compressao [--n 1000000] [--tamanho-bloco 262144] [--json ...]
+"""
+
+import argparse
+import bz2
+import gzip
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import time
+import types
+
+from BWT import BWT
+from compressao import comprimir, descomprimir
+from fm_index import FMIndex, BACKENDS
+from fasta import pico_memoria
+from occ_numpy import np
+
+
+def sequencia_aleatoria(n : int, alfabeto : str = "ACGT", seed : int = 0) -> str:
+    """
+    Generates a random sequence over the given alphabet.
+
+    Parameters
+    ----------
+    n : int
+        Length of the sequence.
+    alfabeto : str, optional
+        Symbols used in the sequence. Defaults to "ACGT".
+    seed : int, optional
+        Seed of the random generator, so results are reproducible. Defaults to 0.
+
+    Returns
+    -------
+    str
+        The random sequence.
+    """
+
+    gerador = random.Random(seed)
+    return "".join(gerador.choices(alfabeto, k=n))
+
+
+def sequencia_repetitiva(n : int, copias : int = 10, taxa_mutacao : float = 0.001, seed : int = 0) -> str:
+    """
+    Generates a repetitive DNA sequence, made of mutated copies of the same random sequence
+    (like several strains of the same species), whose BWT has few runs.
+
+    Parameters
+    ----------
+    n : int
+        Length of the sequence.
+    copias : int, optional
+        Number of copies of the base sequence. Defaults to 10.
+    taxa_mutacao : float, optional
+        Fraction of positions of each copy that are replaced by a random base. Defaults to 0.001.
+    seed : int, optional
+        Seed of the random generator, so results are reproducible. Defaults to 0.
+
+    Returns
+    -------
+    str
+        The repetitive sequence.
+    """
+
+    gerador = random.Random(seed)
+    base = sequencia_aleatoria(-(-n // copias), seed=seed)
+    partes = []
+    for _ in range(copias):
+        copia = list(base)
+        for posicao in gerador.sample(range(len(base)), int(len(base) * taxa_mutacao)):
+            copia[posicao] = gerador.choice("ACGT")
+        partes.append("".join(copia))
+    return "".join(partes)[:n]
+
+
+GERADORES = {"aleatoria": sequencia_aleatoria, "repetitiva": sequencia_repetitiva}
+
+
+def _padroes(seq : str, num_padroes : int, tamanho_padrao : int, seed : int = 1) -> list[str]:
+    """
+    Samples substrings of a sequence, to be used as patterns that are known to occur.
+
+    Parameters
+    ----------
+    seq : str
+        The sequence.
+    num_padroes : int
+        Number of patterns.
+    tamanho_padrao : int
+        Length of the patterns.
+    seed : int, optional
+        Seed of the random generator. Defaults to 1.
+
+    Returns
+    -------
+    list[str]
+        The patterns.
+    """
+
+    gerador = random.Random(seed)
+    padroes = []
+    for _ in range(num_padroes):
+        inicio = gerador.randrange(max(len(seq) - tamanho_padrao, 1))
+        padroes.append(seq[inicio:inicio + tamanho_padrao])
+    return padroes
+
+
+def benchmark_escala(n : int, tipo : str = "aleatoria", backends : list[str] = ["python", "dna", "rle"],
+                     num_padroes : int = 100, tamanho_padrao : int = 12, amostragem_sa : int = 32) -> dict:
+    """
+    Times the construction, inversion and search of the BWT of one sequence, and the build and search of the FM-index
+    with each backend, recording the peak RSS of the process at the end.
+
+    Parameters
+    ----------
+    n : int
+        Length of the DNA sequence.
+    tipo : str, optional
+        "aleatoria" (random DNA) or "repetitiva" (mutated copies of the same sequence). Defaults to "aleatoria".
+    backends : list[str], optional
+        The FM-index backends to measure. Defaults to ["python", "dna", "rle"].
+    num_padroes : int, optional
+        Number of patterns searched. Defaults to 100.
+    tamanho_padrao : int, optional
+        Length of the patterns. Defaults to 12.
+    amostragem_sa : int, optional
+        Suffix array sampling rate of the indexes. Defaults to 32.
+
+    Returns
+    -------
+    dict
+        The times (in seconds; search times are per pattern), the sizes of the rank structures (in bytes)
+        and the peak RSS (in bytes).
+    """
+
+    seq = GERADORES[tipo](n)
+    padroes = _padroes(seq, num_padroes, tamanho_padrao)
+    resultado = {"n": n, "tipo": tipo, "amostragem_sa": amostragem_sa, "num_padroes": num_padroes,
+                 "tamanho_padrao": tamanho_padrao}
+
+    inicio = time.perf_counter()
+    classe = BWT(seq, amostragem_sa=amostragem_sa)
+    resultado["construir_BWT_s"] = time.perf_counter() - inicio
+
+    codificada = BWT(classe.bwt, encoded=True)
+    inicio = time.perf_counter()
+    resultado["inversao_correta"] = codificada.obter_seq_original() == seq
+    resultado["obter_seq_original_s"] = time.perf_counter() - inicio
+    del codificada
+
+    resultado["backends"] = {}
+    for backend in backends:
+        inicio = time.perf_counter()
+        indice = FMIndex(classe.bwt, classe.sa, amostragem_sa=amostragem_sa, backend=backend)
+        construcao = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        ocorrencias = sum(len(indice.locate(p)) for p in padroes)
+        locate = (time.perf_counter() - inicio) / num_padroes
+
+        inicio = time.perf_counter()
+        indice.count_many(padroes)
+        count = (time.perf_counter() - inicio) / num_padroes
+
+        resultado["backends"][backend] = {"construcao_s": construcao, "locate_s": locate, "count_s": count,
+                                          "ocorrencias": ocorrencias, "bytes": memoria_backend(indice)}
+        del indice
+
+    inicio = time.perf_counter()
+    classe.indice_fm()
+    resultado["indice_fm_s"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for p in padroes: classe.procuraPadraoBWT(p)
+    resultado["procuraPadraoBWT_s"] = (time.perf_counter() - inicio) / num_padroes
+
+    resultado["pico_rss_bytes"] = pico_memoria()
+    return resultado
+
+
+def _benchmark_escala(argumentos : tuple) -> dict:
+    """
+    Runs benchmark_escala with a tuple of arguments, so it can be used with a process pool.
+    """
+
+    return benchmark_escala(*argumentos)
+
+
+def executar_escala(tamanhos : list[int], tipos : list[str], backends : list[str], isolado : bool = True,
+                    **kwargs) -> list[dict]:
+    """
+    Runs benchmark_escala for every combination of length and type of sequence.
+
+    Parameters
+    ----------
+    tamanhos : list[int]
+        The lengths of the sequences.
+    tipos : list[str]
+        The types of sequence ("aleatoria", "repetitiva").
+    backends : list[str]
+        The FM-index backends to measure.
+    isolado : bool, optional
+        Whether each run uses a new process (started with spawn), so the peak RSS recorded is the one of that run
+        alone. Defaults to True.
+    **kwargs:
+        Other arguments passed to benchmark_escala (num_padroes, tamanho_padrao, amostragem_sa).
+
+    Returns
+    -------
+    list[dict]
+        The results of every run.
+    """
+
+    tarefas = [(n, tipo, backends, kwargs.get("num_padroes", 100), kwargs.get("tamanho_padrao", 12),
+                kwargs.get("amostragem_sa", 32)) for n in tamanhos for tipo in tipos]
+    if not isolado:
+        return [_benchmark_escala(tarefa) for tarefa in tarefas]
+
+    with multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+        return pool.map(_benchmark_escala, tarefas, chunksize=1)
+
+
+def benchmark_amostragem(n : int = 100000, amostragens : list[int] = [1, 4, 16, 32, 64, 128],
+                         num_padroes : int = 200, tamanho_padrao : int = 8) -> list[dict]:
+    """
+    Measures the memory used by the sampled suffix array and the mean locate time for several sampling rates.
+
+    Parameters
+    ----------
+    n : int, optional
+        Length of the random DNA sequence that is indexed. Defaults to 100000.
+    amostragens : list[int], optional
+        The sampling rates to compare. Defaults to [1, 4, 16, 32, 64, 128].
+    num_padroes : int, optional
+        Number of patterns located for each sampling rate. Defaults to 200.
+    tamanho_padrao : int, optional
+        Length of the patterns. Defaults to 8.
+
+    Returns
+    -------
+    list[dict]
+        One entry per sampling rate with the memory of the sampled suffix array (bytes) and the mean locate time (seconds).
+    """
+
+    seq = sequencia_aleatoria(n)
+    gerador = random.Random(1)
+    padroes = []
+    for _ in range(num_padroes):
+        inicio = gerador.randrange(n - tamanho_padrao)
+        padroes.append(seq[inicio:inicio + tamanho_padrao])
+
+    classe = BWT(seq)
+    resultados = []
+    for k in amostragens:
+        indice = FMIndex.from_bwt(classe, amostragem_sa=k)
+        memoria = sys.getsizeof(indice.amostras_sa)
+        if indice._marcas is not None:
+            memoria += sys.getsizeof(indice._marcas) + sys.getsizeof(indice._marcas_checkpoints)
+
+        inicio = time.perf_counter()
+        ocorrencias = sum(len(indice.locate(p)) for p in padroes)
+        tempo = (time.perf_counter() - inicio) / num_padroes
+
+        resultados.append({"k": k, "memoria_sa_bytes": memoria, "bytes_por_base": memoria / n,
+                           "ocorrencias": ocorrencias, "locate_s": tempo})
+    return resultados
+
+
+def benchmark_inversao(tamanhos : list[int] = [10**6, 10**7]) -> list[dict]:
+    """
+    Measures the time taken by BWT.obter_seq_original to invert the BWT of random DNA sequences.
+
+    Parameters
+    ----------
+    tamanhos : list[int], optional
+        The lengths of the sequences. Defaults to [10**6, 10**7].
+
+    Returns
+    -------
+    list[dict]
+        One entry per length with the inversion time (seconds) and whether the original sequence was recovered.
+    """
+
+    resultados = []
+    for n in tamanhos:
+        seq = sequencia_aleatoria(n)
+        codificada = BWT(BWT(seq).bwt, encoded=True)
+
+        inicio = time.perf_counter()
+        original = codificada.obter_seq_original()
+        tempo = time.perf_counter() - inicio
+
+        resultados.append({"n": n, "inversao_s": tempo, "correta": original == seq})
+    return resultados
+
+
+def memoria_backend(indice : FMIndex) -> int:
+    """
+    Returns the number of bytes used by the arrays of the rank structure of an index (the BWT and its checkpoints).
+
+    Parameters
+    ----------
+    indice : FMIndex
+        The index.
+
+    Returns
+    -------
+    int
+        The size of the rank structure, in bytes.
+    """
+
+    return sum(len(memoryview(dados).cast('B')) for _, dados in indice.ocorrencias.secoes())
+
+
+def memoria_retida(objeto) -> int:
+    """
+    Returns the number of bytes retained by an object: its own size plus the size of every object reachable from it
+    through attributes and containers, each counted once (classes, modules and functions are not followed).
+
+    Parameters
+    ----------
+    objeto : object
+        The object to measure (for instance, a BWT with its FM-index).
+
+    Returns
+    -------
+    int
+        The retained size, in bytes.
+    """
+
+    vistos = set()
+    pendentes = [objeto]
+    total = 0
+    while pendentes:
+        atual = pendentes.pop()
+        if id(atual) in vistos or isinstance(atual, (type, types.ModuleType, types.FunctionType, types.MethodType)):
+            continue
+        vistos.add(id(atual))
+        total += sys.getsizeof(atual)
+        if isinstance(atual, dict): pendentes += list(atual.keys()) + list(atual.values())
+        elif isinstance(atual, (list, tuple, set, frozenset)): pendentes += list(atual)
+        elif hasattr(atual, "__dict__"): pendentes += list(vars(atual).values())
+    return total
+
+
+def benchmark_memoria(n : int = 10**6, amostragem_sa : int = 32, tipo : str = "aleatoria", **opcoes) -> list[dict]:
+    """
+    Compares the memory retained by a whole BWT object (the BWT, the sequence, the suffix array and the FM-index)
+    with each backend, after the index is built, and the share of it taken by the rank structure.
+
+    Parameters
+    ----------
+    n : int, optional
+        Length of the DNA sequence. Defaults to 10**6.
+    amostragem_sa : int, optional
+        Suffix array sampling rate of the FM-index. Defaults to 32.
+    tipo : str, optional
+        Type of the sequence, a key of GERADORES. Defaults to "aleatoria".
+    **opcoes
+        Options of the sequence generator (for instance, copias for "repetitiva").
+
+    Returns
+    -------
+    list[dict]
+        One entry per backend with the retained size of the object and of its rank structure, in bytes and in
+        bytes per base, and the reduction relative to the "python" backend.
+    """
+
+    seq = GERADORES[tipo](n, **opcoes)
+    resultados = []
+    for backend in ["python", "dna", "rle"] + (["numpy"] if np is not None else []):
+        classe = BWT(seq, amostragem_sa=amostragem_sa, backend=backend)
+        indice = classe.indice_fm()
+        resultados.append({"backend": backend, "bytes": memoria_retida(classe), "bytes_rank": memoria_backend(indice)})
+        del classe, indice
+    for r in resultados:
+        r["bytes_por_base"] = r["bytes"] / n
+        r["rank_por_base"] = r["bytes_rank"] / n
+        r["reducao"] = resultados[0]["bytes"] / r["bytes"]
+    return resultados
+
+
+def benchmark_compressao(n : int = 10**6, tamanho_bloco : int = 1 << 18) -> list[dict]:
+    """
+    Compares the compression ratio and speed of the BWT compressor (compressao.comprimir) with gzip and bz2
+    on random and repetitive DNA.
+
+    Parameters
+    ----------
+    n : int, optional
+        Length of the DNA sequences. Defaults to 10**6.
+    tamanho_bloco : int, optional
+        Block size of the BWT compressor, in bytes. Defaults to 256 KiB (bz2 uses its maximum of 900 KB).
+
+    Returns
+    -------
+    list[dict]
+        One entry per sequence type and compressor with the compressed size, the ratio (original / compressed),
+        the bits per base and the compression and decompression speeds (MB/s).
+    """
+
+    compressores = {"bwt": (lambda dados: comprimir(dados, tamanho_bloco), descomprimir),
+                    "gzip": (gzip.compress, gzip.decompress),
+                    "bz2": (bz2.compress, bz2.decompress)}
+    resultados = []
+    for tipo, gerador in GERADORES.items():
+        dados = gerador(n).encode()
+        for nome, (comprimir_dados, descomprimir_dados) in compressores.items():
+            inicio = time.perf_counter()
+            comprimido = comprimir_dados(dados)
+            tempo_compressao = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            correto = descomprimir_dados(comprimido) == dados
+            tempo_descompressao = time.perf_counter() - inicio
+
+            resultados.append({"tipo": tipo, "compressor": nome, "bytes": len(comprimido),
+                               "taxa": n / len(comprimido), "bits_por_base": 8 * len(comprimido) / n,
+                               "compressao_mb_s": n / 1e6 / tempo_compressao,
+                               "descompressao_mb_s": n / 1e6 / tempo_descompressao, "correto": correto})
+    return resultados
+
+
+def _tabela(resultados : list[dict], colunas : list[tuple[str, str, str]], saida = None) -> None:
+    """
+    Prints a list of results as a table.
+
+    Parameters
+    ----------
+    resultados : list[dict]
+        The results.
+    colunas : list[tuple[str, str, str]]
+        For each column, its title, the key of the value and its format specification.
+    saida : file, optional
+        The stream to print to. Defaults to sys.stdout.
+
+    Returns
+    -------
+    None
+    """
+
+    print(" ".join(f"{titulo:>14}" for titulo, _, _ in colunas), file=saida)
+    for r in resultados:
+        print(" ".join(f"{format(r[chave], formato):>14}" for _, chave, formato in colunas), file=saida)
+
+
+def _lista(tipo):
+    """
+    Returns an argparse type that parses a comma-separated list.
+    """
+
+    return lambda texto: [tipo(x) for x in texto.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks of the BWT class and of the FM-index.")
+    comum = argparse.ArgumentParser(add_help=False)
+    comum.add_argument("--json", help="write the results, with the platform details, to this JSON file ('-' for stdout)")
+    modos = parser.add_subparsers(dest="modo", required=True)
+
+    escala = modos.add_parser("escala", parents=[comum],
+                             help="construction, inversion and search time and peak RSS as n grows")
+    escala.add_argument("--tamanhos", type=_lista(int), default=[10**3, 10**4, 10**5, 10**6, 10**7])
+    escala.add_argument("--tipos", type=_lista(str), default=list(GERADORES))
+    escala.add_argument("--backends", type=_lista(str),
+                        default=["python", "dna", "rle"] + (["numpy"] if np is not None else []))
+    escala.add_argument("--padroes", type=int, default=100)
+    escala.add_argument("--tamanho-padrao", type=int, default=12)
+    escala.add_argument("--amostragem-sa", type=int, default=32)
+    escala.add_argument("--mesmo-processo", action="store_true", help="run every size in this process")
+
+    amostragem = modos.add_parser("amostragem", parents=[comum],
+                                 help="memory and locate time of the sampled suffix array")
+    amostragem.add_argument("--n", type=int, default=100000)
+    amostragem.add_argument("--amostragens", type=_lista(int), default=[1, 4, 16, 32, 64, 128])
+
+    inversao = modos.add_parser("inversao", parents=[comum], help="time of obter_seq_original")
+    inversao.add_argument("--tamanhos", type=_lista(int), default=[10**6, 10**7])
+
+    memoria = modos.add_parser("memoria", parents=[comum], help="memory retained by a BWT object with each backend")
+    memoria.add_argument("--n", type=int, default=10**6)
+    memoria.add_argument("--amostragem-sa", type=int, default=32)
+    memoria.add_argument("--tipo", choices=list(GERADORES), default="aleatoria")
+    memoria.add_argument("--copias", type=int, default=10, help="number of copies of a repetitive sequence")
+
+    compressao = modos.add_parser("compressao", parents=[comum], help="BWT compressor against gzip and bz2 on DNA")
+    compressao.add_argument("--n", type=int, default=10**6)
+    compressao.add_argument("--tamanho-bloco", type=int, default=1 << 18)
+
+    args = parser.parse_args()
+    # with --json - the JSON report takes stdout, so the table goes to stderr
+    saida = sys.stderr if args.json == "-" else sys.stdout
+
+    if args.modo == "escala":
+        for tipo in args.tipos:
+            if tipo not in GERADORES: parser.error(f"unknown sequence type {tipo}, expected one of {list(GERADORES)}")
+        for backend in args.backends:
+            if backend not in BACKENDS: parser.error(f"unknown backend {backend}, expected one of {list(BACKENDS)}")
+
+        resultados = executar_escala(args.tamanhos, args.tipos, args.backends, not args.mesmo_processo,
+                                     num_padroes=args.padroes, tamanho_padrao=args.tamanho_padrao,
+                                     amostragem_sa=args.amostragem_sa)
+        linhas = [{**r, "backend": b, **valores} for r in resultados for b, valores in r["backends"].items()]
+        _tabela(linhas, [("n", "n", "d"), ("type", "tipo", "s"), ("build (s)", "construir_BWT_s", ".3f"),
+                         ("inversion (s)", "obter_seq_original_s", ".3f"), ("peak RSS (B)", "pico_rss_bytes", ".3e"),
+                         ("backend", "backend", "s"), ("bytes", "bytes", "d"), ("locate (s)", "locate_s", ".3e"),
+                         ("count (s)", "count_s", ".3e")], saida)
+
+    elif args.modo == "amostragem":
+        print(f"Sampled suffix array, n = {args.n}", file=saida)
+        resultados = benchmark_amostragem(args.n, args.amostragens)
+        _tabela(resultados, [("k", "k", "d"), ("SA bytes", "memoria_sa_bytes", "d"),
+                             ("bytes/base", "bytes_por_base", ".3f"), ("locate (s)", "locate_s", ".3e")], saida)
+
+    elif args.modo == "inversao":
+        resultados = benchmark_inversao(args.tamanhos)
+        _tabela(resultados, [("n", "n", "d"), ("inversion (s)", "inversao_s", ".3f"), ("correct", "correta", "")], saida)
+
+    elif args.modo == "compressao":
+        resultados = benchmark_compressao(args.n, args.tamanho_bloco)
+        _tabela(resultados, [("type", "tipo", "s"), ("compressor", "compressor", "s"), ("bytes", "bytes", "d"),
+                             ("ratio", "taxa", ".2f"), ("bits/base", "bits_por_base", ".3f"),
+                             ("comp. MB/s", "compressao_mb_s", ".3f"), ("decomp. MB/s", "descompressao_mb_s", ".3f"),
+                             ("correct", "correto", "")], saida)
+
+    else:
+        opcoes = {"copias": args.copias} if args.tipo == "repetitiva" else {}
+        resultados = benchmark_memoria(args.n, args.amostragem_sa, args.tipo, **opcoes)
+        _tabela(resultados, [("backend", "backend", "s"), ("object bytes", "bytes", "d"),
+                             ("bytes/base", "bytes_por_base", ".3f"), ("rank bytes/base", "rank_por_base", ".3f"),
+                             ("vs python", "reducao", ".2f")], saida)
+
+    if args.json:
+        relatorio = {"modo": args.modo, "argumentos": {k: v for k, v in vars(args).items() if k not in ("json", "modo")},
+                     "python": platform.python_version(), "plataforma": platform.platform(),
+                     "data": time.strftime("%Y-%m-%dT%H:%M:%S"), "resultados": resultados}
+        if args.json == "-":
+            json.dump(relatorio, sys.stdout, indent=2)
+            print()
+        else:
+            with open(args.json, "w") as f: json.dump(relatorio, f, indent=2)
@@ -0,0 +1,410 @@
+"""
+Compressão por blocos baseada na BWT (ao estilo do bzip2)
+
+Cada bloco passa por: BWT (classe BWT, via suffix array) -> move-to-front -> codificação das
+corridas de zeros (RUNA/RUNB) -> código de Huffman canónico. A descompressão inverte os passos
+e usa a inversão linear da BWT (BWT.obter_seq_original).
+
+Os dados são processados em blocos de tamanho fixo, lidos e escritos um de cada vez, pelo
+que a memória usada depende do tamanho do bloco e não do tamanho do ficheiro.
+
+Baseado em:
+    M. Burrows e D. Wheeler, "A block-sorting lossless data compression algorithm", 1994.
+    J. Seward, bzip2 (codificação RUNA/RUNB das corridas de zeros).
+
+Formato: MAGIC, versão e tamanho do bloco, seguidos de cada bloco com o cabeçalho
+(n, linha primária, número de símbolos, número de bits), os comprimentos dos códigos de
+Huffman (um byte por símbolo) e os bits codificados.
+"""
+
+import subprocess
+import heapq
+import io
+import re
+import struct
+from BWT import BWT
+
+MAGIC = b"BWTZ"
+VERSAO = 1
+_CABECALHO_BLOCO = struct.Struct("<IIIQ")
+
+RUNA, RUNB = 0, 1
+NUM_SIMBOLOS = 257
+
+# Every byte is mapped to a character above 255, so the '$' used as end-of-string marker by the BWT class never
+# occurs in the block, whatever the data.
+_DESLOCAR = {i: chr(i + 256) for i in range(256)}
+_REPOR = {i + 256: chr(i) for i in range(256)}
+
+
+def move_to_front(dados : bytes) -> bytearray:
+    """
+    Applies the move-to-front transform: each byte is replaced by its position in a list of recently used bytes,
+    and then moved to the front of the list. The runs of equal symbols of a BWT become runs of zeros.
+
+    Parameters
+    ----------
+    dados : bytes
+        The data to transform.
+
+    Returns
+    -------
+    bytearray
+        The position of each byte in the list at the time it was read.
+    """
+
+    tabela = bytearray(range(256))
+    res = bytearray(len(dados))
+    for k, b in enumerate(dados):
+        i = tabela.index(b)
+        res[k] = i
+        if i:
+            del tabela[i]
+            tabela.insert(0, b)
+    return res
+
+
+def inverter_move_to_front(indices : bytes) -> bytearray:
+    """
+    Reverts the move-to-front transform.
+
+    Parameters
+    ----------
+    indices : bytes
+        The output of move_to_front.
+
+    Returns
+    -------
+    bytearray
+        The original data.
+    """
+
+    tabela = bytearray(range(256))
+    res = bytearray(len(indices))
+    for k, i in enumerate(indices):
+        b = tabela[i]
+        res[k] = b
+        if i:
+            del tabela[i]
+            tabela.insert(0, b)
+    return res
+
+
+def codificar_zeros(indices : bytes) -> list[int]:
+    """
+    Encodes the runs of zeros of the move-to-front output with the RUNA/RUNB symbols of bzip2: the length of the run is
+    written in bijective base 2, RUNA being the digit 1 and RUNB the digit 2, least significant digit first.
+    Every other value v is written as the symbol v + 1.
+
+    Parameters
+    ----------
+    indices : bytes
+        The output of move_to_front.
+
+    Returns
+    -------
+    list[int]
+        The symbols, in the range [0, 256].
+    """
+
+    res = []
+    for corrida in re.finditer(rb"\x00+|[^\x00]+", indices):
+        valores = corrida.group()
+        if valores[0]:
+            res.extend(v + 1 for v in valores)
+            continue
+        r = len(valores)
+        while r > 0:
+            r -= 1
+            res.append(RUNB if r & 1 else RUNA)
+            r >>= 1
+    return res
+
+
+def descodificar_zeros(simbolos : list[int]) -> bytearray:
+    """
+    Reverts codificar_zeros.
+
+    Parameters
+    ----------
+    simbolos : list[int]
+        The symbols produced by codificar_zeros.
+
+    Returns
+    -------
+    bytearray
+        The move-to-front output.
+    """
+
+    res = bytearray()
+    corrida = peso = 0
+    for s in simbolos:
+        if s <= RUNB:
+            corrida += (s + 1) << peso
+            peso += 1
+            continue
+        if corrida:
+            res += bytes(corrida)
+            corrida = peso = 0
+        res.append(s - 1)
+    if corrida: res += bytes(corrida)
+    return res
+
+
+def comprimentos_huffman(frequencias : list[int]) -> list[int]:
+    """
+    Computes the code length of each symbol of a Huffman code.
+
+    Parameters
+    ----------
+    frequencias : list[int]
+        The number of occurrences of each symbol.
+
+    Returns
+    -------
+    list[int]
+        The length of the code of each symbol (0 for symbols that do not occur).
+    """
+
+    comprimentos = [0] * len(frequencias)
+    heap = [(f, s, [s]) for s, f in enumerate(frequencias) if f > 0]
+    if len(heap) == 1: comprimentos[heap[0][1]] = 1
+    heapq.heapify(heap)
+
+    while len(heap) > 1:
+        f1, s1, simbolos1 = heapq.heappop(heap)
+        f2, _, simbolos2 = heapq.heappop(heap)
+        for s in simbolos1 + simbolos2: comprimentos[s] += 1
+        heapq.heappush(heap, (f1 + f2, s1, simbolos1 + simbolos2))
+    return comprimentos
+
+
+def codigos_canonicos(comprimentos : list[int]) -> dict[int, str]:
+    """
+    Assigns the canonical Huffman codes for the given code lengths, so only the lengths need to be stored.
+
+    Parameters
+    ----------
+    comprimentos : list[int]
+        The length of the code of each symbol (0 for symbols that do not occur).
+
+    Returns
+    -------
+    dict[int, str]
+        The code of each symbol, as a string of '0' and '1'.
+    """
+
+    codigos = {}
+    codigo = anterior = 0
+    for comprimento, s in sorted((l, s) for s, l in enumerate(comprimentos) if l > 0):
+        codigo <<= comprimento - anterior
+        codigos[s] = format(codigo, f"0{comprimento}b")
+        codigo += 1
+        anterior = comprimento
+    return codigos
+
+
+def comprimir_bloco(bloco : bytes) -> bytes:
+    """
+    Compresses one block: BWT, move-to-front, RUNA/RUNB encoding of the runs of zeros and canonical Huffman coding.
+
+    Parameters
+    ----------
+    bloco : bytes
+        The data of the block.
+
+    Returns
+    -------
+    bytes
+        The compressed block, with its header.
+    """
+
+    bwt = BWT(bloco.decode("latin-1").translate(_DESLOCAR)).bwt
+    primario = bwt.index('$')
+    ultima = (bwt[:primario] + bwt[primario + 1:]).translate(_REPOR).encode("latin-1")
+    del bwt
+
+    simbolos = codificar_zeros(move_to_front(ultima))
+    frequencias = [0] * NUM_SIMBOLOS
+    for s in simbolos: frequencias[s] += 1
+    comprimentos = comprimentos_huffman(frequencias)
+    codigos = codigos_canonicos(comprimentos)
+
+    bits = "".join(map(codigos.__getitem__, simbolos))
+    num_bytes = (len(bits) + 7) // 8
+    dados = int(bits.ljust(8 * num_bytes, "0") or "0", 2).to_bytes(num_bytes, "big")
+    return _CABECALHO_BLOCO.pack(len(bloco), primario, len(simbolos), len(bits)) + bytes(comprimentos) + dados
+
+
+def _ler_bloco(entrada) -> bytes:
+    """
+    Reads and decompresses the next block of a stream.
+
+    Parameters
+    ----------
+    entrada : BinaryIO
+        The compressed stream, positioned at the start of a block.
+
+    Returns
+    -------
+    bytes
+        The original data of the block, or None at the end of the stream.
+
+    Raises
+    ------
+    ValueError
+        If the stream ends in the middle of a block.
+    """
+
+    cabecalho = entrada.read(_CABECALHO_BLOCO.size)
+    if not cabecalho: return None
+    if len(cabecalho) < _CABECALHO_BLOCO.size:
+        raise ValueError("The compressed data is truncated")
+    n, primario, num_simbolos, num_bits = _CABECALHO_BLOCO.unpack(cabecalho)
+    comprimentos = entrada.read(NUM_SIMBOLOS)
+    num_bytes = (num_bits + 7) // 8
+    dados = entrada.read(num_bytes)
+    if len(comprimentos) < NUM_SIMBOLOS or len(dados) < num_bytes:
+        raise ValueError("The compressed data is truncated")
+
+    tabela = {codigo: s for s, codigo in codigos_canonicos(comprimentos).items()}
+    tamanhos = sorted(set(comprimentos) - {0})
+    bits = format(int.from_bytes(dados, "big"), f"0{8 * num_bytes}b")
+    simbolos = []
+    i = 0
+    for _ in range(num_simbolos):
+        for tamanho in tamanhos:
+            s = tabela.get(bits[i:i + tamanho])
+            if s is not None: break
+        simbolos.append(s)
+        i += tamanho
+
+    ultima = inverter_move_to_front(descodificar_zeros(simbolos)).decode("latin-1").translate(_DESLOCAR)
+    bwt = ultima[:primario] + '$' + ultima[primario:]
+    texto = BWT(bwt, encoded=True).obter_seq_original()
+    assert len(texto) == n, "The decompressed block has the wrong length"
+    return texto.translate(_REPOR).encode("latin-1")
+
+
+def comprimir_stream(entrada, saida, tamanho_bloco : int = 1 << 18) -> None:
+    """
+    Compresses a binary stream block by block, so only one block is kept in memory at a time.
+
+    Parameters
+    ----------
+    entrada : BinaryIO
+        The stream to compress.
+    saida : BinaryIO
+        The stream where the compressed data is written.
+    tamanho_bloco : int, optional
+        Size of each block, in bytes. Larger blocks compress better but use more memory. Defaults to 256 KiB.
+
+    Returns
+    -------
+    None
+    """
+
+    assert tamanho_bloco > 0, "The block size must be positive"
+
+    saida.write(MAGIC + struct.pack("<II", VERSAO, tamanho_bloco))
+    while True:
+        bloco = entrada.read(tamanho_bloco)
+        if not bloco: break
+        saida.write(comprimir_bloco(bloco))
+
+
+def descomprimir_stream(entrada, saida) -> None:
+    """
+    Decompresses a binary stream written by comprimir_stream, block by block.
+
+    Parameters
+    ----------
+    entrada : BinaryIO
+        The compressed stream.
+    saida : BinaryIO
+        The stream where the original data is written.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If the stream was not written by comprimir_stream, or is truncated.
+    """
+
+    cabecalho = entrada.read(len(MAGIC) + 8)
+    if cabecalho[:len(MAGIC)] != MAGIC or len(cabecalho) < len(MAGIC) + 8:
+        raise ValueError("The data was not compressed with comprimir")
+    versao, _ = struct.unpack("<II", cabecalho[len(MAGIC):])
+    if versao != VERSAO:
+        raise ValueError(f"Unsupported version {versao}")
+
+    while True:
+        bloco = _ler_bloco(entrada)
+        if bloco is None: break
+        saida.write(bloco)
+
+
+def comprimir(dados : bytes, tamanho_bloco : int = 1 << 18) -> bytes:
+    """
+    Compresses data in memory (see comprimir_stream).
+
+    Parameters
+    ----------
+    dados : bytes
+        The data to compress.
+    tamanho_bloco : int, optional
+        Size of each block, in bytes. Defaults to 256 KiB.
+
+    Returns
+    -------
+    bytes
+        The compressed data.
+    """
+
+    saida = io.BytesIO()
+    comprimir_stream(io.BytesIO(dados), saida, tamanho_bloco)
+    return saida.getvalue()
+
+
+def descomprimir(dados : bytes) -> bytes:
+    """
+    Decompresses data written by comprimir.
+
+    Parameters
+    ----------
+    dados : bytes
+        The compressed data.
+
+    Returns
+    -------
+    bytes
+        The original data.
+    """
+
+    saida = io.BytesIO()
+    descomprimir_stream(io.BytesIO(dados), saida)
+    return saida.getvalue()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) == 4 and sys.argv[1] in ("-c", "-d"):
+        with open(sys.argv[2], "rb") as entrada, open(sys.argv[3], "wb") as saida:
+            if sys.argv[1] == "-c": comprimir_stream(entrada, saida)
+            else: descomprimir_stream(entrada, saida)
+    else:
+        dados = b"TAGACAGAGA" * 50 + b"ACGTTGCA" * 50
+        comprimido = comprimir(dados)
+        print(f"{len(dados)} bytes -> {len(comprimido)} bytes, round trip: {descomprimir(comprimido) == dados}")
+
+    print("Metricas de Codigo:")
+    print("\nMetrica cyclomatic complexity:")
+    print(subprocess.call(["radon","cc","BWT/compressao.py", "-s"]))
+    print("\nMetrica maintainability index:")
+    print(subprocess.call(["radon","mi","BWT/compressao.py", "-s"]))
+    print("\nMetrica raw:")
+    print(subprocess.call(["radon","raw","BWT/compressao.py", "-s"]))
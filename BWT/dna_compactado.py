@@ -0,0 +1,300 @@
+"""
+Armazenamento compacto de sequências de DNA com 2 bits por base
+
+As bases A, C, G e T são guardadas com 2 bits cada (4 bases por byte). Os restantes
+símbolos ('$', N, ...) são guardados à parte, como corridas (início, comprimento), e
+ocupam a posição de um A na sequência compactada.
+
+A contagem de ocorrências (rank) é feita diretamente sobre os bytes compactados, com
+checkpoints a cada `intervalo` bases e tabelas de contagem por byte (ao estilo popcount).
+É usado como backend "dna" do FMIndex.
+"""
+
+import subprocess
+import re
+from array import array
+from bisect import bisect_right
+
+BASES = "ACGT"
+CODIGOS = {base: i for i, base in enumerate(BASES)}
+
+# _TRADUCAO maps every byte to its 2-bit code (symbols other than A, C, G and T are stored as A).
+_TRADUCAO = bytearray(256)
+for _base, _codigo in CODIGOS.items(): _TRADUCAO[ord(_base)] = _codigo
+_TRADUCAO = bytes(_TRADUCAO)
+
+# _CONTAGEM[k][b] is the number of bases with code k in the byte b.
+# _PARCIAL[k][j][b] is the number of bases with code k among the first j bases of the byte b.
+_CONTAGEM = [bytes(sum((b >> (2 * p)) & 3 == k for p in range(4)) for b in range(256)) for k in range(4)]
+_PARCIAL = [[bytes(sum((b >> (2 * p)) & 3 == k for p in range(j)) for b in range(256)) for j in range(4)] for k in range(4)]
+# _BASES_BYTE[b] holds the four bases packed in the byte b.
+_BASES_BYTE = ["".join(BASES[(b >> (2 * p)) & 3] for p in range(4)) for b in range(256)]
+
+
+def _antes(inicios, acumulado, i : int) -> int:
+    """
+    Counts how many positions smaller than `i` are covered by a list of runs.
+
+    Parameters
+    ----------
+    inicios : array
+        The start of each run, in increasing order.
+    acumulado : array
+        acumulado[j] is the total length of the runs before run j (it has one more entry than `inicios`).
+    i : int
+        The position.
+
+    Returns
+    -------
+    int
+        The number of positions in [0, i) that belong to a run.
+    """
+
+    j = bisect_right(inicios, i) - 1
+    if j < 0: return 0
+    return acumulado[j] + min(acumulado[j + 1] - acumulado[j], i - inicios[j])
+
+
+class DNACompactado:
+    """
+    This class stores a DNA sequence with 2 bits per base and answers rank queries directly on the packed bytes.
+    Symbols other than A, C, G and T (such as '$' or runs of N) are kept in a side list of runs.
+    With the default interval the structure uses about 0.31 bytes per base.
+
+    Parameters
+    ----------
+    seq : str
+        The sequence to store (for instance, the BWT of a DNA sequence).
+    intervalo : int, optional
+        Spacing between rank checkpoints, in bases. Must be a multiple of 4. Defaults to 256.
+
+    Attributes
+    ----------
+    n : int
+        Length of the sequence.
+    dados : bytes
+        The packed sequence: base i is stored in bits 2 * (i % 4) and 2 * (i % 4) + 1 of byte i // 4.
+    checkpoints : list[array]
+        checkpoints[k][b] is the number of positions with code k in the first b * intervalo positions.
+    runs : dict[str, tuple[array, array]]
+        For each symbol other than A, C, G and T, the start of its runs and the cumulative length of the runs.
+    """
+
+    nome = "dna"
+
+    def __init__(self, seq : str, intervalo : int = 256) -> None:
+
+        assert intervalo > 0 and intervalo % 4 == 0, "The checkpoint interval must be a positive multiple of 4"
+
+        try:
+            codigos = seq.encode("latin-1").translate(_TRADUCAO)
+        except UnicodeEncodeError:
+            raise ValueError("The sequence must only contain single-byte symbols")
+
+        self.n = len(seq)
+        self.intervalo = intervalo
+
+        tamanho = (self.n + 3) // 4
+        valor = 0
+        for p in range(4):
+            valor |= int.from_bytes(codigos[p::4], "little") << (2 * p)
+        self.dados = valor.to_bytes(tamanho, "little")
+
+        self.checkpoints = [array('I', [0]) for _ in BASES]
+        bytes_bloco = intervalo // 4
+        for inicio in range(0, tamanho, bytes_bloco):
+            bloco = self.dados[inicio:inicio + bytes_bloco]
+            for k in range(4):
+                self.checkpoints[k].append(self.checkpoints[k][-1] + sum(bloco.translate(_CONTAGEM[k])))
+
+        self.runs = {}
+        todas = []
+        for corrida in re.finditer(r"([^ACGT])\1*", seq):
+            inicios, acumulado = self.runs.setdefault(corrida.group(1), (array('I'), array('I', [0])))
+            inicios.append(corrida.start())
+            acumulado.append(acumulado[-1] + len(corrida.group()))
+            todas.append((corrida.start(), len(corrida.group()), corrida.group(1)))
+
+        self._inicios = array('I', [inicio for inicio, _, _ in todas])
+        self._acumulado = array('I', [0])
+        for _, comprimento, _ in todas: self._acumulado.append(self._acumulado[-1] + comprimento)
+        self._simbolos = "".join(simbolo for _, _, simbolo in todas).encode("latin-1")
+
+
+    def __len__(self) -> int:
+        return self.n
+
+
+    def __str__(self) -> str:
+        return self.sequencia()
+
+
+    def simbolos(self) -> list[str]:
+        """
+        Returns the symbols that occur in the sequence, in lexicographical order.
+
+        Returns
+        -------
+        list[str]
+            The sorted alphabet of the sequence.
+        """
+
+        presentes = set(self.runs)
+        for base in BASES:
+            if self.rank(base, self.n) > 0: presentes.add(base)
+        return sorted(presentes)
+
+
+    def rank(self, c : str, i : int) -> int:
+        """
+        Counts the occurrences of a symbol in the first `i` positions of the sequence.
+        For a base, the count is read from the nearest checkpoint plus a table lookup for each packed byte after it;
+        positions of other symbols are stored as A, so they are subtracted when counting A.
+
+        Parameters
+        ----------
+        c : str
+            The symbol to count.
+        i : int
+            The number of positions to consider.
+
+        Returns
+        -------
+        int
+            The number of occurrences of `c` in seq[:i].
+        """
+
+        if c not in CODIGOS:
+            if c not in self.runs: return 0
+            return _antes(*self.runs[c], i)
+
+        k = CODIGOS[c]
+        bloco = i // self.intervalo
+        fim = i >> 2
+        res = self.checkpoints[k][bloco] + sum(bytes(self.dados[bloco * self.intervalo >> 2:fim]).translate(_CONTAGEM[k]))
+        if i & 3: res += _PARCIAL[k][i & 3][self.dados[fim]]
+        if k == 0: res -= _antes(self._inicios, self._acumulado, i)
+        return res
+
+
+    def simbolo(self, i : int) -> str:
+        """
+        Returns the symbol at position `i` of the sequence.
+
+        Parameters
+        ----------
+        i : int
+            A position of the sequence.
+
+        Returns
+        -------
+        str
+            The symbol seq[i].
+        """
+
+        j = bisect_right(self._inicios, i) - 1
+        if j >= 0 and i - self._inicios[j] < self._acumulado[j + 1] - self._acumulado[j]:
+            return chr(self._simbolos[j])
+        return BASES[(self.dados[i >> 2] >> ((i & 3) << 1)) & 3]
+
+
+    def sequencia(self) -> str:
+        """
+        Decodes the whole sequence: the packed bytes are expanded four bases at a time with a table, and the runs of
+        the other symbols are written over the A's that hold their positions.
+
+        Returns
+        -------
+        str
+            The stored sequence.
+        """
+
+        bases = "".join(map(_BASES_BYTE.__getitem__, self.dados))
+        partes = []
+        anterior = 0
+        for j, inicio in enumerate(self._inicios):
+            comprimento = self._acumulado[j + 1] - self._acumulado[j]
+            partes += [bases[anterior:inicio], chr(self._simbolos[j]) * comprimento]
+            anterior = inicio + comprimento
+        partes.append(bases[anterior:self.n])
+        return "".join(partes)
+
+
+    def metadados(self) -> dict:
+        """
+        Returns the parameters needed to rebuild the structure from its sections (see FMIndex.save).
+
+        Returns
+        -------
+        dict
+            The checkpoint interval and the symbols stored as runs.
+        """
+
+        return {"intervalo": self.intervalo, "runs": sorted(self.runs)}
+
+
+    def secoes(self) -> list[tuple[str, object]]:
+        """
+        Returns the arrays of the structure, to be written by FMIndex.save.
+
+        Returns
+        -------
+        list[tuple[str, object]]
+            Pairs (name, buffer).
+        """
+
+        secoes = [("dados", self.dados), ("inicios", self._inicios), ("acumulado", self._acumulado),
+                  ("simbolos", self._simbolos)]
+        secoes += [("checkpoints:" + base, self.checkpoints[k]) for k, base in enumerate(BASES)]
+        for c in sorted(self.runs):
+            secoes += [("runs:inicios:" + c, self.runs[c][0]), ("runs:acumulado:" + c, self.runs[c][1])]
+        return secoes
+
+
+    @classmethod
+    def de_secoes(cls, n : int, metadados : dict, secao) -> "DNACompactado":
+        """
+        Rebuilds the structure from the (memory-mapped) sections written by FMIndex.save, without copying them.
+
+        Parameters
+        ----------
+        n : int
+            Length of the sequence.
+        metadados : dict
+            The dictionary returned by `metadados`.
+        secao : Callable[[str, str], memoryview]
+            Returns the section with the given name, cast to the given format.
+
+        Returns
+        -------
+        DNACompactado
+            The packed sequence.
+        """
+
+        compactado = cls.__new__(cls)
+        compactado.n = n
+        compactado.intervalo = metadados["intervalo"]
+        compactado.dados = secao("dados", 'B')
+        compactado._inicios = secao("inicios", 'I')
+        compactado._acumulado = secao("acumulado", 'I')
+        compactado._simbolos = secao("simbolos", 'B')
+        compactado.checkpoints = [secao("checkpoints:" + base, 'I') for base in BASES]
+        compactado.runs = {c: (secao("runs:inicios:" + c, 'I'), secao("runs:acumulado:" + c, 'I')) for c in metadados["runs"]}
+        return compactado
+
+
+if __name__ == "__main__":
+    seq = "ACGTNNNNACGT$TTGCA"
+    compactado = DNACompactado(seq, intervalo=8)
+    print(f"Packed {seq} into {len(compactado.dados)} bytes: {compactado.dados.hex()}")
+    print(f"Decoded: {compactado}")
+    for c in "ACGTN$":
+        print(f"rank({c}, {len(seq)}) = {compactado.rank(c, len(seq))}")
+
+    print("Metricas de Codigo:")
+    print("\nMetrica cyclomatic complexity:")
+    print(subprocess.call(["radon","cc","BWT/dna_compactado.py", "-s"]))
+    print("\nMetrica maintainability index:")
+    print(subprocess.call(["radon","mi","BWT/dna_compactado.py", "-s"]))
+    print("\nMetrica raw:")
+    print(subprocess.call(["radon","raw","BWT/dna_compactado.py", "-s"]))
@@ -0,0 +1,1089 @@
+"""
+Implementação do FM-index sobre a transformada de Burrows-Wheeler (BWT)
+
+Baseado em:
+    P. Ferragina e G. Manzini, "Opportunistic data structures with applications", 2000.
+    B. Langmead, "Burrows-Wheeler Transform and FM Index" (notas de aula).
+
+O índice é construído uma única vez a partir de um objeto BWT e guarda o array C e
+checkpoints da tabela Occ, de forma a que cada pesquisa custe O(|padrão|).
+O suffix array pode ser amostrado (uma entrada em cada k posições do texto), sendo as
+restantes posições recuperadas percorrendo o mapeamento LF.
+
+A procura aproximada (com até k mismatches) segue o algoritmo de backtracking do BWA, com
+poda pelo array D calculado sobre o índice da sequência invertida:
+    H. Li e R. Durbin, "Fast and accurate short read alignment with Burrows-Wheeler transform", 2009.
+
+Novas sequências podem ser acrescentadas a um índice existente sem o reconstruir (BWT-merge):
+a posição de cada sufixo da nova sequência entre as linhas antigas é obtida pelo mapeamento LF,
+e apenas o suffix array da nova sequência é construído.
+
+Os super-maximal exact matches (SMEMs) de uma read são encontrados com bi-intervalos sobre o
+índice e o índice da sequência invertida (FM-index bidirecional):
+    H. Li, "Exploring single-sample SNP and INDEL calling with whole-genome de novo assembly", 2012.
+
+O índice pode ser guardado num ficheiro binário (save) e aberto com mmap (load), sem o reconstruir.
+
+A contagem de ocorrências (rank) é delegada numa estrutura escolhida pelo argumento backend:
+"python" (BWT em bytes com checkpoints da tabela Occ), "dna" (BWT compactada com 2 bits por base),
+"rle" (BWT comprimida por run-length, para coleções repetitivas) ou "numpy" (tabela Occ calculada
+com cumsum, requer NumPy).
+"""
+
+import subprocess
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from suffix_array import construir_suffix_array_colecao
+from dna_compactado import DNACompactado
+from rlbwt import RLBWT
+from occ_numpy import OccNumpy
+
+MAGIC = b"FMIX"
+VERSAO = 3
+
+
+class OccCheckpoints:
+    """
+    This class answers rank queries over a BWT stored as bytes, using sampled Occ checkpoints:
+    the number of occurrences of every symbol is stored only every `intervalo` positions of the BWT, and the rank
+    of any position is answered from the nearest checkpoint plus a count over at most `intervalo` symbols.
+    It is the "python" backend of the FMIndex.
+
+    Parameters
+    ----------
+    bwt : str
+        The Burrows-Wheeler Transform. Only single-byte symbols are supported.
+    intervalo : int, optional
+        Spacing between Occ checkpoints. Defaults to 64.
+
+    Attributes
+    ----------
+    texto : bytes
+        The BWT encoded as bytes (latin-1).
+    occ : dict[str, array]
+        For each symbol, the number of its occurrences in bwt[:b * intervalo], for every block b.
+    """
+
+    nome = "python"
+
+    def __init__(self, bwt : str, intervalo : int = 64) -> None:
+
+        assert intervalo > 0, "The checkpoint interval must be positive"
+
+        try:
+            self.texto = bwt.encode("latin-1")
+        except UnicodeEncodeError:
+            raise ValueError("The FM-index only supports single-byte symbols")
+
+        self.n = len(bwt)
+        self.intervalo = intervalo
+        self._codigos = {c: c.encode("latin-1") for c in set(bwt)}
+
+        self.occ = {}
+        for c, codigo in self._codigos.items():
+            checkpoints = array('I', [0])
+            for inicio in range(0, self.n, intervalo):
+                checkpoints.append(checkpoints[-1] + self.texto.count(codigo, inicio, inicio + intervalo))
+            self.occ[c] = checkpoints
+
+
+    def simbolos(self) -> list[str]:
+        """
+        Returns the symbols of the BWT, in lexicographical order.
+
+        Returns
+        -------
+        list[str]
+            The sorted alphabet of the BWT.
+        """
+
+        return sorted(self._codigos)
+
+
+    def rank(self, c : str, i : int) -> int:
+        """
+        Counts the occurrences of a symbol in the first `i` positions of the BWT (Occ(c, i)).
+
+        Parameters
+        ----------
+        c : str
+            The symbol to count.
+        i : int
+            The number of BWT positions to consider.
+
+        Returns
+        -------
+        int
+            The number of occurrences of `c` in bwt[:i].
+        """
+
+        if c not in self.occ: return 0
+        bloco = i // self.intervalo
+        inicio = bloco * self.intervalo
+        return self.occ[c][bloco] + bytes(self.texto[inicio:i]).count(self._codigos[c])
+
+
+    def simbolo(self, i : int) -> str:
+        """
+        Returns the symbol at position `i` of the BWT.
+
+        Parameters
+        ----------
+        i : int
+            A position of the BWT.
+
+        Returns
+        -------
+        str
+            The symbol bwt[i].
+        """
+
+        return chr(self.texto[i])
+
+
+    def sequencia(self) -> str:
+        """
+        Decodes the whole BWT (the inverse of the constructor).
+
+        Returns
+        -------
+        str
+            The BWT.
+        """
+
+        return bytes(self.texto).decode("latin-1")
+
+
+    def metadados(self) -> dict:
+        """
+        Returns the parameters needed to rebuild the structure from its sections (see FMIndex.save).
+
+        Returns
+        -------
+        dict
+            The checkpoint interval and the alphabet.
+        """
+
+        return {"intervalo": self.intervalo, "simbolos": self.simbolos()}
+
+
+    def secoes(self) -> list[tuple[str, object]]:
+        """
+        Returns the arrays of the structure, to be written by FMIndex.save.
+
+        Returns
+        -------
+        list[tuple[str, object]]
+            Pairs (name, buffer).
+        """
+
+        return [("texto", self.texto)] + [("occ:" + c, self.occ[c]) for c in self.simbolos()]
+
+
+    @classmethod
+    def de_secoes(cls, n : int, metadados : dict, secao) -> "OccCheckpoints":
+        """
+        Rebuilds the structure from the (memory-mapped) sections written by FMIndex.save, without copying them.
+
+        Parameters
+        ----------
+        n : int
+            Length of the BWT.
+        metadados : dict
+            The dictionary returned by `metadados`.
+        secao : Callable[[str, str], memoryview]
+            Returns the section with the given name, cast to the given format.
+
+        Returns
+        -------
+        OccCheckpoints
+            The rank structure.
+        """
+
+        ocorrencias = cls.__new__(cls)
+        ocorrencias.n = n
+        ocorrencias.intervalo = metadados["intervalo"]
+        ocorrencias.texto = secao("texto", 'B')
+        ocorrencias._codigos = {c: c.encode("latin-1") for c in metadados["simbolos"]}
+        ocorrencias.occ = {c: secao("occ:" + c, 'I') for c in metadados["simbolos"]}
+        return ocorrencias
+
+
+BACKENDS = {"python": OccCheckpoints, "dna": DNACompactado, "rle": RLBWT, "numpy": OccNumpy}
+
+
+class FMIndex:
+    """
+    This class implements an FM-index over the Burrows-Wheeler Transform of a sequence.
+    It keeps the C array (the first row of each symbol in the sorted first column) and a rank structure over the BWT
+    (by default sampled Occ checkpoints, see OccCheckpoints), so a backward search costs O(|pattern|) rank queries.
+
+    Parameters
+    ----------
+    bwt : str
+        The Burrows-Wheeler Transform of the indexed sequence. Only single-byte symbols are supported.
+    sa : list[int] | array
+        The suffix array of the indexed sequence.
+    intervalo : int, optional
+        Spacing between checkpoints of the rank structure. Defaults to the default of the backend.
+    amostragem_sa : int, optional
+        Suffix array sampling rate k. Only the entries whose value is a multiple of k are kept; the others are recovered
+        with at most k - 1 LF steps. Larger values use less memory and make locate slower. Defaults to 1 (full suffix array).
+    backend : str, optional
+        The rank structure: "python" (OccCheckpoints), "dna" (DNACompactado, 2 bits per base), "rle" (RLBWT, memory
+        proportional to the number of runs of the BWT) or "numpy" (OccNumpy, rank by array lookup). Defaults to "python".
+
+    Attributes
+    ----------
+    n : int
+        Length of the BWT.
+    C : dict[str, int]
+        For each symbol, the number of symbols in the BWT that are lexicographically smaller.
+    ocorrencias : OccCheckpoints | DNACompactado | RLBWT | OccNumpy
+        The rank structure over the BWT.
+    amostras_sa : array
+        The sampled suffix array entries, in row order.
+    inicios : array
+        The starting position of each document, when several sequences are indexed together (s1$s2$...sd$).
+    """
+
+    def __init__(self, bwt : str, sa : list[int] | array, intervalo : int = None, amostragem_sa : int = 1,
+                 backend : str = "python") -> None:
+
+        assert amostragem_sa > 0, "The suffix array sampling rate must be positive"
+        assert len(bwt) == len(sa), "The BWT and the suffix array must have the same length"
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend}, expected one of {list(BACKENDS)}")
+
+        self.n = len(bwt)
+        self.amostragem_sa = amostragem_sa
+        self.backend = backend
+        self.ocorrencias = BACKENDS[backend](bwt) if intervalo is None else BACKENDS[backend](bwt, intervalo)
+        self._calcular_C()
+        self._amostrar_sa(bwt, sa)
+        self._reverso = None
+
+
+    def _calcular_C(self) -> None:
+        """
+        Computes the C array from the total number of occurrences of each symbol in the BWT.
+
+        Returns
+        -------
+        None
+        """
+
+        self.C = {}
+        total = 0
+        for c in self.ocorrencias.simbolos():
+            self.C[c] = total
+            total += self.ocorrencias.rank(c, self.n)
+
+
+    def _amostrar_sa(self, bwt : str, sa : list[int] | array) -> None:
+        """
+        Keeps the suffix array entries whose value is a multiple of the sampling rate in a compact array('I').
+        The rows where a document starts (the rows whose BWT symbol is '$') are always sampled, so the LF walk of
+        locate never has to cross a document boundary.
+        The sampled rows are marked in a bitvector (one bit per row) with a popcount checkpoint every 512 rows,
+        so the position of a sampled row in `amostras_sa` is found with a rank over the bitvector.
+
+        Parameters
+        ----------
+        bwt : str
+            The Burrows-Wheeler Transform of the indexed sequence.
+        sa : list[int] | array
+            The full suffix array of the indexed sequence.
+
+        Returns
+        -------
+        None
+        """
+
+        inicios = []
+        linha = bwt.find('$')
+        while linha != -1:
+            inicios.append(sa[linha])
+            linha = bwt.find('$', linha + 1)
+        self.inicios = array('I', sorted(inicios))
+
+        k = self.amostragem_sa
+        if k == 1:
+            self.amostras_sa = array('I', sa)
+            self._marcas = None
+            return
+
+        marcas = bytearray((self.n + 7) // 8)
+        amostras = array('I')
+        for linha, posicao in enumerate(sa):
+            if posicao % k == 0 or bwt[linha] == '$':
+                marcas[linha >> 3] |= 1 << (linha & 7)
+                amostras.append(posicao)
+
+        self.amostras_sa = amostras
+        self._marcas = bytes(marcas)
+        self._calcular_checkpoints_marcas()
+
+
+    def _calcular_checkpoints_marcas(self) -> None:
+        """
+        Computes the number of sampled rows before every block of 512 rows of the bitvector of sampled rows.
+
+        Returns
+        -------
+        None
+        """
+
+        self._marcas_checkpoints = array('I', [0])
+        for inicio in range(0, len(self._marcas), 64):
+            bloco = int.from_bytes(self._marcas[inicio:inicio + 64], "little").bit_count()
+            self._marcas_checkpoints.append(self._marcas_checkpoints[-1] + bloco)
+
+
+    @classmethod
+    def from_bwt(cls, bwt, intervalo : int = None, amostragem_sa : int = 1, backend : str = "python") -> "FMIndex":
+        """
+        Builds the FM-index of a BWT object, reusing the suffix array computed during its construction.
+
+        Parameters
+        ----------
+        bwt : BWT
+            An instance of the BWT class.
+        intervalo : int, optional
+            Spacing between checkpoints of the rank structure. Defaults to the default of the backend.
+        amostragem_sa : int, optional
+            Suffix array sampling rate. Defaults to 1 (full suffix array).
+        backend : str, optional
+            The rank structure, "python", "dna", "rle" or "numpy". Defaults to "python".
+
+        Returns
+        -------
+        FMIndex
+            The FM-index of the sequence.
+        """
+
+        if bwt.sa is not None:
+            sa = bwt.sa
+        elif bwt.encoded:
+            sa = construir_suffix_array_colecao(bwt.obter_seq_original() + "$")
+        else:
+            sa = construir_suffix_array_colecao(bwt.seq_original)
+
+        return cls(bwt.bwt, sa, intervalo, amostragem_sa, backend)
+
+
+    def rank(self, c : str, i : int) -> int:
+        """
+        Counts the occurrences of a symbol in the first `i` positions of the BWT (Occ(c, i)).
+
+        Parameters
+        ----------
+        c : str
+            The symbol to count.
+        i : int
+            The number of BWT positions to consider.
+
+        Returns
+        -------
+        int
+            The number of occurrences of `c` in bwt[:i].
+        """
+
+        return self.ocorrencias.rank(c, i)
+
+
+    def lf(self, i : int) -> int:
+        """
+        Applies the LF mapping: returns the row of the sorted matrix whose suffix starts one position before the suffix of row `i`.
+        The separators are distinct sentinels ordered by document, so row j starts with the separator of document j;
+        a row whose symbol is '$' (the start of document j, always sampled) is mapped to the row of the previous separator.
+
+        Parameters
+        ----------
+        i : int
+            A row of the sorted matrix.
+
+        Returns
+        -------
+        int
+            The row obtained by moving the last column symbol of row `i` to the first column.
+        """
+
+        c = self.ocorrencias.simbolo(i)
+        if c == '$':
+            documento = bisect_right(self.inicios, self._amostra(i)) - 1
+            return (documento - 1) % len(self.inicios)
+        return self.C[c] + self.ocorrencias.rank(c, i)
+
+
+    def _amostra(self, i : int) -> int:
+        """
+        Returns the suffix array entry of a sampled row.
+
+        Parameters
+        ----------
+        i : int
+            A sampled row of the sorted matrix.
+
+        Returns
+        -------
+        int
+            The position in the indexed sequence where the suffix of row `i` starts.
+        """
+
+        if self._marcas is None: return self.amostras_sa[i]
+
+        bloco = i >> 9
+        amostra = self._marcas_checkpoints[bloco]
+        amostra += int.from_bytes(self._marcas[bloco << 6:i >> 3], "little").bit_count()
+        amostra += (self._marcas[i >> 3] & ((1 << (i & 7)) - 1)).bit_count()
+        return self.amostras_sa[amostra]
+
+
+    def posicao(self, i : int) -> int:
+        """
+        Returns the suffix array entry of a row, walking the LF mapping until a sampled row is reached.
+
+        Parameters
+        ----------
+        i : int
+            A row of the sorted matrix.
+
+        Returns
+        -------
+        int
+            The position in the indexed sequence where the suffix of row `i` starts.
+        """
+
+        if self._marcas is None: return self.amostras_sa[i]
+
+        passos = 0
+        while not self._marcas[i >> 3] >> (i & 7) & 1:
+            i = self.lf(i)
+            passos += 1
+        return self._amostra(i) + passos
+
+
+    def transformada(self) -> str:
+        """
+        Returns the BWT, decoded from the rank structure (which is the only copy the index keeps).
+
+        Returns
+        -------
+        str
+            The Burrows-Wheeler Transform of the indexed sequence.
+        """
+
+        return self.ocorrencias.sequencia()
+
+
+    def sequencia_original(self) -> str:
+        """
+        Rebuilds the indexed sequence by walking the LF mapping from the row of the last end-of-string marker.
+
+        Returns
+        -------
+        str
+            The indexed sequence, including the end-of-string marker '$'.
+        """
+
+        res = [''] * self.n
+        res[-1] = '$'
+        i = len(self.inicios) - 1
+        for k in range(self.n - 2, -1, -1):
+            res[k] = self.ocorrencias.simbolo(i)
+            i = self.lf(i)
+        return "".join(res)
+
+
+    def adicionar(self, bwt : str, seq : str) -> str:
+        """
+        Appends a new document to the indexed collection (s1$...sd$ becomes s1$...sd$seq$), merging the suffixes of the
+        new sequence into the BWT instead of rebuilding it.
+        Since the separators are distinct sentinels, the old rows keep their relative order and only the new suffixes
+        have to be placed. The new separator is the largest one, so its suffix comes after the d old separators; every other
+        suffix cX of the new sequence comes after the old suffixes that start with a smaller symbol and the old suffixes cY
+        with Y smaller than X, i.e. row(cX) = C[c] + rank(c, row(X)). The new suffixes are sorted among themselves with
+        the suffix array of the new sequence alone, so placing them costs O(|seq|) rank queries.
+        The merge itself is not incremental: the old BWT and sampled suffix array are spliced with the new rows in O(n),
+        and the rank structure is rebuilt from the whole merged BWT, which is also O(n) (with Python-level loops over the
+        checkpoints of "dna" and over the runs of "rle"). Appending avoids re-sorting the old suffixes, not touching them.
+
+        Parameters
+        ----------
+        bwt : str
+            The current BWT of the index (the rank structures do not all keep it as a string).
+        seq : str
+            The sequence to append. It must not contain '$'.
+
+        Returns
+        -------
+        str
+            The BWT of the extended collection. The index is updated in place.
+        """
+
+        assert len(bwt) == self.n, "The BWT does not match the index"
+        assert len(seq) > 0 and '$' not in seq, "The new sequence must be non-empty and must not contain '$'"
+
+        n, m, k = self.n, len(seq), self.amostragem_sa
+        totais = {c: self.rank(c, n) for c in self.C}
+        linhas = [0] * (m + 1)
+        linhas[m] = len(self.inicios)
+        for j in range(m - 1, -1, -1):
+            c = seq[j]
+            menores = self.C[c] if c in self.C else sum(total for a, total in totais.items() if a < c)
+            linhas[j] = menores + self.rank(c, linhas[j + 1])
+
+        marcas = None
+        if self._marcas is not None:
+            marcas = format(int.from_bytes(self._marcas, "little"), f"0{8 * len(self._marcas)}b")[::-1]
+
+        partes_bwt, partes_marcas = [], []
+        amostras = array('I')
+        anterior = amostra = 0
+        for j in [*construir_suffix_array_colecao(seq + '$'), None]:
+            linha = linhas[j] if j is not None else n
+            partes_bwt.append(bwt[anterior:linha])
+            if marcas is None:
+                proxima = linha
+            else:
+                proxima = amostra + marcas.count('1', anterior, linha)
+                partes_marcas.append(marcas[anterior:linha])
+            amostras.frombytes(memoryview(self.amostras_sa[amostra:proxima]).cast('B'))
+            amostra, anterior = proxima, linha
+            if j is None: break
+
+            partes_bwt.append(seq[j - 1] if j > 0 else '$')
+            if marcas is None or (n + j) % k == 0 or j == 0:
+                amostras.append(n + j)
+                if marcas is not None: partes_marcas.append('1')
+            else:
+                partes_marcas.append('0')
+
+        bwt = "".join(partes_bwt)
+        intervalo = self.ocorrencias.intervalo
+        self.n = len(bwt)
+        self.ocorrencias = BACKENDS[self.backend](bwt) if intervalo is None else BACKENDS[self.backend](bwt, intervalo)
+        self._calcular_C()
+        self.inicios = array('I', self.inicios)
+        self.inicios.append(n)
+        self.amostras_sa = amostras
+        if marcas is not None:
+            marcas = "".join(partes_marcas)
+            self._marcas = int(marcas[::-1], 2).to_bytes((self.n + 7) // 8, "little")
+            self._calcular_checkpoints_marcas()
+        self._reverso = None
+        return bwt
+
+
+    def indice_reverso(self) -> "FMIndex":
+        """
+        Returns the FM-index of the reversed sequence, which allows a pattern to be extended to the right.
+        It is built on the first call (keeping a single suffix array sample, since it is never used for locate) and cached.
+
+        Returns
+        -------
+        FMIndex
+            The FM-index of the reversed sequence (the end-of-string marker stays at the end).
+        """
+
+        if self._reverso is None:
+            reverso = self.sequencia_original()[-2::-1] + '$'
+            sa = construir_suffix_array_colecao(reverso)
+            bwt = "".join([reverso[i - 1] for i in sa])
+            self._reverso = FMIndex(bwt, sa, self.ocorrencias.intervalo, amostragem_sa=self.n, backend=self.backend)
+        return self._reverso
+
+
+    def backward_search(self, pattern : str) -> tuple[int, int]:
+        """
+        Finds the range of rows of the sorted rotation matrix that start with the pattern.
+        The pattern is processed from the last to the first symbol, each step costing two rank queries.
+
+        Parameters
+        ----------
+        pattern : str
+            The pattern to search for.
+
+        Returns
+        -------
+        tuple[int, int]
+            The half-open range [top, bottom) of matching rows. The range is empty if the pattern does not occur.
+        """
+
+        top, bottom = 0, self.n
+        for c in reversed(pattern):
+            if c not in self.C: return 0, 0
+            top = self.C[c] + self.rank(c, top)
+            bottom = self.C[c] + self.rank(c, bottom)
+            if top >= bottom: return 0, 0
+        return top, bottom
+
+
+    def count(self, pattern : str) -> int:
+        """
+        Counts the occurrences of a pattern with the backward search alone, without touching the suffix array.
+
+        Parameters
+        ----------
+        pattern : str
+            The pattern to search for.
+
+        Returns
+        -------
+        int
+            The number of occurrences of the pattern.
+        """
+
+        top, bottom = self.backward_search(pattern)
+        return bottom - top
+
+
+    def count_many(self, patterns : list[str]) -> list[int]:
+        """
+        Counts the occurrences of a batch of patterns (for instance, every k-mer of a read set).
+        The patterns are sorted by their reversed string, so consecutive patterns share their longest common suffix and
+        the backward search of that suffix is done only once: the total work is proportional to the number of distinct
+        suffixes of the patterns instead of the sum of their lengths. The suffix array is never used.
+
+        Parameters
+        ----------
+        patterns : list[str]
+            The patterns to search for.
+
+        Returns
+        -------
+        list[int]
+            The number of occurrences of each pattern, in the same order as the patterns.
+        """
+
+        patterns = list(patterns)
+        res = [0] * len(patterns)
+        anterior = ""
+        pilha = [(0, self.n)]
+
+        for i in sorted(range(len(patterns)), key=lambda i: patterns[i][::-1]):
+            reverso = patterns[i][::-1]
+            comum = 0
+            limite = min(len(reverso), len(anterior))
+            while comum < limite and reverso[comum] == anterior[comum]:
+                comum += 1
+            del pilha[comum + 1:]
+
+            top, bottom = pilha[-1]
+            for c in reverso[comum:]:
+                if top < bottom and c in self.C:
+                    top = self.C[c] + self.rank(c, top)
+                    bottom = self.C[c] + self.rank(c, bottom)
+                else:
+                    top = bottom = 0
+                pilha.append((top, bottom))
+
+            res[i] = max(bottom - top, 0)
+            anterior = reverso
+
+        return res
+
+
+    def locate(self, pattern : str) -> list[int]:
+        """
+        Finds the positions of a pattern in the indexed sequence.
+
+        Parameters
+        ----------
+        pattern : str
+            The pattern to search for.
+
+        Returns
+        -------
+        list[int]
+            The sorted list of positions where the pattern occurs. If the pattern is not found, an empty list is returned.
+        """
+
+        top, bottom = self.backward_search(pattern)
+        return sorted(self.posicao(i) for i in range(top, bottom))
+
+
+    def documento(self, posicao : int) -> tuple[int, int]:
+        """
+        Converts a position of the concatenated sequences into the document that contains it and the offset inside it.
+
+        Parameters
+        ----------
+        posicao : int
+            A position of the indexed sequence.
+
+        Returns
+        -------
+        tuple[int, int]
+            The index of the document (sequence_id) and the offset of the position inside that document.
+        """
+
+        documento = bisect_right(self.inicios, posicao) - 1
+        return documento, posicao - self.inicios[documento]
+
+
+    def locate_docs(self, pattern : str) -> list[tuple[int, int]]:
+        """
+        Finds the occurrences of a pattern in a collection of sequences indexed together.
+
+        Parameters
+        ----------
+        pattern : str
+            The pattern to search for. It must not contain the separator '$'.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            The sorted list of pairs (sequence_id, offset) where the pattern occurs.
+        """
+
+        return [self.documento(posicao) for posicao in self.locate(pattern)]
+
+
+    def _array_d(self, pattern : str) -> list[int]:
+        """
+        Computes the D array of a pattern: D[i] is a lower bound on the number of mismatches needed to match pattern[:i + 1].
+        The pattern is extended to the right over the reversed index; every time the current substring stops occurring,
+        the bound is incremented and the substring restarts after the current position.
+
+        Parameters
+        ----------
+        pattern : str
+            The pattern to be searched.
+
+        Returns
+        -------
+        list[int]
+            The D array of the pattern.
+        """
+
+        reverso = self.indice_reverso()
+        d = []
+        z = 0
+        top, bottom = 0, reverso.n
+        for c in pattern:
+            if c in reverso.C:
+                top = reverso.C[c] + reverso.rank(c, top)
+                bottom = reverso.C[c] + reverso.rank(c, bottom)
+            if c not in reverso.C or top >= bottom:
+                top, bottom = 0, reverso.n
+                z += 1
+            d.append(z)
+        return d
+
+
+    def approximate_search(self, pattern : str, max_mismatches : int, pruning : bool = True) -> list[tuple[int, int]]:
+        """
+        Finds the occurrences of a pattern with at most `max_mismatches` substitutions.
+        The backward search is extended with backtracking: at each step every symbol of the alphabet is tried, and the
+        branches that use a symbol different from the pattern consume one mismatch. With pruning, a branch is abandoned as
+        soon as the remaining mismatches are fewer than the lower bound given by the D array.
+
+        Parameters
+        ----------
+        pattern : str
+            The pattern to be searched.
+        max_mismatches : int
+            The maximum number of mismatches allowed.
+        pruning : bool, optional
+            Whether to prune the search with the D array (builds the reversed index on the first call). Defaults to True.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            Pairs (position, number of mismatches), sorted by position.
+        """
+
+        assert max_mismatches >= 0, "The number of mismatches must be non-negative"
+
+        m = len(pattern)
+        d = self._array_d(pattern) if pruning else [0] * m
+        simbolos = [c for c in self.C if c != '$']
+        res = []
+
+        pilha = [(m - 1, max_mismatches, 0, self.n)]
+        while pilha:
+            i, z, top, bottom = pilha.pop()
+            if i < 0:
+                erros = max_mismatches - z
+                res.extend((self.posicao(linha), erros) for linha in range(top, bottom))
+                continue
+            if z < d[i]: continue
+
+            for c in simbolos:
+                novo_top = self.C[c] + self.rank(c, top)
+                novo_bottom = self.C[c] + self.rank(c, bottom)
+                if novo_top >= novo_bottom: continue
+                if c == pattern[i]:
+                    pilha.append((i - 1, z, novo_top, novo_bottom))
+                elif z > 0:
+                    pilha.append((i - 1, z - 1, novo_top, novo_bottom))
+
+        return sorted(res)
+
+
+    def _estender(self, k : int, l : int, s : int, c : str) -> tuple[int, int, int]:
+        """
+        Extends a bi-interval with one symbol to the left, using the rank structure of this index.
+        The bi-interval of a string P is the range [k, k + s) of P in this index and the range [l, l + s) of P reversed
+        in the index of the reversed sequence. The new range of cP is found with the LF mapping; in the other index, the
+        range of cP reversed starts after the occurrences of aP (a < c, including the separators), which are counted in
+        bwt[k:k + s]. Calling it on the reversed index, with k and l swapped, extends the bi-interval to the right.
+
+        Parameters
+        ----------
+        k : int
+            Start of the range in this index.
+        l : int
+            Start of the range in the other index.
+        s : int
+            Size of the ranges.
+        c : str
+            The symbol to add.
+
+        Returns
+        -------
+        tuple[int, int, int]
+            The new values of k, l and s. The size is 0 if cP does not occur.
+        """
+
+        if c not in self.C: return 0, 0, 0
+
+        menores = 0
+        for a in self.C:
+            if a == c: break
+            menores += self.rank(a, k + s) - self.rank(a, k)
+        topo = self.rank(c, k)
+        return self.C[c] + topo, l + menores, self.rank(c, k + s) - topo
+
+
+    def _smems_em(self, read : str, i0 : int) -> tuple[int, list[tuple[int, int, int, int]]]:
+        """
+        Finds the SMEMs of a read that contain position i0 (algorithm smem1 of BWA/fermi).
+        The match is first extended to the right while it occurs, keeping every bi-interval whose size changes; the
+        bi-intervals are then extended to the left together, and one is reported when it can no longer be extended
+        and is not contained in a match already reported.
+
+        Parameters
+        ----------
+        read : str
+            The read.
+        i0 : int
+            The position that the SMEMs must contain.
+
+        Returns
+        -------
+        tuple[int, list[tuple[int, int, int, int]]]
+            The position where the next search should start and the SMEMs found, as (start, end, k, s),
+            where [k, k + s) is the range of rows of the match in this index.
+        """
+
+        reverso = self.indice_reverso()
+        c = read[i0]
+        if c not in self.C or c == '$': return i0 + 1, []
+
+        s = self.rank(c, self.n)
+        k, l = self.C[c], reverso.C[c]
+        atuais = []
+        for i in range(i0 + 1, len(read)):
+            novo_l, novo_k, novo_s = reverso._estender(l, k, s, read[i])
+            if novo_s != s: atuais.append((k, l, s, i))
+            if novo_s == 0: break
+            k, l, s = novo_k, novo_l, novo_s
+        else:
+            atuais.append((k, l, s, len(read)))
+        atuais.reverse()
+        proximo = atuais[0][3]
+
+        mems = []
+        for i in range(i0 - 1, -2, -1):
+            anteriores, atuais = atuais, []
+            for k, l, s, fim in anteriores:
+                novo_s = 0
+                if i >= 0: novo_k, novo_l, novo_s = self._estender(k, l, s, read[i])
+                if novo_s == 0:
+                    if not atuais and (not mems or i + 1 < mems[-1][0]):
+                        mems.append((i + 1, fim, k, s))
+                elif not atuais or novo_s != atuais[-1][2]:
+                    atuais.append((novo_k, novo_l, novo_s, fim))
+            if not atuais: break
+
+        return proximo, mems
+
+
+    def smems(self, read : str, min_length : int = 1) -> list[tuple[int, int, list[int]]]:
+        """
+        Finds the super-maximal exact matches (SMEMs) of a read against the indexed sequence: the maximal exact matches
+        that are not contained in another match of the read, which are the seeds used by BWA-MEM.
+        Matches are extended one symbol at a time over the bidirectional index (this index and indice_reverso), so the
+        number of rank queries grows linearly with the read length; the positions are only resolved for the SMEMs reported.
+
+        Parameters
+        ----------
+        read : str
+            The read. Symbols that do not occur in the indexed sequence (such as N) break the matches.
+        min_length : int, optional
+            Minimum length of the SMEMs reported. Defaults to 1.
+
+        Returns
+        -------
+        list[tuple[int, int, list[int]]]
+            Triples (read_offset, length, positions), sorted by read offset, where positions is the sorted list of
+            positions of the match in the indexed sequence.
+        """
+
+        res = []
+        i = 0
+        while i < len(read):
+            i, mems = self._smems_em(read, i)
+            for inicio, fim, k, s in mems:
+                if fim - inicio >= min_length:
+                    res.append((inicio, fim - inicio, sorted(self.posicao(linha) for linha in range(k, k + s))))
+        return sorted(res)
+
+
+    def save(self, path : str) -> None:
+        """
+        Writes the index to a binary file that can be opened with FMIndex.load.
+        The file has a JSON header followed by the arrays of the rank structure (the BWT and its checkpoints)
+        the sampled suffix array (and its bitvector) and the start of each document. Every section is 8-byte aligned, so that it can be memory-mapped.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file to write.
+
+        Returns
+        -------
+        None
+        """
+
+        secoes = [("backend:" + nome, dados) for nome, dados in self.ocorrencias.secoes()]
+        secoes.append(("amostras_sa", self.amostras_sa))
+        secoes.append(("inicios", self.inicios))
+        if self._marcas is not None:
+            secoes.append(("marcas", self._marcas))
+            secoes.append(("marcas_checkpoints", self._marcas_checkpoints))
+
+        cabecalho = {"versao": VERSAO, "byteorder": sys.byteorder, "n": self.n, "amostragem_sa": self.amostragem_sa,
+                     "C": self.C, "backend": self.backend, "backend_metadados": self.ocorrencias.metadados(), "secoes": {}}
+
+        # The offsets depend on the header size, so the header is reserved with enough room before computing them.
+        tamanho_cabecalho = len(json.dumps(cabecalho)) + 64 * len(secoes) + 8
+        offset = _alinhar(len(MAGIC) + 4 + tamanho_cabecalho, 8)
+        for nome, dados in secoes:
+            tamanho = len(memoryview(dados).cast('B'))
+            cabecalho["secoes"][nome] = [offset, tamanho]
+            offset = _alinhar(offset + tamanho, 8)
+
+        json_cabecalho = json.dumps(cabecalho).encode()
+        assert len(json_cabecalho) <= tamanho_cabecalho, "The reserved header space is too small"
+
+        with open(path, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(json_cabecalho)) + json_cabecalho)
+            for nome, dados in secoes:
+                f.write(b"\0" * (cabecalho["secoes"][nome][0] - f.tell()))
+                f.write(memoryview(dados).cast('B'))
+
+
+    @classmethod
+    def load(cls, path : str) -> "FMIndex":
+        """
+        Opens an index written by FMIndex.save.
+        Nothing is read or rebuilt: the arrays are memory-mapped from the file, so opening a large index is immediate
+        and several processes that open the same file share its pages through the operating system cache.
+
+        Parameters
+        ----------
+        path : str
+            Path of the index file.
+
+        Returns
+        -------
+        FMIndex
+            The index, backed by the memory-mapped file.
+
+        Raises
+        ------
+        ValueError
+            If the file is not an FM-index, or was written with a different version or byte order.
+        """
+
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not an FM-index file")
+            tamanho, = struct.unpack("<I", f.read(4))
+            cabecalho = json.loads(f.read(tamanho))
+
+            if cabecalho["versao"] != VERSAO or cabecalho["byteorder"] != sys.byteorder:
+                raise ValueError(f"{path} was written with an incompatible version or byte order")
+
+            mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        vista = memoryview(mapa)
+        def secao(nome : str, formato : str = 'I') -> memoryview:
+            offset, tamanho = cabecalho["secoes"][nome]
+            return vista[offset:offset + tamanho].cast(formato)
+
+        indice = cls.__new__(cls)
+        indice.n = cabecalho["n"]
+        indice.amostragem_sa = cabecalho["amostragem_sa"]
+        indice.C = cabecalho["C"]
+        indice.backend = cabecalho["backend"]
+        indice.ocorrencias = BACKENDS[indice.backend].de_secoes(indice.n, cabecalho["backend_metadados"],
+                                                                 lambda nome, formato: secao("backend:" + nome, formato))
+        indice.amostras_sa = secao("amostras_sa")
+        indice.inicios = secao("inicios")
+        indice._marcas = secao("marcas", 'B') if "marcas" in cabecalho["secoes"] else None
+        if indice._marcas is not None:
+            indice._marcas_checkpoints = secao("marcas_checkpoints")
+        indice._reverso = None
+        indice._mapa = mapa
+        return indice
+
+
+def _alinhar(offset : int, alinhamento : int) -> int:
+    """
+    Rounds an offset up to the next multiple of the alignment.
+
+    Parameters
+    ----------
+    offset : int
+        The offset to align.
+    alinhamento : int
+        The alignment.
+
+    Returns
+    -------
+    int
+        The smallest multiple of `alinhamento` that is not smaller than `offset`.
+    """
+
+    return -(-offset // alinhamento) * alinhamento
+
+
+if __name__ == "__main__":
+    from BWT import BWT
+
+    seq = "TAGACAGAGA$"
+    indice = FMIndex.from_bwt(BWT(seq), intervalo=4)
+    print(f"C array of {seq}: {indice.C}")
+    print(f"Occ checkpoints: {dict(indice.ocorrencias.occ)}")
+
+    for pattern in ["AGA", "T", "GACAG", "CC"]:
+        print(f"Positions of {pattern}: {indice.locate(pattern)}")
+
+    print(f"Occurrences of ACA with up to 1 mismatch: {indice.approximate_search('ACA', 1)}")
+
+    print("Metricas de Codigo:")
+    print("\nMetrica cyclomatic complexity:")
+    print(subprocess.call(["radon","cc","BWT/fm_index.py", "-s"]))
+    print("\nMetrica maintainability index:")
+    print(subprocess.call(["radon","mi","BWT/fm_index.py", "-s"]))
+    print("\nMetrica raw:")
+    print(subprocess.call(["radon","raw","BWT/fm_index.py", "-s"]))
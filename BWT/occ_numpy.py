@@ -0,0 +1,213 @@
+"""
+Tabela Occ do FM-index calculada com NumPy
+
+A BWT é codificada como um array uint8 e, para cada símbolo, o número acumulado de
+ocorrências é obtido com um único cumsum vetorizado, em vez de um ciclo em Python sobre
+todas as posições e todos os símbolos. Com o intervalo por omissão (1) a tabela tem uma
+entrada por posição e o rank é uma simples indexação do array. É usado como backend
+"numpy" do FMIndex; o NumPy é uma dependência opcional.
+"""
+
+import subprocess
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class OccNumpy:
+    """
+    This class answers rank queries over a BWT with a table of cumulative occurrences computed by NumPy.
+    occ[k, b] is the number of occurrences of the k-th symbol of the alphabet in the first b * intervalo positions,
+    so with intervalo = 1 every rank query is a single array lookup. Larger intervals keep one column every `intervalo`
+    positions and count the rest of the block with a vectorised comparison.
+
+    Parameters
+    ----------
+    bwt : str
+        The Burrows-Wheeler Transform. Only single-byte symbols are supported.
+    intervalo : int, optional
+        Spacing between the columns of the table. Defaults to 1 (one column per position, 4 * (n + 1) bytes per symbol).
+
+    Attributes
+    ----------
+    codigos : numpy.ndarray
+        The BWT encoded as uint8 (latin-1).
+    occ : numpy.ndarray
+        The uint32 table of cumulative occurrences, with one row per symbol.
+
+    Raises
+    ------
+    ImportError
+        If NumPy is not installed.
+    """
+
+    nome = "numpy"
+
+    def __init__(self, bwt : str, intervalo : int = 1) -> None:
+
+        if np is None:
+            raise ImportError("The numpy backend requires NumPy")
+        assert intervalo > 0, "The checkpoint interval must be positive"
+
+        try:
+            self.codigos = np.frombuffer(bwt.encode("latin-1"), dtype=np.uint8)
+        except UnicodeEncodeError:
+            raise ValueError("The FM-index only supports single-byte symbols")
+
+        self.n = len(bwt)
+        self.intervalo = intervalo
+        self._simbolos = [chr(c) for c in np.unique(self.codigos)]
+        self._indices = {c: k for k, c in enumerate(self._simbolos)}
+
+        self.occ = np.zeros((len(self._simbolos), self.n // intervalo + 1), dtype=np.uint32)
+        for k, c in enumerate(self._simbolos):
+            acumulado = np.cumsum(self.codigos == ord(c), dtype=np.uint32)
+            self.occ[k, 1:] = acumulado[intervalo - 1::intervalo]
+
+
+    def simbolos(self) -> list[str]:
+        """
+        Returns the symbols of the BWT, in lexicographical order.
+
+        Returns
+        -------
+        list[str]
+            The sorted alphabet of the BWT.
+        """
+
+        return list(self._simbolos)
+
+
+    def rank(self, c : str, i : int) -> int:
+        """
+        Counts the occurrences of a symbol in the first `i` positions of the BWT (Occ(c, i)).
+
+        Parameters
+        ----------
+        c : str
+            The symbol to count.
+        i : int
+            The number of BWT positions to consider.
+
+        Returns
+        -------
+        int
+            The number of occurrences of `c` in bwt[:i].
+        """
+
+        if c not in self._indices: return 0
+        k = self._indices[c]
+        if self.intervalo == 1: return int(self.occ[k, i])
+
+        bloco = i // self.intervalo
+        inicio = bloco * self.intervalo
+        return int(self.occ[k, bloco]) + int(np.count_nonzero(self.codigos[inicio:i] == ord(c)))
+
+
+    def simbolo(self, i : int) -> str:
+        """
+        Returns the symbol at position `i` of the BWT.
+
+        Parameters
+        ----------
+        i : int
+            A position of the BWT.
+
+        Returns
+        -------
+        str
+            The symbol bwt[i].
+        """
+
+        return chr(self.codigos[i])
+
+
+    def sequencia(self) -> str:
+        """
+        Decodes the whole BWT (the inverse of the constructor).
+
+        Returns
+        -------
+        str
+            The BWT.
+        """
+
+        return self.codigos.tobytes().decode("latin-1")
+
+
+    def metadados(self) -> dict:
+        """
+        Returns the parameters needed to rebuild the structure from its sections (see FMIndex.save).
+
+        Returns
+        -------
+        dict
+            The checkpoint interval and the alphabet of the BWT.
+        """
+
+        return {"intervalo": self.intervalo, "simbolos": self._simbolos}
+
+
+    def secoes(self) -> list[tuple[str, object]]:
+        """
+        Returns the arrays of the structure, to be written by FMIndex.save.
+
+        Returns
+        -------
+        list[tuple[str, object]]
+            Pairs (name, buffer).
+        """
+
+        return [("codigos", self.codigos), ("occ", self.occ)]
+
+
+    @classmethod
+    def de_secoes(cls, n : int, metadados : dict, secao) -> "OccNumpy":
+        """
+        Rebuilds the structure from the (memory-mapped) sections written by FMIndex.save, without copying them.
+
+        Parameters
+        ----------
+        n : int
+            Length of the BWT.
+        metadados : dict
+            The dictionary returned by `metadados`.
+        secao : Callable[[str, str], memoryview]
+            Returns the section with the given name, cast to the given format.
+
+        Returns
+        -------
+        OccNumpy
+            The rank structure.
+        """
+
+        if np is None:
+            raise ImportError("The numpy backend requires NumPy")
+
+        ocorrencias = cls.__new__(cls)
+        ocorrencias.n = n
+        ocorrencias.intervalo = metadados["intervalo"]
+        ocorrencias._simbolos = metadados["simbolos"]
+        ocorrencias._indices = {c: k for k, c in enumerate(ocorrencias._simbolos)}
+        ocorrencias.codigos = np.frombuffer(secao("codigos", 'B'), dtype=np.uint8)
+        ocorrencias.occ = np.frombuffer(secao("occ", 'B'), dtype=np.uint32).reshape(len(ocorrencias._simbolos), -1)
+        return ocorrencias
+
+
+if __name__ == "__main__":
+    bwt = "AGGGTCAAAA$"
+    ocorrencias = OccNumpy(bwt)
+    print(f"Occ table of {bwt} ({ocorrencias.simbolos()}):")
+    print(ocorrencias.occ)
+    for c in "ACGT$":
+        print(f"rank({c}, 6) = {ocorrencias.rank(c, 6)}")
+
+    print("Metricas de Codigo:")
+    print("\nMetrica cyclomatic complexity:")
+    print(subprocess.call(["radon","cc","BWT/occ_numpy.py", "-s"]))
+    print("\nMetrica maintainability index:")
+    print(subprocess.call(["radon","mi","BWT/occ_numpy.py", "-s"]))
+    print("\nMetrica raw:")
+    print(subprocess.call(["radon","raw","BWT/occ_numpy.py", "-s"]))
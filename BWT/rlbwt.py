@@ -0,0 +1,247 @@
+"""
+Implementação da BWT comprimida por run-length (RLBWT)
+
+Baseado em:
+    V. Mäkinen e G. Navarro, "Succinct suffix arrays based on run-length encoding", 2005.
+
+Em coleções repetitivas (por exemplo, várias estirpes da mesma espécie) a BWT tem poucas
+corridas de símbolos iguais. A RLBWT guarda apenas o início e o símbolo de cada corrida e,
+para cada símbolo, o comprimento acumulado das suas corridas, pelo que a memória depende
+do número de corridas r e não do comprimento n. É usada como backend "rle" do FMIndex.
+"""
+
+import subprocess
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class RLBWT:
+    """
+    This class stores a Burrows-Wheeler Transform as a list of runs and answers rank and select queries over the runs,
+    using binary search. Every query costs O(log r), where r is the number of runs.
+
+    Parameters
+    ----------
+    bwt : str
+        The Burrows-Wheeler Transform. Only single-byte symbols are supported.
+    intervalo : int, optional
+        Not used (the runs take the place of the checkpoints). Accepted so that every FMIndex backend has the same signature.
+
+    Attributes
+    ----------
+    n : int
+        Length of the BWT.
+    r : int
+        Number of runs.
+    inicios : array
+        The start of each run.
+    cabecas : bytes
+        The symbol of each run.
+    runs : dict[str, tuple[array, array]]
+        For each symbol, the indices of its runs and the cumulative length of those runs (one more entry than the indices).
+    """
+
+    nome = "rle"
+
+    def __init__(self, bwt : str, intervalo : int = None) -> None:
+
+        if any(ord(c) > 255 for c in set(bwt)):
+            raise ValueError("The RLBWT only supports single-byte symbols")
+
+        self.n = len(bwt)
+        self.intervalo = None
+        self.inicios = array('I')
+        cabecas = []
+        self.runs = {}
+
+        for corrida in re.finditer(r"(.)\1*", bwt, re.DOTALL):
+            c = corrida.group(1)
+            indices, acumulado = self.runs.setdefault(c, (array('I'), array('I', [0])))
+            indices.append(len(self.inicios))
+            acumulado.append(acumulado[-1] + len(corrida.group()))
+            self.inicios.append(corrida.start())
+            cabecas.append(c)
+
+        self.cabecas = "".join(cabecas).encode("latin-1")
+        self.r = len(self.inicios)
+
+
+    def simbolos(self) -> list[str]:
+        """
+        Returns the symbols of the BWT, in lexicographical order.
+
+        Returns
+        -------
+        list[str]
+            The sorted alphabet of the BWT.
+        """
+
+        return sorted(self.runs)
+
+
+    def rank(self, c : str, i : int) -> int:
+        """
+        Counts the occurrences of a symbol in the first `i` positions of the BWT.
+        The run that contains position i is found by binary search; the occurrences of `c` before it are the cumulative
+        length of the runs of `c` with a smaller index, plus the part of the run itself if its symbol is `c`.
+
+        Parameters
+        ----------
+        c : str
+            The symbol to count.
+        i : int
+            The number of positions to consider.
+
+        Returns
+        -------
+        int
+            The number of occurrences of `c` in bwt[:i].
+        """
+
+        if c not in self.runs or i == 0: return 0
+
+        corrida = bisect_right(self.inicios, i - 1) - 1
+        indices, acumulado = self.runs[c]
+        j = bisect_left(indices, corrida)
+        res = acumulado[j]
+        if j < len(indices) and indices[j] == corrida:
+            res += i - self.inicios[corrida]
+        return res
+
+
+    def select(self, c : str, k : int) -> int:
+        """
+        Finds the position of the k-th occurrence (starting at 1) of a symbol in the BWT.
+
+        Parameters
+        ----------
+        c : str
+            The symbol.
+        k : int
+            The rank of the occurrence.
+
+        Returns
+        -------
+        int
+            The position of the k-th occurrence of `c`.
+
+        Raises
+        ------
+        ValueError
+            If `c` occurs fewer than k times.
+        """
+
+        if c not in self.runs or not 1 <= k <= self.runs[c][1][-1]:
+            raise ValueError(f"The symbol {c} does not occur {k} times")
+
+        indices, acumulado = self.runs[c]
+        j = bisect_left(acumulado, k) - 1
+        return self.inicios[indices[j]] + k - acumulado[j] - 1
+
+
+    def simbolo(self, i : int) -> str:
+        """
+        Returns the symbol at position `i` of the BWT.
+
+        Parameters
+        ----------
+        i : int
+            A position of the BWT.
+
+        Returns
+        -------
+        str
+            The symbol bwt[i].
+        """
+
+        return chr(self.cabecas[bisect_right(self.inicios, i) - 1])
+
+
+    def sequencia(self) -> str:
+        """
+        Decodes the whole BWT (the inverse of the constructor).
+
+        Returns
+        -------
+        str
+            The BWT.
+        """
+
+        fins = list(self.inicios[1:]) + [self.n]
+        return "".join(chr(c) * (fim - inicio) for c, inicio, fim in zip(self.cabecas, self.inicios, fins))
+
+
+    def metadados(self) -> dict:
+        """
+        Returns the parameters needed to rebuild the structure from its sections (see FMIndex.save).
+
+        Returns
+        -------
+        dict
+            The alphabet of the BWT.
+        """
+
+        return {"simbolos": self.simbolos()}
+
+
+    def secoes(self) -> list[tuple[str, object]]:
+        """
+        Returns the arrays of the structure, to be written by FMIndex.save.
+
+        Returns
+        -------
+        list[tuple[str, object]]
+            Pairs (name, buffer).
+        """
+
+        secoes = [("inicios", self.inicios), ("cabecas", self.cabecas)]
+        for c in self.simbolos():
+            secoes += [("runs:indices:" + c, self.runs[c][0]), ("runs:acumulado:" + c, self.runs[c][1])]
+        return secoes
+
+
+    @classmethod
+    def de_secoes(cls, n : int, metadados : dict, secao) -> "RLBWT":
+        """
+        Rebuilds the structure from the (memory-mapped) sections written by FMIndex.save, without copying them.
+
+        Parameters
+        ----------
+        n : int
+            Length of the BWT.
+        metadados : dict
+            The dictionary returned by `metadados`.
+        secao : Callable[[str, str], memoryview]
+            Returns the section with the given name, cast to the given format.
+
+        Returns
+        -------
+        RLBWT
+            The run-length encoded BWT.
+        """
+
+        rlbwt = cls.__new__(cls)
+        rlbwt.n = n
+        rlbwt.intervalo = None
+        rlbwt.inicios = secao("inicios", 'I')
+        rlbwt.cabecas = secao("cabecas", 'B')
+        rlbwt.r = len(rlbwt.inicios)
+        rlbwt.runs = {c: (secao("runs:indices:" + c, 'I'), secao("runs:acumulado:" + c, 'I')) for c in metadados["simbolos"]}
+        return rlbwt
+
+
+if __name__ == "__main__":
+    bwt = "AAAACCCC$GGGGAAAA"
+    rlbwt = RLBWT(bwt)
+    print(f"{bwt} has {rlbwt.r} runs: {list(rlbwt.inicios)} {rlbwt.cabecas}")
+    for c in "ACG$":
+        print(f"rank({c}, 10) = {rlbwt.rank(c, 10)}, select({c}, 1) = {rlbwt.select(c, 1)}")
+
+    print("Metricas de Codigo:")
+    print("\nMetrica cyclomatic complexity:")
+    print(subprocess.call(["radon","cc","BWT/rlbwt.py", "-s"]))
+    print("\nMetrica maintainability index:")
+    print(subprocess.call(["radon","mi","BWT/rlbwt.py", "-s"]))
+    print("\nMetrica raw:")
+    print(subprocess.call(["radon","raw","BWT/rlbwt.py", "-s"]))
@@ -0,0 +1,204 @@
+"""
+Implementação do algoritmo SA-IS (Suffix Array by Induced Sorting) para a construção de suffix arrays em tempo linear.
+
+Baseado em:
+    G. Nong, S. Zhang e W. H. Chan, "Two Efficient Algorithms for Linear Time Suffix Array Construction", 2009.
+    Implementação de referência da AtCoder Library (string.hpp, função sa_is).
+
+Usado pela classe BWT para obter a transformada diretamente a partir do suffix array,
+sem construir a matriz de rotações.
+"""
+
+import subprocess
+from array import array
+
+
+def _tipo(n : int) -> str:
+    """
+    Returns the typecode of the smallest signed array that holds the positions of a sequence of length n (and -1).
+    """
+
+    return 'i' if n < 2 ** 31 - 1 else 'q'
+
+
+def sa_is(s : list[int], upper : int) -> array:
+    """
+    Computes the suffix array of a sequence of integers using the SA-IS algorithm.
+    Suffixes are sorted in lexicographical order, where a suffix that is a prefix of another one comes first
+    (the same order Python uses for strings), so no terminator symbol is required.
+    The working storage is kept in arrays (4 bytes per position for the suffix array and the LMS map, 1 byte for the
+    L/S types) instead of lists of Python ints, which dominate the peak memory on large inputs.
+
+    Parameters
+    ----------
+    s : list[int] | array
+        The sequence to index. Every value must be in the range [0, upper].
+    upper : int
+        The largest value that may appear in `s`.
+
+    Returns
+    -------
+    array
+        The starting positions of the suffixes of `s`, in lexicographical order (array('i'), or array('q') when
+        the positions do not fit in 32 bits).
+    """
+
+    n = len(s)
+    tipo = _tipo(n)
+    if n == 0: return array(tipo)
+    if n == 1: return array(tipo, [0])
+    if n == 2: return array(tipo, [0, 1] if s[0] < s[1] else [1, 0])
+    if n < 10: return array(tipo, sorted(range(n), key=lambda i: s[i:]))
+
+    sa = array(tipo, [-1]) * n
+    ls = bytearray(n)
+    for i in range(n - 2, -1, -1):
+        ls[i] = ls[i + 1] if s[i] == s[i + 1] else s[i] < s[i + 1]
+
+    sum_l = [0] * (upper + 1)
+    sum_s = [0] * (upper + 1)
+    for i in range(n):
+        if not ls[i]: sum_s[s[i]] += 1
+        else: sum_l[s[i] + 1] += 1
+    for i in range(upper + 1):
+        sum_s[i] += sum_l[i]
+        if i < upper: sum_l[i + 1] += sum_s[i]
+
+    def induce(lms : list[int]) -> None:
+        for i in range(n): sa[i] = -1
+
+        buf = sum_s[:]
+        for d in lms:
+            if d == n: continue
+            sa[buf[s[d]]] = d
+            buf[s[d]] += 1
+
+        buf = sum_l[:]
+        sa[buf[s[n - 1]]] = n - 1
+        buf[s[n - 1]] += 1
+        for i in range(n):
+            v = sa[i]
+            if v >= 1 and not ls[v - 1]:
+                sa[buf[s[v - 1]]] = v - 1
+                buf[s[v - 1]] += 1
+
+        buf = sum_l[:]
+        for i in range(n - 1, -1, -1):
+            v = sa[i]
+            if v >= 1 and ls[v - 1]:
+                buf[s[v - 1] + 1] -= 1
+                sa[buf[s[v - 1] + 1]] = v - 1
+
+    lms_map = array(tipo, [-1]) * (n + 1)
+    lms = array(tipo)
+    for i in range(1, n):
+        if not ls[i - 1] and ls[i]:
+            lms_map[i] = len(lms)
+            lms.append(i)
+    m = len(lms)
+
+    induce(lms)
+
+    if m:
+        sorted_lms = array(tipo, (v for v in sa if lms_map[v] != -1))
+        rec_s = array(tipo, [0]) * m
+        rec_upper = 0
+        rec_s[lms_map[sorted_lms[0]]] = 0
+
+        for i in range(1, m):
+            l = sorted_lms[i - 1]
+            r = sorted_lms[i]
+            end_l = lms[lms_map[l] + 1] if lms_map[l] + 1 < m else n
+            end_r = lms[lms_map[r] + 1] if lms_map[r] + 1 < m else n
+
+            same = True
+            if end_l - l != end_r - r:
+                same = False
+            else:
+                while l < end_l and s[l] == s[r]:
+                    l += 1
+                    r += 1
+                if l == n or s[l] != s[r]: same = False
+
+            if not same: rec_upper += 1
+            rec_s[lms_map[sorted_lms[i]]] = rec_upper
+
+        del sorted_lms
+        rec_sa = sa_is(rec_s, rec_upper)
+        del rec_s
+        induce(array(tipo, (lms[i] for i in rec_sa)))
+
+    return sa
+
+
+def construir_suffix_array(seq : str) -> list[int]:
+    """
+    Computes the suffix array of a string in linear time.
+    The characters are first mapped to their rank in the sorted alphabet of the string and the result is passed to `sa_is`.
+
+    Parameters
+    ----------
+    seq : str
+        The string for which the suffix array will be computed.
+
+    Returns
+    -------
+    list[int]
+        A list with the starting indices of all suffixes of `seq`, sorted in lexicographical order.
+    """
+
+    alfabeto = {c: i for i, c in enumerate(sorted(set(seq)))}
+    return list(sa_is([alfabeto[c] for c in seq], max(len(alfabeto) - 1, 0)))
+
+
+def construir_suffix_array_colecao(texto : str | bytes, separador : str = "$") -> array:
+    """
+    Computes the suffix array of a collection of sequences, concatenated as s1$s2$...sd$.
+    Each separator is treated as a distinct sentinel, smaller than every other symbol and ordered by document ($1 < $2 < ... < $d),
+    so the comparison of two suffixes always stops at the end of their documents.
+    For a single sequence terminated by '$' the result is the usual suffix array.
+    The text may also be given as bytes (for instance, the buffer filled by fasta.ler_fasta), so large inputs are never
+    decoded into a second copy; the symbol codes are kept in an array('I').
+
+    Parameters
+    ----------
+    texto : str | bytes
+        The concatenated sequences, each one followed by the separator.
+    separador : str, optional
+        The separator symbol. Defaults to "$".
+
+    Returns
+    -------
+    array
+        The starting indices of all suffixes of `texto`, sorted with the distinct sentinels order (see sa_is).
+    """
+
+    if not isinstance(texto, str): separador = ord(separador)
+
+    d = texto.count(separador)
+    alfabeto = {c: d + i for i, c in enumerate(sorted(set(texto) - {separador}))}
+    alfabeto[separador] = 0
+    codigos = array('I', map(alfabeto.__getitem__, texto))
+
+    documento = 0
+    posicao = texto.find(separador)
+    while posicao != -1:
+        codigos[posicao] = documento
+        documento += 1
+        posicao = texto.find(separador, posicao + 1)
+
+    return sa_is(codigos, max(d + len(alfabeto) - 1, 0))
+
+
+if __name__ == "__main__":
+    seq = "TAGACAGAGA$"
+    print(f"Suffix array of {seq}:")
+    print(construir_suffix_array(seq))
+
+    print("Metricas de Codigo:")
+    print("\nMetrica cyclomatic complexity:")
+    print(subprocess.call(["radon","cc","BWT/suffix_array.py", "-s"]))
+    print("\nMetrica maintainability index:")
+    print(subprocess.call(["radon","mi","BWT/suffix_array.py", "-s"]))
+    print("\nMetrica raw:")
+    print(subprocess.call(["radon","raw","BWT/suffix_array.py", "-s"]))
@@ -1,5 +1,9 @@
+import os
+import random
+import tempfile
 import unittest
 from BWT import BWT
+from benchmark_bwt import benchmark_memoria
 
 
 class TestBWT(unittest.TestCase):
@@ -39,6 +43,17 @@ class TestBWT(unittest.TestCase):
                              f"The {seq_to_encode} should be sorted as {sorted_matrix} insted of {BWT(seq_to_encode).matriz_ordenada()}")
 
     
+    def test_metodo_matriz(self):
+        for seq_to_encode,bwt in zip(self.seqs_to_encode,self.bwt_expected):
+            classe = BWT(seq_to_encode, metodo="matriz")
+            self.assertEqual(classe.bwt, bwt)
+            self.assertEqual(classe.bwt, BWT(seq_to_encode).bwt)
+
+    def test_matriz_lazy(self):
+        classe = BWT("banana")
+        self.assertIsNone(classe._matrix_ord)
+        self.assertEqual(classe.matrix_ord, self.sort_matrix[1])
+
     def test_construirBWT(self):
         for seq_to_encode,bwt in zip(self.seqs_to_encode,self.bwt_expected):
             self.assertEqual(BWT(seq_to_encode).construir_BWT(),bwt,
@@ -56,6 +71,11 @@ class TestBWT(unittest.TestCase):
             self.assertEqual(BWT(bwt,encoded=True).obter_seq_original(),seq_to_encode,
                              f"The {bwt} should be decoded to {seq_to_encode} insted of {BWT(bwt,encoded=True).obter_seq_original()}")
 
+    def test_obterSequenciaOriginal_longa(self):
+        random.seed(4)
+        seq = "".join(random.choice("ACGT") for _ in range(5000))
+        self.assertEqual(BWT(BWT(seq).bwt, encoded=True).obter_seq_original(), seq)
+
     def test_suffix_array_empty_string(self):
         seqs = ["","A","AAAA","ABCD","ABBA"]
         expected = [[],[0],[3, 2, 1, 0],[0, 1, 2, 3],[3, 0, 2, 1]]
@@ -77,6 +97,92 @@ class TestBWT(unittest.TestCase):
             self.assertEqual(classe.procuraPadraoBWT(pattern),exp_result,
                              f"The pattern {pattern} should have the following results {exp_result} insted of {classe.procuraPadraoBWT(pattern)}")
 
+    def test_pattern_aproximado(self):
+        classe = BWT("TAGACAGAGA$")
+        self.assertEqual(classe.procuraAproximadaBWT("ACA", 0), [(3, 0)])
+        self.assertEqual(classe.procuraAproximadaBWT("ACA", 1), [(1, 1), (3, 0), (5, 1), (7, 1)])
+
+    def test_count(self):
+        classe = BWT("TAGACAGAGA$")
+        self.assertEqual(classe.count("AGA"), 3)
+        self.assertEqual(classe.count_many(["AGA", "GA", "CC", "A"]), [3, 3, 0, 5])
+
+    def test_procura_mems(self):
+        classe = BWT("TAGACAGAGA$")
+        self.assertEqual(classe.procuraMEMsBWT("CAGAT"), [(0, 4, [4]), (4, 1, [0])])
+
+    def test_adicionar(self):
+        classe = BWT.colecao(["TAGACAGAGA", "ACAG"], amostragem_sa=4)
+        classe.procuraPadraoBWT("AG")
+        classe.adicionar("GGAGA")
+        self.assertEqual(classe.bwt, BWT.colecao(["TAGACAGAGA", "ACAG", "GGAGA"]).bwt)
+        self.assertEqual(classe.seq_original, "TAGACAGAGA$ACAG$GGAGA$")
+        self.assertEqual(classe.procuraPadraoColecao("AGA"), [(0, 1), (0, 5), (0, 7), (2, 2)])
+        self.assertEqual(BWT(classe.bwt, encoded=True).obter_seq_original(), "TAGACAGAGA$ACAG$GGAGA")
+
+    def test_colecao(self):
+        sequencias = ["TAGACAGAGA", "GACA", "CAGT"]
+        classe = BWT.colecao(sequencias, amostragem_sa=2)
+        self.assertEqual(classe.procuraPadraoColecao("GA"), [(0, 2), (0, 6), (0, 8), (1, 0)])
+        self.assertEqual(classe.procuraPadraoColecao("CAG"), [(0, 4), (2, 0)])
+        self.assertEqual(classe.procuraPadraoColecao("AC"), [(0, 3), (1, 1)])
+        self.assertEqual(BWT(classe.bwt, encoded=True).obter_seq_original(), "TAGACAGAGA$GACA$CAGT")
+
+    def test_backends_compactos(self):
+        random.seed(12)
+        seq = "".join(random.choice("ACGT") for _ in range(2000))
+        referencia = BWT(seq)
+        for classe in (BWT(seq, amostragem_sa=16, backend="dna"), BWT(referencia.bwt, encoded=True, backend="dna"),
+                       BWT(seq, amostragem_sa=16, backend="rle")):
+            self.assertIsNone(classe._bwt)
+            self.assertIsNone(classe._seq_original)
+            self.assertIsNone(classe.sa)
+            self.assertEqual(classe.bwt, referencia.bwt)
+            self.assertEqual(classe.obter_seq_original(), seq)
+            self.assertEqual(classe.procuraPadraoBWT("ACGTA"), referencia.procuraPadraoBWT("ACGTA"))
+        self.assertEqual(BWT(referencia.bwt, encoded=True, backend="rle").seq_original, referencia.bwt)
+        self.assertEqual(BWT(seq, backend="dna").seq_original, seq + "$")
+
+        classe = BWT.colecao(["ACGTTGCA", "GGATCC"], backend="dna")
+        classe.adicionar("TTACGT")
+        self.assertIsNone(classe._bwt)
+        self.assertEqual(classe.bwt, BWT.colecao(["ACGTTGCA", "GGATCC", "TTACGT"]).bwt)
+        self.assertEqual(classe.procuraPadraoColecao("ACG"), [(0, 0), (2, 2)])
+
+    def test_memoria_rle(self):
+        resultados = {r["backend"]: r for r in benchmark_memoria(20000, tipo="repetitiva", copias=50)}
+        self.assertLess(resultados["rle"]["bytes"], resultados["dna"]["bytes"])
+        self.assertLess(resultados["dna"]["bytes"], resultados["python"]["bytes"])
+
+    def test_save_load(self):
+        random.seed(11)
+        sequencias = ["".join(random.choice("ACGT") for _ in range(random.randint(50, 300))) for _ in range(4)]
+        for backend in ("python", "dna"):
+            classe = BWT.colecao(sequencias, amostragem_sa=8, backend=backend)
+            with tempfile.TemporaryDirectory() as pasta:
+                path = os.path.join(pasta, "indice.fm")
+                classe.save(path)
+                carregada = BWT.load(path)
+
+                self.assertEqual(carregada.bwt, classe.bwt)
+                self.assertEqual(carregada.obter_seq_original(), "$".join(sequencias))
+                patterns = ["ACG", "TTA", "GATC", "C"]
+                self.assertEqual(carregada.search_many(patterns), classe.search_many(patterns))
+                self.assertEqual(carregada.procuraPadraoColecao("ACG"), classe.procuraPadraoColecao("ACG"))
+                self.assertEqual(carregada.procuraAproximadaBWT("ACGTA", 1), classe.procuraAproximadaBWT("ACGTA", 1))
+                del carregada
+
+    def test_search_many(self):
+        random.seed(5)
+        seq = "".join(random.choice("ACGT") for _ in range(3000))
+        patterns = ["".join(random.choice("ACGT") for _ in range(random.randint(2, 6))) for _ in range(300)]
+        classe = BWT(seq)
+        expected = [classe.procuraPadraoBWT(p) for p in patterns]
+
+        self.assertEqual(classe.search_many(patterns), expected)
+        self.assertEqual(classe.search_many(patterns, workers=2, chunksize=16), expected)
+        self.assertEqual(sorted(i for i, _ in classe.iter_search_many(patterns, workers=2)), list(range(len(patterns))))
+
 
 if __name__ == '__main__':
     unittest.main(argv=[''], exit=False)
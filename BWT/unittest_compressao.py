@@ -0,0 +1,60 @@
+import unittest
+import io
+import random
+from compressao import (move_to_front, inverter_move_to_front, codificar_zeros, descodificar_zeros,
+                        comprimentos_huffman, codigos_canonicos, comprimir, descomprimir, comprimir_stream,
+                        descomprimir_stream, RUNA, RUNB)
+
+
+class TestCompressao(unittest.TestCase):
+
+    def test_move_to_front(self):
+        self.assertEqual(list(move_to_front(b"aaabbba")), [97, 0, 0, 98, 0, 0, 1])
+        dados = bytes(random.Random(1).randrange(256) for _ in range(500))
+        self.assertEqual(inverter_move_to_front(move_to_front(dados)), dados)
+
+    def test_codificar_zeros(self):
+        self.assertEqual(codificar_zeros(bytes([0, 5, 0, 0, 0, 0, 0])), [RUNA, 6, RUNA, RUNB])
+        for r in range(1, 70):
+            indices = bytes([3]) + bytes(r) + bytes([1])
+            self.assertEqual(descodificar_zeros(codificar_zeros(indices)), indices)
+
+    def test_huffman(self):
+        comprimentos = comprimentos_huffman([5, 0, 1, 1, 2])
+        self.assertEqual(comprimentos, [1, 0, 3, 3, 2])
+        self.assertEqual(codigos_canonicos(comprimentos), {0: "0", 4: "10", 2: "110", 3: "111"})
+        self.assertEqual(comprimentos_huffman([0, 7]), [0, 1])
+
+    def test_ida_e_volta(self):
+        gerador = random.Random(2)
+        casos = [b"", b"A", b"$", b"banana", bytes(range(256)) * 3, b"\x00" * 1000,
+                 "".join(gerador.choice("ACGT") for _ in range(3000)).encode(),
+                 bytes(gerador.randrange(256) for _ in range(2000))]
+        for dados in casos:
+            for tamanho_bloco in [7, 1000, 1 << 18]:
+                self.assertEqual(descomprimir(comprimir(dados, tamanho_bloco)), dados)
+
+    def test_dna_repetitivo(self):
+        base = "".join(random.Random(3).choice("ACGT") for _ in range(1000))
+        dados = (base * 20).encode()
+        comprimido = comprimir(dados)
+        self.assertTrue(len(comprimido) < len(dados) / 10)
+        self.assertEqual(descomprimir(comprimido), dados)
+
+    def test_stream(self):
+        dados = b"TAGACAGAGA$" * 300
+        saida = io.BytesIO()
+        comprimir_stream(io.BytesIO(dados), saida, 512)
+        original = io.BytesIO()
+        descomprimir_stream(io.BytesIO(saida.getvalue()), original)
+        self.assertEqual(original.getvalue(), dados)
+
+    def test_dados_invalidos(self):
+        with self.assertRaises(ValueError):
+            descomprimir(b"nada")
+        with self.assertRaises(ValueError):
+            descomprimir(comprimir(b"TAGACAGAGA" * 10)[:-3])
+
+
+if __name__ == '__main__':
+    unittest.main()
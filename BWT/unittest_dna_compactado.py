@@ -0,0 +1,37 @@
+import unittest
+import random
+from dna_compactado import DNACompactado
+
+
+class TestDNACompactado(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(8)
+        self.seqs = ["A", "ACGT", "TTTTT$", "ACGTNNNNACGT$TTGCA",
+                     "".join(random.choice("ACGT") for _ in range(1000)) + "NNNN" + "".join(random.choice("ACGTN") for _ in range(300)) + "$"]
+
+    def test_simbolo(self):
+        for seq in self.seqs:
+            compactado = DNACompactado(seq, intervalo=16)
+            self.assertEqual(str(compactado), seq)
+
+    def test_rank(self):
+        for seq in self.seqs:
+            compactado = DNACompactado(seq, intervalo=16)
+            for c in "ACGTN$X":
+                for i in range(len(seq) + 1):
+                    self.assertEqual(compactado.rank(c, i), seq[:i].count(c),
+                                     f"rank({c}, {i}) of {seq} should be {seq[:i].count(c)} insted of {compactado.rank(c, i)}")
+
+    def test_simbolos(self):
+        self.assertEqual(DNACompactado("ACGTNNNNACGT$TTGCA").simbolos(), ["$", "A", "C", "G", "N", "T"])
+
+    def test_memoria(self):
+        seq = "".join(random.choice("ACGT") for _ in range(100000))
+        compactado = DNACompactado(seq)
+        memoria = len(compactado.dados) + sum(len(c) * c.itemsize for c in compactado.checkpoints)
+        self.assertLessEqual(memoria * 3, len(seq))
+
+
+if __name__ == '__main__':
+    unittest.main()
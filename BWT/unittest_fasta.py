@@ -0,0 +1,68 @@
+import unittest
+import os
+import random
+import tempfile
+from fasta import ler_fasta, pico_memoria
+from BWT import BWT
+
+
+class TestFasta(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def escrever(self, nome, conteudo):
+        caminho = os.path.join(self.pasta.name, nome)
+        with open(caminho, "w") as ficheiro: ficheiro.write(conteudo)
+        return caminho
+
+    def test_ler_fasta(self):
+        caminho = self.escrever("a.fasta", ">seq1 desc\nTAGA\nCAGA\r\n\n>seq2\nACA\n")
+        texto, nomes = ler_fasta(caminho)
+        self.assertEqual(texto, bytearray(b"TAGACAGA$ACA$"))
+        self.assertEqual(nomes, ["seq1 desc", "seq2"])
+
+    def test_ler_texto_simples(self):
+        caminho = self.escrever("a.txt", "TAGA\nCAGA\n")
+        self.assertEqual(ler_fasta(caminho), (bytearray(b"TAGACAGA$"), [""]))
+
+    def test_separador_invalido(self):
+        caminho = self.escrever("a.fasta", ">seq1\nTA$GA\n")
+        with self.assertRaises(ValueError):
+            ler_fasta(caminho)
+
+    def test_progresso(self):
+        caminho = self.escrever("a.fasta", ">seq1\n" + "ACGT\n" * 100)
+        eventos = []
+        ler_fasta(caminho, lambda etapa, feito, total: eventos.append((etapa, feito, total)), passo=100)
+        self.assertEqual(eventos[-1], ("leitura", 506, 506))
+        self.assertTrue(len(eventos) > 1)
+
+    def test_de_fasta(self):
+        random.seed(3)
+        sequencias = ["".join(random.choice("ACGT") for _ in range(random.randint(1, 300))) for _ in range(5)]
+        conteudo = "".join(f">s{i}\n" + "\n".join(seq[j:j + 60] for j in range(0, len(seq), 60)) + "\n"
+                           for i, seq in enumerate(sequencias))
+        caminho = self.escrever("a.fasta", conteudo)
+
+        etapas = []
+        classe = BWT.de_fasta(caminho, lambda etapa, feito, total: etapas.append(etapa), amostragem_sa=8)
+        esperada = BWT.colecao(sequencias)
+        self.assertEqual(classe.bwt, esperada.bwt)
+        self.assertEqual(classe.nomes, [f"s{i}" for i in range(5)])
+        self.assertEqual(etapas[-2:], ["suffix_array", "bwt"])
+        self.assertEqual(set(classe.estatisticas), {"leitura", "suffix_array", "bwt"})
+
+        for pattern in ["ACG", "T", "GATTA"]:
+            self.assertEqual(classe.procuraPadraoColecao(pattern), esperada.procuraPadraoColecao(pattern))
+
+    def test_pico_memoria(self):
+        pico = pico_memoria()
+        if pico is not None: self.assertTrue(pico > 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+import unittest
+import random
+import os
+import tempfile
+from BWT import BWT
+from fm_index import FMIndex, BACKENDS
+from suffix_array import construir_suffix_array_colecao
+from occ_numpy import np
+
+
+class TestFMIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.seq = "TAGACAGAGA$"
+        self.indice = FMIndex.from_bwt(BWT(self.seq), intervalo=4)
+
+    def test_C(self):
+        expected = {'$': 0, 'A': 1, 'C': 6, 'G': 7, 'T': 10}
+        self.assertEqual(self.indice.C, expected)
+
+    def test_rank(self):
+        bwt = BWT(self.seq).bwt
+        for c in "$ACGT":
+            for i in range(len(bwt) + 1):
+                self.assertEqual(self.indice.rank(c, i), bwt[:i].count(c),
+                                 f"Occ({c}, {i}) should be {bwt[:i].count(c)} insted of {self.indice.rank(c, i)}")
+
+    def test_locate(self):
+        patterns = ["AGA", "T", "A", "TAG", "GACAG", "CC", "X"]
+        expected_results = [[1, 5, 7], [0], [1, 3, 5, 7, 9], [0], [2], [], []]
+        for pattern, exp_result in zip(patterns, expected_results):
+            self.assertEqual(self.indice.locate(pattern), exp_result)
+
+    def test_count(self):
+        patterns = ["AGA", "T", "A", "TAG", "GACAG", "CC", "X", ""]
+        expected_results = [3, 1, 5, 1, 1, 0, 0, 11]
+        for pattern, exp_result in zip(patterns, expected_results):
+            self.assertEqual(self.indice.count(pattern), exp_result)
+        self.assertEqual(self.indice.count_many(patterns), expected_results)
+
+    def test_count_many_kmers(self):
+        random.seed(13)
+        seq = "".join(random.choice("ACGT") for _ in range(3000))
+        indice = FMIndex.from_bwt(BWT(seq), amostragem_sa=32)
+        kmers = ["".join(random.choice("ACGTN") for _ in range(random.randint(1, 6))) for _ in range(500)]
+        expected = [sum(seq.startswith(kmer, i) for i in range(len(seq))) for kmer in kmers]
+        self.assertEqual(indice.count_many(kmers), expected)
+        self.assertEqual([indice.count(kmer) for kmer in kmers], expected)
+
+    def test_locate_aleatorio(self):
+        random.seed(2)
+        seq = "".join(random.choice("ACGT") for _ in range(2000))
+        indice = FMIndex.from_bwt(BWT(seq), intervalo=64)
+        for _ in range(100):
+            pattern = "".join(random.choice("ACGT") for _ in range(random.randint(1, 6)))
+            expected = [i for i in range(len(seq)) if seq.startswith(pattern, i)]
+            self.assertEqual(indice.locate(pattern), expected)
+
+    def test_amostragem_sa(self):
+        random.seed(3)
+        seq = "".join(random.choice("ACGT") for _ in range(1000))
+        completo = FMIndex.from_bwt(BWT(seq))
+        for k in [2, 5, 16, 64]:
+            indice = FMIndex.from_bwt(BWT(seq), amostragem_sa=k)
+            self.assertLessEqual(len(indice.amostras_sa), len(seq) // k + 2)
+            for i in range(indice.n):
+                self.assertEqual(indice.posicao(i), completo.posicao(i))
+
+    def test_amostragem_sa_bwt(self):
+        classe = BWT(self.seq, amostragem_sa=3)
+        self.assertEqual(classe.procuraPadraoBWT("AGA"), [1, 5, 7])
+        self.assertIsNone(classe.sa)
+
+    def test_approximate_search(self):
+        random.seed(6)
+        seq = "".join(random.choice("ACGT") for _ in range(1500))
+        indice = FMIndex.from_bwt(BWT(seq), amostragem_sa=8)
+        for _ in range(30):
+            pattern = "".join(random.choice("ACGT") for _ in range(random.randint(4, 12)))
+            for k in range(3):
+                expected = []
+                for i in range(len(seq) - len(pattern) + 1):
+                    erros = sum(a != b for a, b in zip(pattern, seq[i:i + len(pattern)]))
+                    if erros <= k: expected.append((i, erros))
+                self.assertEqual(indice.approximate_search(pattern, k), expected)
+                self.assertEqual(indice.approximate_search(pattern, k, pruning=False), expected)
+
+    def smems_esperados(self, texto, read):
+        fins = []
+        for i in range(len(read)):
+            fim = i
+            while fim < len(read) and read[i:fim + 1] in texto: fim += 1
+            fins.append(fim)
+        return [(i, fim - i, [p for p in range(len(texto)) if texto.startswith(read[i:fim], p)])
+                for i, fim in enumerate(fins) if fim > i and (i == 0 or fim > fins[i - 1])]
+
+    def test_smems(self):
+        self.assertEqual(self.indice.smems("CAGAT"), [(0, 4, [4]), (4, 1, [0])])
+        self.assertEqual(self.indice.smems("CAGAT", min_length=2), [(0, 4, [4])])
+        self.assertEqual(self.indice.smems("NN"), [])
+
+    def test_smems_aleatorio(self):
+        random.seed(14)
+        sequencias = ["".join(random.choice("ACGT") for _ in range(random.randint(50, 300))) for _ in range(3)]
+        texto = "$".join(sequencias) + "$"
+        for backend in ["python", "dna", "rle"]:
+            indice = FMIndex.from_bwt(BWT.colecao(sequencias), amostragem_sa=4, backend=backend)
+            for _ in range(30):
+                seq = random.choice(sequencias)
+                inicio = random.randrange(len(seq))
+                read = list(seq[inicio:inicio + random.randint(10, 60)])
+                for _ in range(random.randint(0, 4)):
+                    read[random.randrange(len(read))] = random.choice("ACGTN")
+                read = "".join(read)
+                self.assertEqual(indice.smems(read), self.smems_esperados(texto, read))
+
+    def test_adicionar(self):
+        random.seed(18)
+        sequencias = ["".join(random.choice("ACGT") for _ in range(random.randint(1, 120))) for _ in range(8)]
+        texto = "$".join(sequencias) + "$"
+        sa = list(construir_suffix_array_colecao(texto))
+        for k, backend in [(1, "python"), (4, "python"), (3, "dna"), (5, "rle")]:
+            indice = FMIndex.from_bwt(BWT.colecao(sequencias[:5]), intervalo=8, amostragem_sa=k, backend=backend)
+            bwt = BWT.colecao(sequencias[:5]).bwt
+            for seq in sequencias[5:]:
+                bwt = indice.adicionar(bwt, seq)
+            self.assertEqual(bwt, BWT.colecao(sequencias).bwt)
+            self.assertEqual(indice.sequencia_original(), texto)
+            self.assertEqual(list(indice.inicios), [sum(len(x) + 1 for x in sequencias[:i]) for i in range(len(sequencias))])
+            self.assertEqual([indice.posicao(i) for i in range(indice.n)], sa)
+            self.assertEqual(indice.locate_docs("ACG"), FMIndex.from_bwt(BWT.colecao(sequencias)).locate_docs("ACG"))
+
+    def test_adicionar_novo_simbolo(self):
+        indice = FMIndex.from_bwt(BWT("TAGACAGAGA$"), amostragem_sa=3)
+        bwt = indice.adicionar(BWT("TAGACAGAGA$").bwt, "GANTA")
+        self.assertEqual(bwt, BWT.colecao(["TAGACAGAGA", "GANTA"]).bwt)
+        self.assertEqual(indice.locate("GA"), [2, 6, 8, 11])
+        self.assertEqual(indice.locate_docs("NT"), [(1, 2)])
+
+    def test_adicionar_indice_persistido(self):
+        indice = FMIndex.from_bwt(BWT("TAGACAGAGA$"), amostragem_sa=2)
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "indice.fmi")
+            indice.save(caminho)
+            carregado = FMIndex.load(caminho)
+            carregado.adicionar(BWT("TAGACAGAGA$").bwt, "AGAT")
+            self.assertEqual(carregado.sequencia_original(), "TAGACAGAGA$AGAT$")
+            self.assertEqual(carregado.locate("AGA"), [1, 5, 7, 11])
+            del carregado
+
+    def test_sequencia_original(self):
+        self.assertEqual(self.indice.sequencia_original(), self.seq)
+        self.assertEqual(self.indice.indice_reverso().sequencia_original(), "AGAGACAGAT$")
+
+    def test_backend_dna(self):
+        random.seed(9)
+        seq = "".join(random.choice("ACGT") for _ in range(2000))
+        python = FMIndex.from_bwt(BWT(seq))
+        dna = FMIndex.from_bwt(BWT(seq), backend="dna", amostragem_sa=4)
+        self.assertEqual(dna.C, python.C)
+        for _ in range(100):
+            pattern = "".join(random.choice("ACGT") for _ in range(random.randint(1, 6)))
+            self.assertEqual(dna.locate(pattern), python.locate(pattern))
+        self.assertEqual(dna.approximate_search("ACGTAC", 1), python.approximate_search("ACGTAC", 1))
+        self.assertEqual(BWT(self.seq, backend="dna").procuraPadraoBWT("AGA"), [1, 5, 7])
+
+    def test_colecao(self):
+        random.seed(10)
+        sequencias = ["".join(random.choice("ACGT") for _ in range(random.randint(1, 80))) for _ in range(25)]
+        texto = "$".join(sequencias) + "$"
+        for k, backend in [(1, "python"), (5, "python"), (7, "dna")]:
+            indice = FMIndex.from_bwt(BWT.colecao(sequencias), amostragem_sa=k, backend=backend)
+            self.assertEqual(list(indice.inicios), [sum(len(x) + 1 for x in sequencias[:i]) for i in range(len(sequencias))])
+            self.assertEqual(indice.sequencia_original(), texto)
+            sa = construir_suffix_array_colecao(texto)
+            for i in range(indice.n):
+                self.assertEqual(indice.posicao(i), sa[i])
+            for _ in range(50):
+                pattern = "".join(random.choice("ACGT") for _ in range(random.randint(1, 5)))
+                expected = [(d, i) for d, seq in enumerate(sequencias) for i in range(len(seq)) if seq.startswith(pattern, i)]
+                self.assertEqual(indice.locate_docs(pattern), expected)
+
+    def test_backend_rle(self):
+        random.seed(12)
+        base = "".join(random.choice("ACGT") for _ in range(300))
+        estirpes = []
+        for _ in range(10):
+            estirpe = list(base)
+            for _ in range(3): estirpe[random.randrange(len(estirpe))] = random.choice("ACGT")
+            estirpes.append("".join(estirpe))
+        python = FMIndex.from_bwt(BWT.colecao(estirpes))
+        rle = FMIndex.from_bwt(BWT.colecao(estirpes), backend="rle", amostragem_sa=8)
+        self.assertLess(rle.ocorrencias.r, rle.n // 4)
+        self.assertEqual(rle.C, python.C)
+        for _ in range(100):
+            pattern = "".join(random.choice("ACGT") for _ in range(random.randint(1, 8)))
+            self.assertEqual(rle.locate_docs(pattern), python.locate_docs(pattern))
+
+    def test_transformada(self):
+        classe = BWT.colecao(["ACGTNNACGT", "TTGCA"])
+        for backend in BACKENDS:
+            if backend == "numpy" and np is None: continue
+            self.assertEqual(FMIndex.from_bwt(classe, backend=backend).transformada(), classe.bwt, backend)
+
+    def test_backend_invalido(self):
+        self.assertRaises(ValueError, FMIndex.from_bwt, BWT(self.seq), backend="xpto")
+
+    def test_save_load(self):
+        random.seed(7)
+        seq = "".join(random.choice("ACGT") for _ in range(3000))
+        for k, backend in [(1, "python"), (16, "python"), (8, "dna"), (4, "rle")]:
+            indice = FMIndex.from_bwt(BWT(seq), amostragem_sa=k, backend=backend)
+            with tempfile.TemporaryDirectory() as pasta:
+                path = os.path.join(pasta, "indice.fm")
+                indice.save(path)
+                carregado = FMIndex.load(path)
+
+                self.assertEqual(carregado.C, indice.C)
+                for _ in range(50):
+                    pattern = "".join(random.choice("ACGT") for _ in range(random.randint(1, 7)))
+                    self.assertEqual(carregado.locate(pattern), indice.locate(pattern))
+                self.assertEqual(carregado.approximate_search("ACGTAC", 1), indice.approximate_search("ACGTAC", 1))
+                del carregado
+
+    def test_load_ficheiro_invalido(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            path = os.path.join(pasta, "invalido.fm")
+            with open(path, "wb") as f: f.write(b"nada")
+            self.assertRaises(ValueError, FMIndex.load, path)
+
+    def test_indice_persistido(self):
+        classe = BWT(self.seq)
+        classe.procuraPadraoBWT("AGA")
+        indice = classe._fm
+        classe.procuraPadraoBWT("T")
+        self.assertIs(classe.indice_fm(), indice)
+
+
+if __name__ == '__main__':
+    unittest.main()
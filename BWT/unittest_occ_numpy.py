@@ -0,0 +1,61 @@
+import unittest
+import random
+import os
+import tempfile
+from BWT import BWT
+from fm_index import FMIndex, OccCheckpoints
+from occ_numpy import OccNumpy, np
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestOccNumpy(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(16)
+        self.bwt = BWT("".join(random.choice("ACGTN") for _ in range(700))).bwt
+
+    def test_rank(self):
+        python = OccCheckpoints(self.bwt, 16)
+        for intervalo in [1, 7, 64]:
+            ocorrencias = OccNumpy(self.bwt, intervalo)
+            self.assertEqual(ocorrencias.simbolos(), python.simbolos())
+            for c in "ACGTN$X":
+                for i in range(len(self.bwt) + 1):
+                    self.assertEqual(ocorrencias.rank(c, i), python.rank(c, i))
+
+    def test_simbolo(self):
+        ocorrencias = OccNumpy(self.bwt)
+        self.assertEqual("".join(ocorrencias.simbolo(i) for i in range(len(self.bwt))), self.bwt)
+
+    def test_simbolos_invalidos(self):
+        with self.assertRaises(ValueError):
+            OccNumpy("ACĀ$")
+
+    def test_fm_index(self):
+        random.seed(17)
+        seq = "".join(random.choice("ACGT") for _ in range(1500))
+        python = FMIndex.from_bwt(BWT(seq), amostragem_sa=8)
+        indice = FMIndex.from_bwt(BWT(seq), amostragem_sa=8, backend="numpy")
+        self.assertEqual(indice.C, python.C)
+        self.assertEqual(indice.sequencia_original(), seq + "$")
+        padroes = ["".join(random.choice("ACGT") for _ in range(random.randint(1, 7))) for _ in range(100)]
+        for pattern in padroes:
+            self.assertEqual(indice.locate(pattern), python.locate(pattern))
+        self.assertEqual(indice.count_many(padroes), python.count_many(padroes))
+        self.assertEqual(indice.approximate_search("ACGTAC", 1), python.approximate_search("ACGTAC", 1))
+        self.assertEqual(BWT(seq, backend="numpy").procuraPadraoBWT("ACGT"), python.locate("ACGT"))
+
+    def test_save_load(self):
+        indice = FMIndex.from_bwt(BWT("TAGACAGAGA$"), amostragem_sa=2, backend="numpy")
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "indice.fmi")
+            indice.save(caminho)
+            carregado = FMIndex.load(caminho)
+            self.assertEqual(carregado.backend, "numpy")
+            self.assertEqual(carregado.locate("AGA"), [1, 5, 7])
+            self.assertEqual(carregado.sequencia_original(), "TAGACAGAGA$")
+            del carregado
+
+
+if __name__ == '__main__':
+    unittest.main()
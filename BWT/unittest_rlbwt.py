@@ -0,0 +1,40 @@
+import unittest
+import random
+from rlbwt import RLBWT
+
+
+class TestRLBWT(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(11)
+        self.bwts = ["A", "AAAACCCC$GGGGAAAA", "ipssm$pissii",
+                     "".join(random.choice("ACGT") * random.randint(1, 20) for _ in range(100)) + "$"]
+
+    def test_runs(self):
+        rlbwt = RLBWT("AAAACCCC$GGGGAAAA")
+        self.assertEqual(rlbwt.r, 5)
+        self.assertEqual(list(rlbwt.inicios), [0, 4, 8, 9, 13])
+        self.assertEqual(rlbwt.cabecas, b"AC$GA")
+
+    def test_rank_simbolo(self):
+        for bwt in self.bwts:
+            rlbwt = RLBWT(bwt)
+            for i in range(len(bwt)):
+                self.assertEqual(rlbwt.simbolo(i), bwt[i])
+            for c in set(bwt) | {"X"}:
+                for i in range(len(bwt) + 1):
+                    self.assertEqual(rlbwt.rank(c, i), bwt[:i].count(c),
+                                     f"rank({c}, {i}) of {bwt} should be {bwt[:i].count(c)} insted of {rlbwt.rank(c, i)}")
+
+    def test_select(self):
+        for bwt in self.bwts:
+            rlbwt = RLBWT(bwt)
+            for c in set(bwt):
+                posicoes = [i for i, s in enumerate(bwt) if s == c]
+                for k, posicao in enumerate(posicoes, 1):
+                    self.assertEqual(rlbwt.select(c, k), posicao)
+                self.assertRaises(ValueError, rlbwt.select, c, len(posicoes) + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+import random
+from suffix_array import sa_is, construir_suffix_array, construir_suffix_array_colecao
+
+
+class TestSuffixArray(unittest.TestCase):
+
+    def setUp(self):
+        self.seqs = ["", "A", "AAAA", "ABBA", "mississippi$", "TAGACAGAGA$", "ACGTTGCA" * 20 + "$"]
+
+    def test_construir_suffix_array(self):
+        for seq in self.seqs:
+            expected = sorted(range(len(seq)), key=lambda i: seq[i:])
+            self.assertEqual(construir_suffix_array(seq), expected,
+                             f"The sequence {seq} should have the suffix array {expected} insted of {construir_suffix_array(seq)}")
+
+    def test_sequencias_aleatorias(self):
+        random.seed(1)
+        for _ in range(200):
+            seq = "".join(random.choice("ACGT") for _ in range(random.randint(10, 200))) + "$"
+            self.assertEqual(construir_suffix_array(seq), sorted(range(len(seq)), key=lambda i: seq[i:]))
+
+    def test_sa_is_inteiros(self):
+        s = [2, 1, 2, 1, 2, 1, 0, 3, 3, 3, 1, 2]
+        self.assertEqual(list(sa_is(s, 3)), sorted(range(len(s)), key=lambda i: s[i:]))
+
+    def test_colecao(self):
+        texto = "ACA$AC$ACA$"
+        # With distinct sentinels the suffix "AC$ACA$" is smaller than "ACA$AC$ACA$", and "ACA$AC$..." smaller than "ACA$" (end).
+        chave = lambda i: [(0, texto[:j + 1].count("$")) if c == "$" else (1, c) for j, c in enumerate(texto) if j >= i]
+        self.assertEqual(list(construir_suffix_array_colecao(texto)), sorted(range(len(texto)), key=chave))
+        self.assertEqual(list(construir_suffix_array_colecao("TAGACAGAGA$")), construir_suffix_array("TAGACAGAGA$"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,107 @@ Documentação e type hiting gerada por Duarte Velho
 """
 
 import subprocess
+import threading
+from array import array
+from collections import OrderedDict
+
+VARIANTS = ("boyer-moore", "horspool", "sunday")
+
+
+class PatternCache:
+    """
+    A thread-safe cache of compiled patterns (their shift tables) with least-recently-used eviction, shared by every
+    BoyerMoore instance of the process, so a pattern that is searched again and again is preprocessed only once.
+
+    Parameters
+    ----------
+    max_patterns : int, optional
+        Maximum number of cached patterns. Defaults to 1024.
+    max_symbols : int, optional
+        Maximum total length of the cached patterns (the tables take memory proportional to it). Patterns longer than
+        this are never cached. Defaults to 2^20.
+
+    Attributes
+    ----------
+    hits : int
+        Number of lookups that found the pattern.
+    misses : int
+        Number of lookups that did not.
+
+    """
+    def __init__(self, max_patterns : int = 1024, max_symbols : int = 1 << 20):
+        self.max_patterns = max_patterns
+        self.max_symbols = max_symbols
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._symbols = 0
+        self._lock = threading.Lock()
+
+    def get(self, pattern : str):
+        """
+        Returns the compiled tables of a pattern and marks it as the most recently used.
+
+        Parameters
+        ----------
+        pattern : str
+            The pattern.
+
+        Returns
+        -------
+        dict
+            The compiled tables, or None if the pattern is not cached.
+        """
+        with self._lock:
+            compiled = self._entries.get(pattern)
+            if compiled is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(pattern)
+            self.hits += 1
+            return compiled
+
+    def put(self, pattern : str, compiled : dict) -> None:
+        """
+        Stores the compiled tables of a pattern, evicting the least recently used patterns while the limits are exceeded.
+
+        Parameters
+        ----------
+        pattern : str
+            The pattern.
+        compiled : dict
+            Its compiled tables.
+        """
+        if len(pattern) > self.max_symbols or self.max_patterns < 1:
+            return
+        with self._lock:
+            if pattern in self._entries:
+                self._symbols -= len(pattern)
+            self._entries[pattern] = compiled
+            self._entries.move_to_end(pattern)
+            self._symbols += len(pattern)
+            while len(self._entries) > self.max_patterns or self._symbols > self.max_symbols:
+                evicted, _ = self._entries.popitem(last=False)
+                self._symbols -= len(evicted)
+
+    def clear(self) -> None:
+        """
+        Removes every pattern and resets the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._symbols = 0
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, pattern : str) -> bool:
+        return pattern in self._entries
+
+
+PATTERN_CACHE = PatternCache()
+
 
 class BoyerMoore:
     """
@@ -19,12 +120,24 @@ class BoyerMoore:
     pattern : str
         The pattern string that the Boyer-Moore algorithm will search for in the text.
 
+    The bytes search mode (search_bytes) keeps the shift tables in 256-entry arrays indexed by byte value; they are
+    built on its first call.
+
+    The tables are kept in PATTERN_CACHE, so creating another BoyerMoore for a recently used pattern reuses them
+    instead of preprocessing the pattern again. They are shared between instances and must not be modified.
+
     """
     def __init__(self, pattern):
         self.pattern = pattern
         self.pattern_length = len(pattern)
-        self.bad_character_rule = self.create_bad_character_table()
-        self.good_suffix_rule = self.create_good_suffix_table()
+        self.compiled = PATTERN_CACHE.get(pattern)
+        if self.compiled is None:
+            self.compiled = {"bad_character": self.create_bad_character_table(),
+                             "good_suffix": self.create_good_suffix_table(), "bytes": None}
+            PATTERN_CACHE.put(pattern, self.compiled)
+        self.bad_character_rule = self.compiled["bad_character"]
+        self.good_suffix_rule = self.compiled["good_suffix"]
+        self.byte_tables = self.compiled["bytes"]
 
     def create_bad_character_table(self) -> dict:
         """
@@ -43,79 +156,66 @@ class BoyerMoore:
 
     def create_good_suffix_table(self) -> list:
         """
-        Creates the good suffix shift table used in the Boyer-Moore search algorithm.
-        This table is filled with the shifts calculated based on the good suffix rule, 
+        Creates the good suffix shift table used in the Boyer-Moore search algorithm, in O(m) time.
+        This table is filled with the shifts calculated based on the (strong) good suffix rule,
         which considers how far the search can jump in the text after a partial match is found.
+        table[j + 1] is the shift after a mismatch at position j of the pattern (table[0] after a full match): the
+        smallest shift that aligns the matched suffix with an equal substring not preceded by pattern[j], or else
+        with a prefix of the pattern.
 
         Returns
         -------
         list[int]
             The good suffix table for the pattern.
         """
-        table = [0] * (len(self.pattern) + 1)
-        last_prefix_position = len(self.pattern)
+        m = len(self.pattern)
+        suffixes = self.suffix_lengths()
+        shifts = [m] * m
 
-        for i in range(len(self.pattern)):
-            mirrored_i = len(self.pattern) - 1 - i
-            if self.is_prefix(mirrored_i + 1):
-                last_prefix_position = mirrored_i + 1
-            table[mirrored_i] = last_prefix_position - mirrored_i + len(self.pattern) - 1
+        # shifts given by the suffixes of the pattern that are also prefixes (its borders), longest first
+        j = 0
+        for i in range(m - 1, -1, -1):
+            if suffixes[i] == i + 1:
+                while j < m - 1 - i:
+                    if shifts[j] == m:
+                        shifts[j] = m - 1 - i
+                    j += 1
 
-        for i in range(len(self.pattern)):
-            length_suffix = self.length_of_suffix(i)
-            if self.pattern[i - length_suffix] != self.pattern[len(self.pattern) - 1 - length_suffix]:
-                table[len(self.pattern) - 1 - length_suffix] = len(self.pattern) - 1 - i + length_suffix
+        # shifts given by the other occurrences of each suffix; the rightmost occurrence (smallest shift) is written last
+        for i in range(m - 1):
+            shifts[m - 1 - suffixes[i]] = m - 1 - i
 
-        return table
+        return [shifts[0] if m else 0] + shifts
 
-    def is_prefix(self, p : int) -> bool:
+    def suffix_lengths(self) -> list:
         """
-        Determines if the substring of the pattern starting from index `p` is a prefix of the pattern.
+        Computes, in O(m) time, the length of the longest common suffix of each prefix of the pattern and the pattern.
 
-        This method is used in calculating the good suffix table to determine how much of the end of the pattern
-        can be considered a prefix. This is crucial for optimizing the search by identifying suffix-prefix matches
-        which allow for larger skips in the text.
-
-        Parameters
-        ----------
-        p : int
-            The starting index in the pattern from which to check if the subsequent substring is a prefix of the pattern.
+        The interval [g + 1, f] is the rightmost substring found so far that is a suffix of the pattern; inside it,
+        the value for position i is copied from the mirrored position, as in the Z-algorithm.
 
         Returns
         -------
-        bool
-            True if the substring from index `p` to the end is a prefix of the pattern, False otherwise.
-        """
-        for i in range(p, len(self.pattern)):
-            if self.pattern[i] != self.pattern[len(self.pattern) - 1 - i + p]:
-                return False
-        return True
-
-    def length_of_suffix(self, p : int) -> int:
+        list[int]
+            suffixes[i] is the length of the longest suffix of pattern[:i + 1] that is also a suffix of the pattern.
         """
-        Computes the length of the longest suffix of the pattern starting from index `p` that matches a prefix of the pattern.
-
-        This method aids in constructing the good suffix rule table. The length of matching suffix determines how far the pattern
-        can potentially be shifted without missing potential matches in subsequent searches.
-
-        Parameters
-        ----------
-        p : int
-            The starting index in the pattern from which to determine the matching suffix length.
-
-        Returns
-        -------
-        int
-            The length of the suffix of the pattern starting from index `p` that matches the prefix of the pattern.
-        """
-        length = 0
-        i = p
-        j = len(self.pattern) - 1
-        while i >= 0 and self.pattern[i] == self.pattern[j]:
-            length += 1
-            i -= 1
-            j -= 1
-        return length
+        pattern = self.pattern
+        m = len(pattern)
+        suffixes = [0] * m
+        if m == 0:
+            return suffixes
+        suffixes[m - 1] = m
+        f = g = m - 1
+        for i in range(m - 2, -1, -1):
+            if i > g and suffixes[i + m - 1 - f] < i - g:
+                suffixes[i] = suffixes[i + m - 1 - f]
+            else:
+                g = min(g, i)
+                f = i
+                while g >= 0 and pattern[g] == pattern[g + m - 1 - f]:
+                    g -= 1
+                suffixes[i] = f - g
+        return suffixes
 
     def search(self, text : str) -> list:
         """
@@ -133,9 +233,10 @@ class BoyerMoore:
         """
         positions = []
         i = 0
-        while i <= len(text) - len(self.pattern):
+        last = len(text) - self.pattern_length
+        while i <= last:
             shift = 1
-            j = len(self.pattern) - 1
+            j = self.pattern_length - 1
             while j >= 0 and self.pattern[j] == text[i + j]:
                 j -= 1
             if j < 0:
@@ -146,6 +247,88 @@ class BoyerMoore:
                 i += max(shift, j - bad_character_shift, self.good_suffix_rule[j + 1])
         return positions
 
+    def create_byte_tables(self) -> dict:
+        """
+        Creates the shift tables of the bytes search mode, as 256-entry arrays indexed by byte value
+        (the pattern is encoded as latin-1).
+
+        Returns
+        -------
+        dict[str, array]
+            "bad_character": the last position of each byte in the pattern (-1 if absent);
+            "horspool": the shift given by the byte aligned with the last position of the window;
+            "sunday": the shift given by the byte that follows the window.
+        """
+        pattern = self.pattern.encode("latin-1")
+        m = len(pattern)
+        bad_character = array('i', [-1]) * 256
+        horspool = array('i', [m]) * 256
+        sunday = array('i', [m + 1]) * 256
+        for i, c in enumerate(pattern):
+            bad_character[c] = i
+            sunday[c] = m - i
+            if i < m - 1:
+                horspool[c] = m - 1 - i
+        return {"bad_character": bad_character, "horspool": horspool, "sunday": sunday}
+
+    def search_bytes(self, text : bytes, variant : str = "boyer-moore") -> list:
+        """
+        Searches for all occurrences of the pattern in a bytes-like text, with the shift tables kept in 256-entry arrays.
+        Each window is compared with a single slice comparison, and the variant only decides the shift:
+
+        - "boyer-moore": the larger of the bad character and the good suffix shifts;
+        - "horspool": the bad character shift of the byte aligned with the end of the window;
+        - "sunday": the bad character shift of the byte that follows the window.
+
+        Parameters
+        ----------
+        text : bytes
+            The text in which to search for the pattern (bytes, bytearray or memoryview).
+        variant : str, optional
+            One of VARIANTS. Defaults to "boyer-moore".
+
+        Returns
+        -------
+        list[int]
+            A list of starting positions where the pattern is found within the text.
+        """
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown variant {variant}, expected one of {VARIANTS}")
+        if not isinstance(text, (bytes, bytearray)): text = bytes(text)
+        if self.byte_tables is None:
+            self.byte_tables = self.compiled["bytes"] = self.create_byte_tables()
+
+        pattern = self.pattern.encode("latin-1")
+        m = len(pattern)
+        last = len(text) - m
+        positions = []
+        i = 0
+
+        if variant == "horspool":
+            shift = self.byte_tables["horspool"].tolist()
+            while i <= last:
+                if text[i:i + m] == pattern: positions.append(i)
+                i += shift[text[i + m - 1]]
+        elif variant == "sunday":
+            shift = self.byte_tables["sunday"].tolist()
+            while i < last:
+                if text[i:i + m] == pattern: positions.append(i)
+                i += shift[text[i + m]]
+            if i == last and text[i:] == pattern: positions.append(i)
+        else:
+            bad_character = self.byte_tables["bad_character"].tolist()
+            good_suffix = self.good_suffix_rule
+            while i <= last:
+                if text[i:i + m] == pattern:
+                    positions.append(i)
+                    i += good_suffix[0]
+                    continue
+                j = m - 1
+                while pattern[j] == text[i + j]:
+                    j -= 1
+                i += max(1, j - bad_character[text[i + j]], good_suffix[j + 1])
+        return positions
+
 
 if __name__ == "__main__":
 
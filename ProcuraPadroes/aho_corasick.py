@@ -0,0 +1,196 @@
+"""
+Implementação do algoritmo de Procura de padrões: Aho-Corasick
+
+Baseado em:
+    A. V. Aho e M. J. Corasick, "Efficient string matching: an aid to bibliographic search", 1975.
+
+Autómato para vários padrões em simultâneo: os padrões são inseridos numa trie (função goto),
+cada estado guarda a ligação de falha (o maior sufixo próprio que também é prefixo de um padrão)
+e a ligação de saída (o estado mais próximo na cadeia de falhas onde termina um padrão).
+O texto é percorrido uma única vez, qualquer que seja o número de padrões.
+"""
+
+import subprocess
+from collections import deque
+
+class AhoCorasick:
+
+    """
+    This class implements the Aho-Corasick automaton, which finds every occurrence of a set of patterns in a text
+    with a single pass over the text. The automaton is built once over the pattern set.
+
+    Parameters
+    ----------
+    padroes : list[str]
+        The patterns to search for. The id of each pattern is its index in the list.
+
+    Attributes
+    ----------
+    padroes : list[str]
+        Stores the patterns.
+    goto : list[dict[str, int]]
+        The trie of the patterns: goto[estado][caracter] is the next state, when that edge exists.
+    falha : list[int]
+        The failure link of each state: the state of the longest proper suffix of its string that is a prefix of a pattern.
+    saida : list[list[int]]
+        The ids of the patterns that end exactly at each state.
+    ligacao_saida : list[int]
+        The output link of each state: the nearest state in its failure chain where a pattern ends, or -1.
+
+    """
+
+    def __init__(self, padroes : list[str]) -> None:
+
+        assert all(len(padrao) > 0 for padrao in padroes), "The patterns must be non-empty"
+
+        self.padroes = list(padroes)
+        self.goto = [{}]
+        self.saida = [[]]
+        self.falha = [0]
+        self.ligacao_saida = [-1]
+        self.construirTrie()
+        self.construirLigacoes()
+
+
+    def construirTrie(self) -> None:
+        """
+        Inserts every pattern in the trie (the goto function), recording the pattern id in the state where it ends.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        for id_padrao, padrao in enumerate(self.padroes):
+            estado = 0
+            for caracter in padrao:
+                if caracter not in self.goto[estado]:
+                    self.goto[estado][caracter] = len(self.goto)
+                    self.goto.append({})
+                    self.saida.append([])
+                estado = self.goto[estado][caracter]
+            self.saida[estado].append(id_padrao)
+
+
+    def construirLigacoes(self) -> None:
+        """
+        Computes the failure and output links with a breadth-first traversal of the trie, so the links of a state are
+        computed after the links of every shorter state.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.falha = [0] * len(self.goto)
+        self.ligacao_saida = [-1] * len(self.goto)
+        fila = deque(self.goto[0].values())
+
+        while fila:
+            estado = fila.popleft()
+            for caracter, proximo in self.goto[estado].items():
+                fila.append(proximo)
+                falha = self.falha[estado]
+                while falha and caracter not in self.goto[falha]:
+                    falha = self.falha[falha]
+                falha = self.goto[falha].get(caracter, 0)
+                self.falha[proximo] = falha
+                self.ligacao_saida[proximo] = falha if self.saida[falha] else self.ligacao_saida[falha]
+
+
+    def proximoEstado(self, estado : int, caracter : str) -> int:
+        """
+        Returns the state reached from `estado` after reading `caracter`, following failure links while the trie has
+        no edge for the character.
+
+        Parameters
+        ----------
+        estado : int
+            The current state.
+        caracter : str
+            The character read.
+
+        Returns
+        -------
+        int
+            The next state.
+
+        """
+
+        while estado and caracter not in self.goto[estado]:
+            estado = self.falha[estado]
+        return self.goto[estado].get(caracter, 0)
+
+
+    def iterMatches(self, sequencia : str):
+        """
+        Scans a sequence once and yields every occurrence of every pattern, in the order in which the occurrences end.
+
+        Parameters
+        ----------
+        sequencia : str
+            The sequence in which to search for the patterns.
+
+        Yields
+        ------
+        tuple[int, int]
+            The starting position of the occurrence and the id of the pattern.
+
+        """
+
+        estado = 0
+        for i, caracter in enumerate(sequencia):
+            estado = self.proximoEstado(estado, caracter)
+            saida = estado if self.saida[estado] else self.ligacao_saida[estado]
+            while saida != -1:
+                for id_padrao in self.saida[saida]:
+                    yield i - len(self.padroes[id_padrao]) + 1, id_padrao
+                saida = self.ligacao_saida[saida]
+
+
+    def posicoesMatch(self, sequencia : str) -> list[tuple[int, int]]:
+        """
+        Identifies every occurrence of the patterns in the sequence with a single pass over it.
+
+        Parameters
+        ----------
+        sequencia : str
+            The sequence in which to search for the patterns.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            The pairs (position, pattern_id) of every occurrence, sorted by position and pattern id.
+            If no pattern is found, returns an empty list.
+
+        """
+
+        return sorted(self.iterMatches(sequencia))
+
+
+if __name__ == "__main__":
+    teste = AhoCorasick(['he', 'she', 'his', 'hers'])
+
+    for estado, transicoes in enumerate(teste.goto):
+        print(estado, transicoes, 'falha:', teste.falha[estado], 'saida:', teste.saida[estado])
+
+    sequencia = 'ushers'
+    print(teste.posicoesMatch(sequencia))
+
+    print("Metricas de Codigo:")
+    print("\nMetrica cyclomatic complexity:")
+    print(subprocess.call(["radon","cc","ProcuraPadroes/aho_corasick.py", "-s"]))
+    print("\nMetrica maintainability index:")
+    print(subprocess.call(["radon","mi","ProcuraPadroes/aho_corasick.py", "-s"]))
+    print("\nMetrica raw:")
+    print(subprocess.call(["radon","raw","ProcuraPadroes/aho_corasick.py", "-s"]))
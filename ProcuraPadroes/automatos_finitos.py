@@ -8,6 +8,34 @@ Documentação e type hiting gerada por Duarte Velho
 """
 
 import subprocess
+from typing import Iterable, Iterator
+from tabela_densa import TabelaDensa
+
+
+def lerBlocos(caminho : str, tamanho_bloco : int = 1 << 20) -> Iterator[bytes]:
+    """
+    Reads a file in blocks of fixed size, so it can be scanned without loading it into memory.
+
+    Parameters
+    ----------
+    caminho : str
+        Path of the file.
+    tamanho_bloco : int, optional
+        Size of each block, in bytes. Defaults to 1 MiB.
+
+    Yields
+    ------
+    bytes
+        The consecutive blocks of the file.
+
+    """
+
+    with open(caminho, "rb") as ficheiro:
+        while True:
+            bloco = ficheiro.read(tamanho_bloco)
+            if not bloco: break
+            yield bloco
+
 
 class Automata:
 
@@ -31,6 +59,8 @@ class Automata:
     transicoes : dict[tuple[int, str], int]
         A dictionary representing the state transition table where keys are tuples of state and character, 
         and values are the resultant states after the transition.
+    densa : TabelaDensa
+        The transition table as a flat array, built on the first call to tabelaDensa (compact mode).
 
     """
 
@@ -39,13 +69,45 @@ class Automata:
         self.alfabeto = alfabeto
         self.padrao = padrao
         self.transicoes = {}
+        self.densa = None
         self.tabelaTransicoes()
 
 
+    def funcaoPrefixo(self) -> list[int]:
+        """
+        Computes the prefix function (failure function of KMP) of the pattern: for each position q, the length of the
+        longest proper prefix of padrao[:q + 1] that is also a suffix of it.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        list[int]
+            The prefix function of the pattern.
+
+        """
+
+        prefixo = [0] * len(self.padrao)
+        k = 0
+        for q in range(1, len(self.padrao)):
+            while k > 0 and self.padrao[k] != self.padrao[q]:
+                k = prefixo[k - 1]
+            if self.padrao[k] == self.padrao[q]:
+                k += 1
+            prefixo[q] = k
+        return prefixo
+
+
     def tabelaTransicoes(self) -> None:
         """
         Constructs the state transition table for the automaton based on the specified pattern and alphabet. 
         This table is used to determine the next state for each character and state combination during the pattern search.
+        State q means that the last q characters read are the first q characters of the pattern, and the final state
+        (len(padrao)) also has transitions, so overlapping occurrences are found. On a mismatch, the automaton moves to the
+        transition of the state given by the prefix function, which was already computed, so the table is built in
+        O(len(padrao) * len(alfabeto)).
 
         Parameters
         ----------
@@ -57,21 +119,23 @@ class Automata:
 
         """
 
-        for estado in range(len(self.padrao)):
+        prefixo = self.funcaoPrefixo()
+        for estado in range(len(self.padrao) + 1):
             for caracter in self.alfabeto:
                 transicao=(estado, caracter)
-                if self.padrao[estado] == caracter:
+                if estado < len(self.padrao) and self.padrao[estado] == caracter:
                     self.transicoes[transicao]=estado+1
+                elif estado == 0:
+                    self.transicoes[transicao]=0
                 else:
-                    if caracter == self.padrao[0]:
-                        self.transicoes[transicao]=1
-                    else:
-                        self.transicoes[transicao]=0
+                    self.transicoes[transicao]=self.transicoes[(prefixo[estado-1], caracter)]
                         
                         
     def aplicaAutomato(self, sequencia : str) -> list[int]:
         """
         Processes a given sequence through the automaton and records the state transitions as the sequence is processed.
+        Each character costs a single lookup in the transition table; the state is kept after a match, so
+        overlapping occurrences of the pattern are also found.
 
         Parameters
         ----------
@@ -90,8 +154,6 @@ class Automata:
         for car in sequencia:
             estado = self.transicoes[(estado, car)]
             estados.append(estado)
-            if estado == len(self.padrao):
-                estado = 0
         return estados    
 
 
@@ -121,6 +183,79 @@ class Automata:
         return listaMatchs        
 
 
+    def tabelaDensa(self) -> TabelaDensa:
+        """
+        Returns the transition table in compact mode: a flat array indexed by state * (len(alfabeto) + 1) + symbol code
+        (see TabelaDensa). It is built from the dictionary on the first call and kept in self.densa.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        TabelaDensa
+            The dense transition table. Symbols outside the alphabet move the automaton to state 0.
+
+        """
+
+        if self.densa is None:
+            self.densa = TabelaDensa(self.alfabeto, len(self.padrao) + 1, self.transicoes, {len(self.padrao)})
+        return self.densa
+
+
+    def iterMatchesBytes(self, dados : bytes):
+        """
+        Scans a bytes buffer with the dense transition table and yields only the starting positions of the matches,
+        without building the list of every state. The alphabet must be made of single-byte characters.
+
+        Parameters
+        ----------
+        dados : bytes
+            The sequence in which to search for the pattern, as bytes (for instance, read from a file).
+
+        Yields
+        ------
+        int
+            The starting position of each occurrence of the pattern, in increasing order.
+
+        """
+
+        fins, _ = self.tabelaDensa().varrer(dados)
+        for fim in fins:
+            yield fim - len(self.padrao) + 1
+
+
+    def iterMatchesStream(self, blocos : Iterable[bytes]) -> Iterator[int]:
+        """
+        Scans a sequence given as consecutive blocks (for instance, lerBlocos over a file, or slices of an mmap) and
+        yields the absolute starting positions of the matches as each block is processed.
+        The state of the automaton is carried from one block to the next, so occurrences that cross a block boundary
+        are found, and only one block is kept in memory at a time, whatever the size of the sequence.
+
+        Parameters
+        ----------
+        blocos : Iterable[bytes]
+            The consecutive blocks of the sequence (bytes-like objects; str blocks are encoded as latin-1).
+
+        Yields
+        ------
+        int
+            The starting position of each occurrence of the pattern in the whole sequence, in increasing order.
+
+        """
+
+        densa = self.tabelaDensa()
+        estado = densa.inicial
+        offset = 0
+        for bloco in blocos:
+            if isinstance(bloco, str): bloco = bloco.encode("latin-1")
+            fins, estado = densa.varrer(bloco, estado)
+            for fim in fins:
+                yield offset + fim - len(self.padrao) + 1
+            offset += len(bloco)
+
+
 if __name__ == "__main__":
     teste = Automata(('a', 'c', 'g', 't'), 'acc')
 
@@ -133,6 +268,7 @@ if __name__ == "__main__":
 
     posicoes_match = teste.posicoesMatch(sequencia)
     print(posicoes_match)
+    print(list(teste.iterMatchesBytes(sequencia.encode())))
 
     print("Metricas de Codigo:")
     print("\nMetrica cyclomatic complexity:")
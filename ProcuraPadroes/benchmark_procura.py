@@ -0,0 +1,117 @@
+"""
+Benchmark das variantes do Boyer-Moore
+
+Compara a procura de todas as ocorrências de um padrão com BoyerMoore.search (str),
+com o modo bytes (search_bytes) nas variantes Boyer-Moore, Horspool e Sunday, e com um
+ciclo de str.find (implementado em C, serve de referência), em sequências aleatórias
+de DNA e de proteína. Os padrões são retirados da própria sequência, pelo que ocorrem
+pelo menos uma vez; as sequências são geradas com uma seed fixa.
+
+Utilização:
+    python benchmark_procura.py [--n 1000000] [--comprimentos 4,16,64] [--json resultados.json]
+
+Com --json - o JSON vai para o stdout e a tabela para o stderr.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from BoyerMoore import BoyerMoore, VARIANTS
+
+ALFABETOS = {"dna": "ACGT", "proteina": "ACDEFGHIKLMNPQRSTVWY"}
+
+
+def procura_find(texto : str, padrao : str) -> list[int]:
+    """
+    Finds every (possibly overlapping) occurrence of a pattern with repeated calls to str.find.
+
+    Parameters
+    ----------
+    texto : str
+        The text.
+    padrao : str
+        The pattern.
+
+    Returns
+    -------
+    list[int]
+        The starting positions of the occurrences.
+    """
+
+    posicoes = []
+    i = texto.find(padrao)
+    while i != -1:
+        posicoes.append(i)
+        i = texto.find(padrao, i + 1)
+    return posicoes
+
+
+def benchmark(n : int, comprimentos : list[int]) -> list[dict]:
+    """
+    Times every search method for each alphabet and pattern length.
+
+    Parameters
+    ----------
+    n : int
+        Length of the sequences.
+    comprimentos : list[int]
+        The pattern lengths.
+
+    Returns
+    -------
+    list[dict]
+        One result per (alphabet, length, method), with the time in seconds and the number of occurrences.
+    """
+
+    resultados = []
+    for nome, alfabeto in ALFABETOS.items():
+        gerador = random.Random(42)
+        texto = "".join(gerador.choices(alfabeto, k=n))
+        dados = texto.encode("latin-1")
+        for m in comprimentos:
+            padrao = texto[n // 2:n // 2 + m]
+            bm = BoyerMoore(padrao)
+            metodos = {"str.find": lambda: procura_find(texto, padrao), "search (str)": lambda: bm.search(texto)}
+            for variante in VARIANTS:
+                metodos[f"bytes {variante}"] = lambda variante=variante: bm.search_bytes(dados, variante)
+
+            for metodo, procura in metodos.items():
+                inicio = time.perf_counter()
+                ocorrencias = len(procura())
+                resultados.append({"alfabeto": nome, "m": m, "metodo": metodo, "ocorrencias": ocorrencias,
+                                   "tempo": time.perf_counter() - inicio})
+    return resultados
+
+
+def main(argv : list[str] = None) -> None:
+    """
+    Parses the command line, runs the benchmark and prints (or writes) the results.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=1_000_000, help="length of the sequences")
+    parser.add_argument("--comprimentos", type=lambda s: [int(x) for x in s.split(",")], default=[4, 16, 64],
+                        help="comma-separated pattern lengths")
+    parser.add_argument("--json", help="write the results to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    resultados = benchmark(args.n, args.comprimentos)
+    # with --json - the JSON report takes stdout, so the table goes to stderr
+    tabela = sys.stderr if args.json == "-" else sys.stdout
+    print(f"{'alfabeto':>10} {'m':>4} {'metodo':>22} {'ocorrencias':>12} {'tempo (s)':>10}", file=tabela)
+    for r in resultados:
+        print(f"{r['alfabeto']:>10} {r['m']:>4} {r['metodo']:>22} {r['ocorrencias']:>12} {r['tempo']:>10.3f}",
+              file=tabela)
+
+    if args.json:
+        saida = {"n": args.n, "python": sys.version.split()[0], "resultados": resultados}
+        if args.json == "-": json.dump(saida, sys.stdout, indent=2)
+        else:
+            with open(args.json, "w") as ficheiro: json.dump(saida, ficheiro, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,524 @@
+"""
+Procura de padrões degenerados (códigos IUPAC) e expressões regulares com autómatos finitos
+
+O padrão é lido para uma árvore sintática, convertido num autómato não determinístico (NFA)
+pela construção de Thompson, determinizado pela construção de subconjuntos e minimizado pelo
+algoritmo de Hopcroft. O autómato mínimo é guardado numa TabelaDensa, pelo que a procura custa
+um acesso à tabela por base, tal como nos padrões literais da classe Automata.
+
+Baseado em:
+    K. Thompson, "Programming techniques: regular expression search algorithm", 1968.
+    J. Hopcroft, "An n log n algorithm for minimizing states in a finite automaton", 1971.
+    NC-IUB, "Nomenclature for incompletely specified bases in nucleic acid sequences", 1985.
+
+Sintaxe suportada: símbolos do alfabeto e códigos IUPAC, '.', classes [...] e [^...],
+grupos (...), alternativas |, e os quantificadores *, +, ?, {n}, {n,} e {n,m}.
+"""
+
+import subprocess
+from typing import Iterable, Iterator
+from tabela_densa import TabelaDensa
+
+IUPAC = {"A": "A", "C": "C", "G": "G", "T": "T", "U": "T", "R": "AG", "Y": "CT", "S": "CG", "W": "AT", "K": "GT",
+         "M": "AC", "B": "CGT", "D": "AGT", "H": "ACT", "V": "ACG", "N": "ACGT"}
+
+
+class AutomatoRegex:
+
+    """
+    This class compiles an IUPAC degenerate motif or a small regular expression into a minimal DFA that finds every
+    occurrence of the pattern in a sequence, with one table lookup per symbol.
+
+    Parameters
+    ----------
+    padrao : str
+        The motif or regular expression (for instance "TATAWAWR" or "GC(A|T){2,4}N?C").
+    alfabeto : str, optional
+        The symbols of the sequences. IUPAC codes stand for their bases that belong to the alphabet. Defaults to "ACGT".
+
+    Attributes
+    ----------
+    padrao : str
+        Stores the pattern.
+    alfabeto : list[str]
+        Stores the alphabet.
+    comprimento : int
+        The length of every match, or None if the pattern matches strings of different lengths.
+    num_estados : int
+        Number of states of the minimal DFA.
+    transicoes : dict[tuple[int, str], int]
+        The transition function of the minimal DFA (state 0 is the initial state).
+    finais : set[int]
+        The final states of the minimal DFA: the automaton is in one of them right after the end of an occurrence.
+    densa : TabelaDensa
+        The transition table used by the scans.
+
+    Raises
+    ------
+    ValueError
+        If the pattern is not valid or matches the empty string.
+
+    """
+
+    def __init__(self, padrao : str, alfabeto : str = "ACGT") -> None:
+
+        self.padrao = padrao
+        self.alfabeto = list(alfabeto)
+        self._posicao = 0
+        arvore = self._lerAlternativas()
+        if self._posicao != len(padrao):
+            raise ValueError(f"Unexpected '{padrao[self._posicao]}' at position {self._posicao} of {padrao}")
+
+        self.comprimento = self._comprimento(arvore)
+        estados, finais, inicial = self._construirDFA(*self._construirNFA(arvore))
+        self.num_estados, self.transicoes, self.finais = self._minimizar(estados, finais, inicial)
+        if 0 in self.finais:
+            raise ValueError(f"The pattern {padrao} matches the empty string")
+        self.densa = TabelaDensa(self.alfabeto, self.num_estados, self.transicoes, self.finais)
+
+
+    def _lerAlternativas(self) -> tuple:
+        """
+        Reads alternatives separated by '|' (the lowest precedence level of the grammar).
+
+        Returns
+        -------
+        tuple
+            The syntax tree node.
+        """
+
+        alternativas = [self._lerConcatenacao()]
+        while self._posicao < len(self.padrao) and self.padrao[self._posicao] == "|":
+            self._posicao += 1
+            alternativas.append(self._lerConcatenacao())
+        return alternativas[0] if len(alternativas) == 1 else ("alt", alternativas)
+
+
+    def _lerConcatenacao(self) -> tuple:
+        """
+        Reads a sequence of quantified atoms.
+
+        Returns
+        -------
+        tuple
+            The syntax tree node.
+        """
+
+        partes = []
+        while self._posicao < len(self.padrao) and self.padrao[self._posicao] not in "|)":
+            partes.append(self._lerQuantificador(self._lerAtomo()))
+        return partes[0] if len(partes) == 1 else ("concat", partes)
+
+
+    def _lerAtomo(self) -> tuple:
+        """
+        Reads a symbol, an IUPAC code, '.', a class [...] or a group (...).
+
+        Returns
+        -------
+        tuple
+            The syntax tree node.
+        """
+
+        c = self.padrao[self._posicao]
+        self._posicao += 1
+
+        if c == "(":
+            arvore = self._lerAlternativas()
+            if self._posicao >= len(self.padrao) or self.padrao[self._posicao] != ")":
+                raise ValueError(f"Missing ')' in {self.padrao}")
+            self._posicao += 1
+            return arvore
+        if c == "[":
+            fim = self.padrao.find("]", self._posicao)
+            if fim == -1: raise ValueError(f"Missing ']' in {self.padrao}")
+            conteudo = self.padrao[self._posicao:fim]
+            self._posicao = fim + 1
+            negada = conteudo.startswith("^")
+            simbolos = set()
+            for simbolo in conteudo[negada:]: simbolos |= self._simbolos(simbolo)
+            if negada: simbolos = set(self.alfabeto) - simbolos
+            return ("simbolos", frozenset(simbolos))
+        if c == ".":
+            return ("simbolos", frozenset(self.alfabeto))
+        if c in "*+?{})]|":
+            raise ValueError(f"Unexpected '{c}' at position {self._posicao - 1} of {self.padrao}")
+        return ("simbolos", frozenset(self._simbolos(c)))
+
+
+    def _simbolos(self, c : str) -> set[str]:
+        """
+        Returns the symbols of the alphabet that a character of the pattern stands for.
+
+        Parameters
+        ----------
+        c : str
+            A symbol of the alphabet or an IUPAC code.
+
+        Returns
+        -------
+        set[str]
+            The symbols matched by `c`.
+        """
+
+        if c in self.alfabeto: return {c}
+        if c.upper() in IUPAC:
+            return {base for base in IUPAC[c.upper()] if base in self.alfabeto}
+        raise ValueError(f"The symbol '{c}' of {self.padrao} is not in the alphabet nor an IUPAC code")
+
+
+    def _lerQuantificador(self, arvore : tuple) -> tuple:
+        """
+        Applies the quantifiers (*, +, ?, {n}, {n,}, {n,m}) that follow an atom.
+
+        Parameters
+        ----------
+        arvore : tuple
+            The syntax tree of the atom.
+
+        Returns
+        -------
+        tuple
+            The syntax tree node.
+        """
+
+        while self._posicao < len(self.padrao) and self.padrao[self._posicao] in "*+?{":
+            c = self.padrao[self._posicao]
+            self._posicao += 1
+            if c == "*": arvore = ("repetir", arvore, 0, None)
+            elif c == "+": arvore = ("repetir", arvore, 1, None)
+            elif c == "?": arvore = ("repetir", arvore, 0, 1)
+            else:
+                fim = self.padrao.find("}", self._posicao)
+                if fim == -1: raise ValueError(f"Missing '}}' in {self.padrao}")
+                limites = self.padrao[self._posicao:fim].split(",")
+                self._posicao = fim + 1
+                try:
+                    minimo = int(limites[0])
+                    maximo = minimo if len(limites) == 1 else (int(limites[1]) if limites[1] else None)
+                except ValueError:
+                    raise ValueError(f"Invalid repetition in {self.padrao}")
+                if len(limites) > 2 or (maximo is not None and maximo < minimo):
+                    raise ValueError(f"Invalid repetition in {self.padrao}")
+                arvore = ("repetir", arvore, minimo, maximo)
+        return arvore
+
+
+    def _comprimento(self, arvore : tuple) -> int:
+        """
+        Computes the length of the strings matched by a syntax tree, if they all have the same length.
+
+        Parameters
+        ----------
+        arvore : tuple
+            The syntax tree.
+
+        Returns
+        -------
+        int
+            The length, or None if it is not fixed.
+        """
+
+        if arvore[0] == "simbolos": return 1
+        if arvore[0] == "concat":
+            comprimentos = [self._comprimento(parte) for parte in arvore[1]]
+            return None if None in comprimentos else sum(comprimentos)
+        if arvore[0] == "alt":
+            comprimentos = {self._comprimento(parte) for parte in arvore[1]}
+            return comprimentos.pop() if len(comprimentos) == 1 else None
+        comprimento = self._comprimento(arvore[1])
+        if comprimento == 0: return 0
+        if comprimento is None or arvore[2] != arvore[3]: return None
+        return comprimento * arvore[2]
+
+
+    def _construirNFA(self, arvore : tuple) -> tuple[list, list, int, int]:
+        """
+        Builds the NFA of Σ* followed by the pattern with the construction of Thompson, so the NFA is in its final
+        state right after every occurrence of the pattern.
+
+        Parameters
+        ----------
+        arvore : tuple
+            The syntax tree of the pattern.
+
+        Returns
+        -------
+        tuple[list, list, int, int]
+            The epsilon transitions and the symbol transitions (pairs (symbols, state)) of each state,
+            the initial state and the final state.
+        """
+
+        epsilon, arestas = [], []
+
+        def novo() -> int:
+            epsilon.append([])
+            arestas.append([])
+            return len(epsilon) - 1
+
+        def fragmento(no : tuple) -> tuple[int, int]:
+            inicio, fim = novo(), novo()
+            if no[0] == "simbolos":
+                arestas[inicio].append((no[1], fim))
+            elif no[0] == "concat":
+                atual = inicio
+                for parte in no[1]:
+                    a, b = fragmento(parte)
+                    epsilon[atual].append(a)
+                    atual = b
+                epsilon[atual].append(fim)
+            elif no[0] == "alt":
+                for parte in no[1]:
+                    a, b = fragmento(parte)
+                    epsilon[inicio].append(a)
+                    epsilon[b].append(fim)
+            else:
+                _, sub, minimo, maximo = no
+                atual = inicio
+                for _ in range(minimo):
+                    a, b = fragmento(sub)
+                    epsilon[atual].append(a)
+                    atual = b
+                if maximo is None:
+                    a, b = fragmento(sub)
+                    epsilon[atual] += [a, fim]
+                    epsilon[b] += [a, fim]
+                else:
+                    for _ in range(maximo - minimo):
+                        a, b = fragmento(sub)
+                        epsilon[atual] += [a, fim]
+                        atual = b
+                    epsilon[atual].append(fim)
+            return inicio, fim
+
+        inicial = novo()
+        arestas[inicial].append((frozenset(self.alfabeto), inicial))
+        inicio, final = fragmento(arvore)
+        epsilon[inicial].append(inicio)
+        return epsilon, arestas, inicial, final
+
+
+    def _construirDFA(self, epsilon : list, arestas : list, inicial : int, final : int) -> tuple[dict, set, int]:
+        """
+        Determinizes the NFA with the subset construction: each DFA state is the epsilon closure of a set of NFA states.
+
+        Parameters
+        ----------
+        epsilon : list
+            The epsilon transitions of each NFA state.
+        arestas : list
+            The symbol transitions of each NFA state.
+        inicial : int
+            The initial NFA state.
+        final : int
+            The final NFA state.
+
+        Returns
+        -------
+        tuple[dict, set, int]
+            The transitions of the DFA (dict[tuple[int, str], int]), its final states and its initial state.
+        """
+
+        def fecho(estados : set[int]) -> frozenset[int]:
+            pilha = list(estados)
+            visitados = set(estados)
+            while pilha:
+                for proximo in epsilon[pilha.pop()]:
+                    if proximo not in visitados:
+                        visitados.add(proximo)
+                        pilha.append(proximo)
+            return frozenset(visitados)
+
+        inicio = fecho({inicial})
+        ids = {inicio: 0}
+        pendentes = [inicio]
+        transicoes = {}
+        while pendentes:
+            conjunto = pendentes.pop()
+            for c in self.alfabeto:
+                destino = fecho({b for estado in conjunto for simbolos, b in arestas[estado] if c in simbolos})
+                if destino not in ids:
+                    ids[destino] = len(ids)
+                    pendentes.append(destino)
+                transicoes[(ids[conjunto], c)] = ids[destino]
+
+        finais = {i for conjunto, i in ids.items() if final in conjunto}
+        return transicoes, finais, 0
+
+
+    def _minimizar(self, transicoes : dict, finais : set, inicial : int) -> tuple[int, dict, set]:
+        """
+        Minimizes the DFA with the algorithm of Hopcroft, in O(n |Σ| log n) time. The partition {final, non-final} is
+        refined with a worklist of splitters (block, symbol): the preimage of the splitter is grouped by the block of
+        each of its states, so only the blocks it touches are examined, and each block cut in two is replaced by the new
+        half. If (block, symbol) is still pending both halves are queued, otherwise only the smaller one.
+
+        Parameters
+        ----------
+        transicoes : dict[tuple[int, str], int]
+            The transitions of the DFA.
+        finais : set[int]
+            The final states.
+        inicial : int
+            The initial state.
+
+        Returns
+        -------
+        tuple[int, dict, set]
+            The number of states, the transitions and the final states of the minimal DFA, whose initial state is 0.
+        """
+
+        estados = {estado for estado, _ in transicoes} | {inicial}
+        inversas = {c: {} for c in self.alfabeto}
+        for (estado, c), destino in transicoes.items():
+            inversas[c].setdefault(destino, []).append(estado)
+
+        blocos = [set(bloco) for bloco in (finais, estados - finais) if bloco]
+        bloco_de = {estado: i for i, bloco in enumerate(blocos) for estado in bloco}
+        menor = min(range(len(blocos)), key=lambda i: len(blocos[i]))
+        trabalho = {(menor, c) for c in self.alfabeto}
+
+        while trabalho:
+            divisor, c = trabalho.pop()
+            tocados = {}
+            for destino in blocos[divisor]:
+                for origem in inversas[c].get(destino, ()):
+                    tocados.setdefault(bloco_de[origem], []).append(origem)
+
+            for bloco, dentro in tocados.items():
+                if len(dentro) == len(blocos[bloco]): continue
+                novo = len(blocos)
+                blocos.append(set(dentro))
+                blocos[bloco].difference_update(dentro)
+                for estado in dentro: bloco_de[estado] = novo
+                for d in self.alfabeto:
+                    if (bloco, d) in trabalho or len(blocos[novo]) <= len(blocos[bloco]):
+                        trabalho.add((novo, d))
+                    else:
+                        trabalho.add((bloco, d))
+
+        ordem = [bloco_de[inicial]] + [i for i in range(len(blocos)) if i != bloco_de[inicial]]
+        numero = {bloco: i for i, bloco in enumerate(ordem)}
+        classe = {estado: numero[bloco] for estado, bloco in bloco_de.items()}
+        minimas = {(classe[estado], c): classe[destino] for (estado, c), destino in transicoes.items()}
+        return len(blocos), minimas, {classe[estado] for estado in finais}
+
+
+    def iterFins(self, dados : bytes) -> Iterator[int]:
+        """
+        Scans a bytes buffer and yields the end of every occurrence of the pattern (the position after its last symbol).
+
+        Parameters
+        ----------
+        dados : bytes
+            The sequence, as bytes.
+
+        Yields
+        ------
+        int
+            The end positions of the occurrences, in increasing order.
+
+        """
+
+        fins, _ = self.densa.varrer(dados)
+        for fim in fins:
+            yield fim + 1
+
+
+    def iterMatchesBytes(self, dados : bytes) -> Iterator[int]:
+        """
+        Scans a bytes buffer and yields the starting position of every occurrence of a fixed-length pattern
+        (such as an IUPAC motif).
+
+        Parameters
+        ----------
+        dados : bytes
+            The sequence, as bytes.
+
+        Yields
+        ------
+        int
+            The starting positions of the occurrences, in increasing order.
+
+        Raises
+        ------
+        ValueError
+            If the pattern matches strings of different lengths (use iterFins instead).
+
+        """
+
+        if self.comprimento is None:
+            raise ValueError(f"The pattern {self.padrao} has no fixed length, use iterFins")
+        for fim in self.iterFins(dados):
+            yield fim - self.comprimento
+
+
+    def iterMatchesStream(self, blocos : Iterable[bytes]) -> Iterator[int]:
+        """
+        Scans a sequence given as consecutive blocks, carrying the state of the automaton between blocks
+        (see Automata.iterMatchesStream), and yields the absolute starting positions of a fixed-length pattern.
+
+        Parameters
+        ----------
+        blocos : Iterable[bytes]
+            The consecutive blocks of the sequence.
+
+        Yields
+        ------
+        int
+            The starting positions of the occurrences in the whole sequence, in increasing order.
+
+        Raises
+        ------
+        ValueError
+            If the pattern matches strings of different lengths.
+
+        """
+
+        if self.comprimento is None:
+            raise ValueError(f"The pattern {self.padrao} has no fixed length")
+        estado = self.densa.inicial
+        offset = 0
+        for bloco in blocos:
+            if isinstance(bloco, str): bloco = bloco.encode("latin-1")
+            fins, estado = self.densa.varrer(bloco, estado)
+            for fim in fins:
+                yield offset + fim + 1 - self.comprimento
+            offset += len(bloco)
+
+
+    def posicoesMatch(self, sequencia : str) -> list[int]:
+        """
+        Identifies the starting positions of a fixed-length pattern in the sequence.
+
+        Parameters
+        ----------
+        sequencia : str
+            The sequence in which to search for the pattern.
+
+        Returns
+        -------
+        list[int]
+            The starting positions of the occurrences. If the pattern is not found, returns an empty list.
+
+        """
+
+        return list(self.iterMatchesBytes(sequencia.encode("latin-1")))
+
+
+if __name__ == "__main__":
+    teste = AutomatoRegex("TATAWAWR")
+    print(f"{teste.padrao}: {teste.num_estados} states, matches of length {teste.comprimento}")
+    sequencia = "GCTATAAATAGGCTATATAAGTATATATG"
+    print(teste.posicoesMatch(sequencia))
+
+    teste = AutomatoRegex("GC(A|T){2,4}N?C")
+    print(f"{teste.padrao}: {teste.num_estados} states, ends: {list(teste.iterFins(b'GCAATCCGCTTTTGC'))}")
+
+    print("Metricas de Codigo:")
+    print("\nMetrica cyclomatic complexity:")
+    print(subprocess.call(["radon","cc","ProcuraPadroes/expressoes_regulares.py", "-s"]))
+    print("\nMetrica maintainability index:")
+    print(subprocess.call(["radon","mi","ProcuraPadroes/expressoes_regulares.py", "-s"]))
+    print("\nMetrica raw:")
+    print(subprocess.call(["radon","raw","ProcuraPadroes/expressoes_regulares.py", "-s"]))
@@ -0,0 +1,212 @@
+"""
+Procura paralela de padrões em sequências longas
+
+O texto é copiado uma única vez para memória partilhada e dividido em segmentos consecutivos,
+cada um estendido com os m - 1 símbolos seguintes (m = comprimento do padrão), de forma a que
+as ocorrências que atravessam a fronteira entre dois segmentos sejam encontradas. Cada segmento
+é procurado por um processo do pool, que lê o texto diretamente da memória partilhada; cada
+ocorrência pertence ao segmento onde começa, pelo que as posições dos vários segmentos são
+juntadas por ordem e sem repetições.
+
+Funciona com os matchers Automata, AutomatoRegex (padrões de comprimento fixo) e BoyerMoore.
+"""
+
+import subprocess
+import os
+from multiprocessing import Pool, shared_memory
+
+_matcher = None
+_memoria = None
+
+
+def comprimentoPadrao(matcher) -> int:
+    """
+    Returns the length of the occurrences found by a matcher, which sets the overlap between segments.
+
+    Parameters
+    ----------
+    matcher : Automata | AutomatoRegex | BoyerMoore
+        The matcher.
+
+    Returns
+    -------
+    int
+        The length of the pattern.
+
+    Raises
+    ------
+    ValueError
+        If the matcher finds occurrences of different lengths.
+
+    """
+
+    if hasattr(matcher, "comprimento"):
+        if matcher.comprimento is None:
+            raise ValueError(f"The pattern {matcher.padrao} has no fixed length")
+        return matcher.comprimento
+    if hasattr(matcher, "pattern_length"): return matcher.pattern_length
+    return len(matcher.padrao)
+
+
+def procurarSegmento(matcher, dados : bytes) -> list[int]:
+    """
+    Searches a buffer with any of the supported matchers: the automata scan the bytes with their dense table,
+    BoyerMoore uses its bytes search mode.
+
+    Parameters
+    ----------
+    matcher : Automata | AutomatoRegex | BoyerMoore
+        The matcher.
+    dados : bytes
+        The buffer (bytes-like).
+
+    Returns
+    -------
+    list[int]
+        The starting positions of the occurrences in the buffer, in increasing order.
+
+    """
+
+    if hasattr(matcher, "iterMatchesBytes"): return list(matcher.iterMatchesBytes(dados))
+    return matcher.search_bytes(dados)
+
+
+def _iniciar(matcher, nome : str) -> None:
+    """
+    Initializes a process of the pool: keeps the matcher and attaches the shared memory holding the text.
+
+    Parameters
+    ----------
+    matcher : Automata | AutomatoRegex | BoyerMoore
+        The matcher.
+    nome : str
+        The name of the shared memory block.
+
+    Returns
+    -------
+    None
+
+    """
+
+    global _matcher, _memoria
+    _matcher = matcher
+    _memoria = shared_memory.SharedMemory(name=nome)
+
+
+def _procurar(segmento : tuple[int, int, int]) -> list[int]:
+    """
+    Searches one segment of the shared text, in a process of the pool.
+
+    Parameters
+    ----------
+    segmento : tuple[int, int, int]
+        The start of the segment, its end and the end of the segment extended by the overlap.
+
+    Returns
+    -------
+    list[int]
+        The absolute positions of the occurrences that start in the segment.
+
+    """
+
+    inicio, fim, fim_estendido = segmento
+    dados = _memoria.buf[inicio:fim_estendido]
+    try:
+        return [inicio + p for p in procurarSegmento(_matcher, dados) if inicio + p < fim]
+    finally:
+        dados.release()
+
+
+def segmentos(n : int, m : int, tamanho_segmento : int) -> list[tuple[int, int, int]]:
+    """
+    Splits a text of length n into consecutive segments, each extended by the m - 1 symbols that follow it.
+
+    Parameters
+    ----------
+    n : int
+        The length of the text.
+    m : int
+        The length of the pattern.
+    tamanho_segmento : int
+        The length of each segment (without the overlap).
+
+    Returns
+    -------
+    list[tuple[int, int, int]]
+        The start, the end and the extended end of each segment.
+
+    """
+
+    assert tamanho_segmento > 0, "The segment size must be positive"
+
+    return [(inicio, min(inicio + tamanho_segmento, n), min(inicio + tamanho_segmento + m - 1, n))
+            for inicio in range(0, n, tamanho_segmento)]
+
+
+def procuraParalela(matcher, texto : str | bytes, processos : int = None, tamanho_segmento : int = None) -> list[int]:
+    """
+    Finds every occurrence of the pattern of a matcher in a long text, searching overlapping segments in parallel.
+
+    Parameters
+    ----------
+    matcher : Automata | AutomatoRegex | BoyerMoore
+        The matcher of the pattern.
+    texto : str | bytes
+        The text (str is encoded as latin-1).
+    processos : int, optional
+        Number of processes. Defaults to the number of CPUs. With one process, the text is searched in this process.
+    tamanho_segmento : int, optional
+        Length of each segment. Defaults to splitting the text into four segments per process.
+
+    Returns
+    -------
+    list[int]
+        The starting positions of the occurrences, in increasing order and without repetitions.
+
+    """
+
+    if isinstance(texto, str): texto = texto.encode("latin-1")
+    processos = processos or os.cpu_count() or 1
+    m = comprimentoPadrao(matcher)
+    n = len(texto)
+    if processos == 1 or n <= m:
+        return procurarSegmento(matcher, texto)
+
+    if tamanho_segmento is None: tamanho_segmento = max(m, -(-n // (4 * processos)))
+    if hasattr(matcher, "tabelaDensa"): matcher.tabelaDensa()
+
+    memoria = shared_memory.SharedMemory(create=True, size=n)
+    try:
+        memoria.buf[:n] = texto
+        with Pool(processos, initializer=_iniciar, initargs=(matcher, memoria.name)) as pool:
+            posicoes = []
+            for parte in pool.imap(_procurar, segmentos(n, m, tamanho_segmento)):
+                posicoes += parte
+        return posicoes
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    from automatos_finitos import Automata
+    from BoyerMoore import BoyerMoore
+
+    random.seed(0)
+    sequencia = "".join(random.choice("ACGT") for _ in range(2_000_000))
+    for matcher in (Automata("ACGT", "GATTACA"), BoyerMoore("GATTACA")):
+        for processos in (1, max(2, os.cpu_count() or 1)):
+            inicio = time.perf_counter()
+            posicoes = procuraParalela(matcher, sequencia, processos)
+            print(f"{type(matcher).__name__}, {processos} processes: {len(posicoes)} matches in "
+                  f"{time.perf_counter() - inicio:.2f} s")
+
+    print("Metricas de Codigo:")
+    print("\nMetrica cyclomatic complexity:")
+    print(subprocess.call(["radon","cc","ProcuraPadroes/procura_paralela.py", "-s"]))
+    print("\nMetrica maintainability index:")
+    print(subprocess.call(["radon","mi","ProcuraPadroes/procura_paralela.py", "-s"]))
+    print("\nMetrica raw:")
+    print(subprocess.call(["radon","raw","ProcuraPadroes/procura_paralela.py", "-s"]))
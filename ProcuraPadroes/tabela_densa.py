@@ -0,0 +1,125 @@
+"""
+Tabela de transições densa para autómatos finitos determinísticos (DFA)
+
+A tabela é guardada num único array('I'), indexado por estado * |Σ'| + código do símbolo,
+em que Σ' é o alfabeto mais uma coluna para os símbolos que não lhe pertencem. O texto é
+lido como bytes e convertido nos códigos dos símbolos com bytes.translate, pelo que cada
+símbolo custa uma soma e um acesso à tabela, sem criar tuplos nem calcular hashes.
+
+As entradas da tabela guardam o próximo estado já multiplicado por |Σ'| e os estados finais
+são numerados depois de todos os outros, de forma a que o teste de aceitação seja uma única
+comparação com um limiar. É usada pela classe Automata (modo compacto) e pelos autómatos
+construídos a partir de expressões regulares.
+"""
+
+import subprocess
+from array import array
+
+
+class TabelaDensa:
+
+    """
+    This class stores the transition function of a DFA in a flat array and scans bytes with it, reporting the
+    positions where the automaton reaches a final state.
+
+    Parameters
+    ----------
+    alfabeto : list[str]
+        The symbols of the automaton. They must be single-byte characters (latin-1).
+    num_estados : int
+        Number of states, numbered from 0 to num_estados - 1.
+    transicoes : dict[tuple[int, str], int]
+        The transition function. Missing transitions (and every symbol outside the alphabet) go to the initial state.
+    finais : set[int]
+        The final states.
+    inicial : int, optional
+        The initial state. Defaults to 0.
+
+    Attributes
+    ----------
+    sigma : int
+        Number of columns of the table (the size of the alphabet plus one column for the other symbols).
+    tabela : array
+        The transition table: tabela[interno[estado] * sigma + codigo] is interno[proximo] * sigma.
+    traducao : bytes
+        Maps every byte to the code of its symbol (sigma - 1 for bytes outside the alphabet).
+    interno : list[int]
+        The number of each state in the table (the final states are numbered last).
+    externo : list[int]
+        The inverse of `interno`.
+    limiar : int
+        interno[estado] * sigma is at least `limiar` exactly when the state is final.
+
+    """
+
+    def __init__(self, alfabeto : list[str], num_estados : int, transicoes : dict[tuple[int, str], int],
+                 finais : set[int], inicial : int = 0) -> None:
+
+        assert all(len(c) == 1 and ord(c) < 256 for c in alfabeto), "The symbols must be single-byte characters"
+
+        self.alfabeto = list(alfabeto)
+        self.sigma = len(self.alfabeto) + 1
+        codigos = {c: i for i, c in enumerate(self.alfabeto)}
+
+        self.externo = [e for e in range(num_estados) if e not in finais] + sorted(finais)
+        self.interno = [0] * num_estados
+        for i, e in enumerate(self.externo): self.interno[e] = i
+        self.limiar = (num_estados - len(finais)) * self.sigma
+        self.inicial = inicial
+
+        reinicio = self.interno[inicial] * self.sigma
+        self.tabela = array('I', [reinicio]) * (num_estados * self.sigma)
+        for (estado, caracter), proximo in transicoes.items():
+            self.tabela[self.interno[estado] * self.sigma + codigos[caracter]] = self.interno[proximo] * self.sigma
+
+        traducao = bytearray([self.sigma - 1]) * 256
+        for c, i in codigos.items(): traducao[ord(c)] = i
+        self.traducao = bytes(traducao)
+
+
+    def varrer(self, dados : bytes, estado : int = None) -> tuple[list[int], int]:
+        """
+        Runs the automaton over a buffer and returns the positions where it is in a final state.
+
+        Parameters
+        ----------
+        dados : bytes
+            The data to scan (bytes, bytearray or any other bytes-like object).
+        estado : int, optional
+            The state in which the scan starts, so a long input can be scanned in pieces. Defaults to the initial state.
+
+        Returns
+        -------
+        tuple[list[int], int]
+            The positions of `dados` (indices of the last symbol read) where the automaton is in a final state,
+            and the state at the end of the buffer.
+
+        """
+
+        if not isinstance(dados, (bytes, bytearray)): dados = bytes(dados)
+        if estado is None: estado = self.inicial
+
+        tabela = self.tabela.tolist()
+        limiar = self.limiar
+        e = self.interno[estado] * self.sigma
+        fins = []
+        for i, c in enumerate(dados.translate(self.traducao)):
+            e = tabela[e + c]
+            if e >= limiar: fins.append(i)
+        return fins, self.externo[e // self.sigma]
+
+
+if __name__ == "__main__":
+    # DFA over {a, c} that accepts the strings ending in "ac"
+    transicoes = {(0, 'a'): 1, (0, 'c'): 0, (1, 'a'): 1, (1, 'c'): 2, (2, 'a'): 1, (2, 'c'): 0}
+    tabela = TabelaDensa(['a', 'c'], 3, transicoes, {2})
+    print(list(tabela.tabela))
+    print(tabela.varrer(b"acacxac"))
+
+    print("Metricas de Codigo:")
+    print("\nMetrica cyclomatic complexity:")
+    print(subprocess.call(["radon","cc","ProcuraPadroes/tabela_densa.py", "-s"]))
+    print("\nMetrica maintainability index:")
+    print(subprocess.call(["radon","mi","ProcuraPadroes/tabela_densa.py", "-s"]))
+    print("\nMetrica raw:")
+    print(subprocess.call(["radon","raw","ProcuraPadroes/tabela_densa.py", "-s"]))
@@ -0,0 +1,54 @@
+import unittest
+import random
+from aho_corasick import AhoCorasick
+
+
+class TestAhoCorasick(unittest.TestCase):
+    """
+    Test case class for the AhoCorasick class.
+
+    Attributes:
+        padroes (list): The patterns searched by the automaton.
+        automato (AhoCorasick): An instance of the AhoCorasick class built over the patterns.
+
+    Methods:
+        test_ligacoes: Tests the failure and output links.
+        test_posicoes_match: Tests the occurrences found in a sequence, including overlapping ones.
+        test_nenhum_match: Tests the behavior when no pattern occurs in a sequence.
+        test_padroes_repetidos: Tests that repeated patterns are reported with each of their ids.
+        test_aleatorio: Compares the occurrences with a naive search on random DNA.
+    """
+
+    def setUp(self):
+        self.padroes = ['he', 'she', 'his', 'hers']
+        self.automato = AhoCorasick(self.padroes)
+
+    def test_ligacoes(self):
+        estado_she = self.automato.goto[self.automato.goto[self.automato.goto[0]['s']]['h']]['e']
+        estado_he = self.automato.goto[self.automato.goto[0]['h']]['e']
+        self.assertEqual(self.automato.falha[estado_she], estado_he)
+        self.assertEqual(self.automato.ligacao_saida[estado_she], estado_he)
+        self.assertEqual(self.automato.saida[estado_he], [0])
+
+    def test_posicoes_match(self):
+        self.assertEqual(self.automato.posicoesMatch('ushers'), [(1, 1), (2, 0), (2, 3)])
+        self.assertEqual(AhoCorasick(['aa', 'a']).posicoesMatch('aaa'), [(0, 0), (0, 1), (1, 0), (1, 1), (2, 1)])
+
+    def test_nenhum_match(self):
+        self.assertEqual(self.automato.posicoesMatch('xyz'), [])
+        self.assertEqual(AhoCorasick([]).posicoesMatch('abc'), [])
+
+    def test_padroes_repetidos(self):
+        self.assertEqual(AhoCorasick(['ac', 'ac']).posicoesMatch('cacac'), [(1, 0), (1, 1), (3, 0), (3, 1)])
+
+    def test_aleatorio(self):
+        random.seed(1)
+        padroes = ["".join(random.choice("ACGT") for _ in range(random.randint(1, 6))) for _ in range(200)]
+        sequencia = "".join(random.choice("ACGTN") for _ in range(2000))
+        expected = sorted((i, id_padrao) for id_padrao, padrao in enumerate(padroes)
+                          for i in range(len(sequencia)) if sequencia.startswith(padrao, i))
+        self.assertEqual(AhoCorasick(padroes).posicoesMatch(sequencia), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
-from automatos_finitos import Automata
+import random
+import os
+import tempfile
+from automatos_finitos import Automata, lerBlocos
 
 
 class TestAutomata(unittest.TestCase):
@@ -15,6 +18,12 @@ class TestAutomata(unittest.TestCase):
         test_tabela_transicoes: Tests the correctness of the transition table construction.
         test_aplica_automato: Tests the application of the automaton on a sequence.
         test_posicoes_match: Tests the identification of pattern positions in a sequence.
+        test_match_sobreposto: Tests that overlapping occurrences of the pattern are found.
+        test_aleatorio: Compares the positions found with a naive search on random sequences.
+        test_tabela_densa: Tests that the dense transition table matches the dictionary.
+        test_match_bytes: Tests the scan of bytes with the dense transition table.
+        test_match_stream: Tests the scan of a sequence split in blocks, with matches across block boundaries.
+        test_match_ficheiro: Tests the scan of a file read in blocks.
         test_nenhum_match: Tests the behavior when no matches are found in a sequence.
     """
     
@@ -30,7 +39,9 @@ class TestAutomata(unittest.TestCase):
             (1, 'a'): 1,
             (1, 'c'): 2,
             (2,'a'):  3,
-            (2, 'c'): 0}
+            (2, 'c'): 0,
+            (3, 'a'): 1,
+            (3, 'c'): 2}
         self.assertDictEqual(self.automata.transicoes, expected_transitions)
 
     def test_aplica_automato(self):
@@ -43,6 +54,53 @@ class TestAutomata(unittest.TestCase):
         expected_positions = [1, 4]
         self.assertEqual(self.automata.posicoesMatch(sequencia), expected_positions)
         
+    def test_match_sobreposto(self):
+        self.assertEqual(self.automata.posicoesMatch('acacaca'), [0, 2, 4])
+        automata = Automata(['a', 'b'], 'aabaa')
+        self.assertEqual(automata.funcaoPrefixo(), [0, 1, 0, 1, 2])
+        self.assertEqual(automata.posicoesMatch('aabaabaabaa'), [0, 3, 6])
+
+    def test_aleatorio(self):
+        random.seed(0)
+        for _ in range(200):
+            padrao = ''.join(random.choice('ab') for _ in range(random.randint(1, 6)))
+            sequencia = ''.join(random.choice('ab') for _ in range(60))
+            expected_positions = [i for i in range(len(sequencia)) if sequencia.startswith(padrao, i)]
+            self.assertEqual(Automata(['a', 'b'], padrao).posicoesMatch(sequencia), expected_positions)
+
+    def test_tabela_densa(self):
+        densa = self.automata.tabelaDensa()
+        for (estado, caracter), proximo in self.automata.transicoes.items():
+            codigo = self.alfabeto.index(caracter)
+            self.assertEqual(densa.externo[densa.tabela[densa.interno[estado] * densa.sigma + codigo] // densa.sigma], proximo)
+
+    def test_match_bytes(self):
+        self.assertEqual(list(self.automata.iterMatchesBytes(b'cacaacaa')), [1, 4])
+        self.assertEqual(list(self.automata.iterMatchesBytes(bytearray(b'acacaxaca'))), [0, 2, 6])
+        random.seed(2)
+        automata = Automata(['a', 'c', 'g', 't'], 'acag')
+        sequencia = ''.join(random.choice('acgtn') for _ in range(5000))
+        self.assertEqual(list(automata.iterMatchesBytes(sequencia.encode())),
+                         [i for i in range(len(sequencia)) if sequencia.startswith('acag', i)])
+
+    def test_match_stream(self):
+        random.seed(3)
+        automata = Automata(['a', 'c', 'g', 't'], 'acaca')
+        sequencia = ''.join(random.choice('ac') for _ in range(3000))
+        expected_positions = [i for i in range(len(sequencia)) if sequencia.startswith('acaca', i)]
+        for tamanho in [1, 2, 7, 1000, 5000]:
+            blocos = (sequencia[i:i + tamanho].encode() for i in range(0, len(sequencia), tamanho))
+            self.assertEqual(list(automata.iterMatchesStream(blocos)), expected_positions)
+        self.assertEqual(list(automata.iterMatchesStream(['ac', 'a', '', 'cag'])), [0])
+
+    def test_match_ficheiro(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, 'sequencia.txt')
+            sequencia = 'cacaacaa' * 100
+            with open(caminho, 'w') as ficheiro: ficheiro.write(sequencia)
+            self.assertEqual(list(self.automata.iterMatchesStream(lerBlocos(caminho, 5))),
+                             [i for i in range(len(sequencia)) if sequencia.startswith(self.padrao, i)])
+
     def test_nenhum_match(self):
         sequencia = 'accccc'
         expected_positions = []
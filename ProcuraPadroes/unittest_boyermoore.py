@@ -1,5 +1,7 @@
+import itertools
+import random
 import unittest
-from BoyerMoore import BoyerMoore  
+from BoyerMoore import BoyerMoore, PatternCache, PATTERN_CACHE, VARIANTS
 
 
 class TestBoyerMoore(unittest.TestCase):
@@ -13,10 +15,73 @@ class TestBoyerMoore(unittest.TestCase):
         expected_table = {'a': 2, 'n': 1}
         self.assertEqual(self.bm.bad_character_rule, expected_table, "Bad character table does not match expected.")
 
+    def test_create_good_suffix_table(self):
+        self.assertEqual(self.bm.good_suffix_rule, [2, 2, 2, 1])
+        self.assertEqual(BoyerMoore("aa").good_suffix_rule, [1, 1, 2])
+
+    def test_good_suffix_table_brute_force(self):
+        def brute_force(pattern):
+            m = len(pattern)
+            table = []
+            for t in range(m + 1):
+                for shift in range(1, m + 1):
+                    suffix = all(k < shift or pattern[k - shift] == pattern[k] for k in range(t, m))
+                    if suffix and (t < 1 or t - 1 < shift or pattern[t - 1 - shift] != pattern[t - 1]):
+                        break
+                table.append(shift)
+            return table
+
+        for m in range(1, 9):
+            for pattern in map("".join, itertools.product("ab", repeat=m)):
+                self.assertEqual(BoyerMoore(pattern).good_suffix_rule, brute_force(pattern), pattern)
+
+    def test_suffix_lengths(self):
+        self.assertEqual(BoyerMoore("abaab").suffix_lengths(), [0, 2, 0, 0, 5])
+        self.assertEqual(BoyerMoore("aaa").suffix_lengths(), [1, 2, 3])
+
     def test_search(self):
-        expected_positions = [1]
+        expected_positions = [1, 3]
         positions = self.bm.search(self.text)
         self.assertEqual(positions, expected_positions, "Search did not find the correct pattern positions.")
+        self.assertEqual(BoyerMoore("aa").search("aaaa"), [0, 1, 2], "Overlapping occurrences were skipped.")
+
+    def test_create_byte_tables(self):
+        tables = self.bm.create_byte_tables()
+        self.assertEqual((tables["bad_character"][ord('a')], tables["bad_character"][ord('n')]), (2, 1))
+        self.assertEqual((tables["horspool"][ord('a')], tables["horspool"][ord('n')], tables["horspool"][0]), (2, 1, 3))
+        self.assertEqual((tables["sunday"][ord('a')], tables["sunday"][ord('n')], tables["sunday"][0]), (1, 2, 4))
+
+    def test_search_bytes(self):
+        random.seed(5)
+        for alphabet in ("ACGT", "ACDEFGHIKLMNPQRSTVWY"):
+            text = "".join(random.choice(alphabet) for _ in range(3000))
+            for m in (1, 2, 5):
+                pattern = text[1000:1000 + m]
+                bm = BoyerMoore(pattern)
+                expected = bm.search(text)
+                for variant in VARIANTS:
+                    self.assertEqual(bm.search_bytes(text.encode(), variant), expected, (pattern, variant))
+        self.assertEqual(BoyerMoore("aa").search_bytes(memoryview(b"aaaa"), "sunday"), [0, 1, 2])
+        with self.assertRaises(ValueError):
+            self.bm.search_bytes(b"bananarama", "kmp")
+
+    def test_pattern_cache(self):
+        self.assertIn("ana", PATTERN_CACHE)
+        self.assertIs(BoyerMoore("ana").good_suffix_rule, self.bm.good_suffix_rule)
+        self.bm.search_bytes(b"bananarama")
+        self.assertIs(BoyerMoore("ana").byte_tables, self.bm.byte_tables)
+
+        cache = PatternCache(max_patterns=2, max_symbols=6)
+        cache.put("ab", {})
+        cache.put("cd", {})
+        cache.get("ab")
+        cache.put("ef", {})
+        self.assertEqual(("ab" in cache, "cd" in cache, "ef" in cache), (True, False, True))
+        cache.put("ghijk", {})
+        self.assertEqual(len(cache), 1)
+        cache.put("toolong", {})
+        self.assertNotIn("toolong", cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
 
 
 if __name__ == '__main__':
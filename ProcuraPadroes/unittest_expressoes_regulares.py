@@ -0,0 +1,87 @@
+import random
+import re
+import unittest
+from expressoes_regulares import AutomatoRegex, IUPAC
+
+
+class TestAutomatoRegex(unittest.TestCase):
+    """
+    Test case class for the AutomatoRegex class.
+
+    Attributes:
+        sequencia (str): A random DNA sequence.
+
+    Methods:
+        test_literal: Tests that a literal pattern gives the minimal automaton of m + 1 states and overlapping matches.
+        test_iupac: Tests IUPAC motifs against the re module on a random sequence.
+        test_regex: Tests the end positions of variable-length patterns against a brute-force search.
+        test_minimizacao: Tests the number of states of the minimal DFA against Moore's partition refinement.
+        test_stream: Tests that a scan in blocks finds the same occurrences as a single scan.
+        test_comprimento: Tests the length computed for fixed and variable-length patterns.
+        test_erros: Tests that invalid patterns raise ValueError.
+    """
+
+    def setUp(self):
+        random.seed(7)
+        self.sequencia = "".join(random.choice("ACGT") for _ in range(3000))
+
+    def _regex(self, padrao):
+        return re.sub("[A-Z]", lambda m: m.group() if len(IUPAC[m.group()]) == 1 else f"[{IUPAC[m.group()]}]", padrao)
+
+    def test_literal(self):
+        automato = AutomatoRegex("ACA")
+        self.assertEqual(automato.num_estados, 4)
+        self.assertEqual(automato.posicoesMatch("CACACAAC"), [1, 3])
+
+    def test_iupac(self):
+        for padrao in ["TATAWAWR", "GANTC", "RYN", "SSW", "AC.T", "G[AC]NNB"]:
+            automato = AutomatoRegex(padrao)
+            esperado = [m.start() for m in re.finditer(f"(?=({self._regex(padrao)}))", self.sequencia)]
+            self.assertEqual(automato.posicoesMatch(self.sequencia), esperado, padrao)
+
+    def test_regex(self):
+        sequencia = self.sequencia[:400]
+        for padrao in ["GC(A|T){2,4}N?C", "A+C", "(AC|GT)*TT", "T[^A]{1,}G", "C(GA){2,}T", "(A|CG)?T{2,3}"]:
+            automato = AutomatoRegex(padrao)
+            expressao = re.compile(self._regex(padrao))
+            esperado = [fim for fim in range(1, len(sequencia) + 1)
+                        if any(expressao.fullmatch(sequencia, inicio, fim) for inicio in range(fim))]
+            self.assertEqual(list(automato.iterFins(sequencia.encode())), esperado, padrao)
+
+    def test_minimizacao(self):
+        for padrao in ["TATAWAWR", "GC(A|T){2,4}N?C", "(AC|GT)*TT", "R{3,9}Y", "NNNNNGG"]:
+            automato = AutomatoRegex(padrao)
+            automato._posicao = 0
+            transicoes, finais, _ = automato._construirDFA(*automato._construirNFA(automato._lerAlternativas()))
+
+            classes = {estado: int(estado in finais) for estado, _ in transicoes}
+            while True:
+                assinaturas = {estado: (classes[estado],) + tuple(classes[transicoes[(estado, c)]] for c in "ACGT")
+                               for estado in classes}
+                numeros = {assinatura: i for i, assinatura in enumerate(set(assinaturas.values()))}
+                novas = {estado: numeros[assinatura] for estado, assinatura in assinaturas.items()}
+                if len(numeros) == len(set(classes.values())): break
+                classes = novas
+            self.assertEqual(automato.num_estados, len(numeros), padrao)
+
+    def test_stream(self):
+        automato = AutomatoRegex("TATAWAWR")
+        dados = self.sequencia.encode()
+        blocos = [dados[i:i + 17] for i in range(0, len(dados), 17)]
+        self.assertEqual(list(automato.iterMatchesStream(blocos)), list(automato.iterMatchesBytes(dados)))
+
+    def test_comprimento(self):
+        self.assertEqual(AutomatoRegex("GANTC").comprimento, 5)
+        self.assertEqual(AutomatoRegex("(AC|GT){3}").comprimento, 6)
+        self.assertIsNone(AutomatoRegex("A(C|GT)").comprimento)
+        with self.assertRaises(ValueError):
+            AutomatoRegex("A+C").posicoesMatch("AAC")
+
+    def test_erros(self):
+        for padrao in ["", "A*", "(AC", "A]", "*A", "A{3,1}", "AXC", "A{2"]:
+            with self.assertRaises(ValueError, msg=padrao):
+                AutomatoRegex(padrao)
+
+
+if __name__ == '__main__':
+    unittest.main()
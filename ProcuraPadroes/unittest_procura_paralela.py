@@ -0,0 +1,52 @@
+import random
+import unittest
+from automatos_finitos import Automata
+from BoyerMoore import BoyerMoore
+from expressoes_regulares import AutomatoRegex
+from procura_paralela import procuraParalela, segmentos
+
+
+class TestProcuraParalela(unittest.TestCase):
+    """
+    Test case class for the parallel search driver.
+
+    Attributes:
+        sequencia (str): A random DNA sequence.
+
+    Methods:
+        test_segmentos: Tests that the segments cover the text and overlap by m - 1 symbols.
+        test_automata: Tests the parallel search with Automata against the sequential search.
+        test_boyermoore: Tests the parallel search with BoyerMoore against the sequential search.
+        test_regex: Tests the parallel search with an IUPAC motif.
+        test_fronteiras: Tests overlapping occurrences that cross every segment boundary, without repetitions.
+    """
+
+    def setUp(self):
+        random.seed(3)
+        self.sequencia = "".join(random.choice("ACGT") for _ in range(5000))
+
+    def test_segmentos(self):
+        self.assertEqual(segmentos(10, 3, 4), [(0, 4, 6), (4, 8, 10), (8, 10, 10)])
+
+    def test_automata(self):
+        automato = Automata("ACGT", "ACA")
+        esperado = automato.posicoesMatch(self.sequencia)
+        self.assertEqual(procuraParalela(automato, self.sequencia, processos=2, tamanho_segmento=97), esperado)
+
+    def test_boyermoore(self):
+        bm = BoyerMoore("GTA")
+        esperado = bm.search(self.sequencia)
+        self.assertEqual(procuraParalela(bm, self.sequencia, processos=2, tamanho_segmento=101), esperado)
+
+    def test_regex(self):
+        automato = AutomatoRegex("GANTC")
+        esperado = automato.posicoesMatch(self.sequencia)
+        self.assertEqual(procuraParalela(automato, self.sequencia.encode(), processos=2, tamanho_segmento=50), esperado)
+
+    def test_fronteiras(self):
+        automato = Automata("ACGT", "AAA")
+        self.assertEqual(procuraParalela(automato, "A" * 40, processos=2, tamanho_segmento=3), list(range(38)))
+
+
+if __name__ == '__main__':
+    unittest.main()
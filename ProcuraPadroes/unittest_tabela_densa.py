@@ -0,0 +1,42 @@
+import unittest
+from tabela_densa import TabelaDensa
+
+
+class TestTabelaDensa(unittest.TestCase):
+    """
+    Test case class for the TabelaDensa class.
+
+    Attributes:
+        tabela (TabelaDensa): A DFA over {a, c} whose final states are 0 and 2 (strings that end in "ac" or are empty).
+
+    Methods:
+        test_numeracao: Tests that the final states are numbered last.
+        test_varrer: Tests the positions reported and the state returned by a scan.
+        test_varrer_por_partes: Tests that a scan can continue from the state returned by the previous one.
+    """
+
+    def setUp(self):
+        transicoes = {(0, 'a'): 1, (0, 'c'): 3, (1, 'a'): 1, (1, 'c'): 2, (2, 'a'): 1, (2, 'c'): 3, (3, 'a'): 1, (3, 'c'): 3}
+        self.tabela = TabelaDensa(['a', 'c'], 4, transicoes, {0, 2})
+
+    def test_numeracao(self):
+        self.assertEqual(self.tabela.externo, [1, 3, 0, 2])
+        self.assertEqual(self.tabela.limiar, 2 * self.tabela.sigma)
+
+    def test_varrer(self):
+        self.assertEqual(self.tabela.varrer(b"acacxac"), ([1, 3, 4, 6], 2))
+        self.assertEqual(self.tabela.varrer(b""), ([], 0))
+        self.assertEqual(self.tabela.varrer(memoryview(b"aac"), estado=3), ([2], 2))
+
+    def test_varrer_por_partes(self):
+        dados = b"caacacaccacx" * 5
+        completo, _ = self.tabela.varrer(dados)
+        fins, estado = [], None
+        for inicio in range(0, len(dados), 7):
+            parte, estado = self.tabela.varrer(dados[inicio:inicio + 7], estado)
+            fins += [inicio + fim for fim in parte]
+        self.assertEqual(fins, completo)
+
+
+if __name__ == '__main__':
+    unittest.main()